@@ -0,0 +1,123 @@
+"""
+asyncio helpers for awaiting Quantum Rings jobs instead of sleep-polling them.
+
+Works with native ``JobV1`` and with ``QrBackendV2``/primitive jobs, i.e.
+anything with ``in_final_state()``, ``result()`` and ``cancel()``. Jobs that
+offer ``add_done_callback()`` (the offline SDK's) wake their waiter directly;
+all others are polled with jittered exponential backoff starting at a few
+milliseconds, so short jobs return almost at once and long ones are not
+polled more than once per ``MAX_DELAY``. Blocking SDK calls run in the
+loop's default executor only for the moment of each poll, so hundreds of
+jobs can be awaited from one event loop without a thread per job.
+
+Cancelling an awaiting task (directly, or through a timeout in
+``gather_results``) cancels the job as well.
+
+Usage:
+    from async_jobs import gather_results
+    results = asyncio.run(gather_results([backend.run(qc, shots=100) for qc in circuits], timeout=60))
+"""
+
+import asyncio
+import random
+
+INITIAL_DELAY = 0.005
+MAX_DELAY = 1.0
+BACKOFF = 1.6
+JITTER = 0.2
+
+
+def backoff_delays(initial=INITIAL_DELAY, maximum=MAX_DELAY, factor=BACKOFF, jitter=JITTER, rng=random):
+    """Endless poll delays: ``initial * factor**k`` capped at ``maximum``, each with +/-``jitter``."""
+    delay = initial
+    while True:
+        yield delay * (1 + rng.uniform(-jitter, jitter))
+        delay = min(delay * factor, maximum)
+
+
+async def _call(fn, blocking):
+    if blocking:
+        return await asyncio.get_running_loop().run_in_executor(None, fn)
+    return fn()
+
+
+async def _until_final(job, blocking, backoff):
+    if hasattr(job, "add_done_callback"):
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+
+        def wake():
+            if not done.done():
+                done.set_result(None)
+
+        job.add_done_callback(lambda _: loop.call_soon_threadsafe(wake))
+        await done
+        return
+    for delay in backoff_delays(**backoff):
+        if await _call(job.in_final_state, blocking):
+            return
+        await asyncio.sleep(delay)
+
+
+async def wait(job, timeout=None, *, blocking=True, cancel_on_timeout=False, **backoff):
+    """
+    Wait until ``job`` is in a final state.
+
+    Raises ``TimeoutError`` after ``timeout`` seconds (the job keeps running
+    unless ``cancel_on_timeout``). ``blocking=False`` calls the job's methods
+    on the event loop thread, which is fine for jobs whose status is local.
+    ``backoff`` overrides ``initial``/``maximum``/``factor``/``jitter``.
+    """
+    try:
+        await asyncio.wait_for(_until_final(job, blocking, backoff), timeout)
+    except TimeoutError:
+        if cancel_on_timeout:
+            job.cancel()
+        raise
+    except asyncio.CancelledError:
+        job.cancel()
+        raise
+
+
+async def result(job, timeout=None, *, blocking=True, **backoff):
+    """Wait for ``job`` and return ``job.result()``."""
+    await wait(job, timeout, blocking=blocking, **backoff)
+    return await _call(job.result, blocking)
+
+
+async def gather_results(jobs, timeout=None, *, return_exceptions=False, blocking=True, **backoff):
+    """
+    Results of all ``jobs`` in order. On ``timeout`` (for the whole batch)
+    every unfinished job is cancelled and ``TimeoutError`` is raised.
+    """
+    waiters = [result(job, blocking=blocking, **backoff) for job in jobs]
+    return await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=return_exceptions), timeout)
+
+
+class AsyncJob:
+    """
+    Awaitable view of a job: ``counts = (await AsyncJob(job)).get_counts()``.
+    """
+
+    def __init__(self, job, *, blocking=True, **backoff):
+        self.job = job
+        self._blocking = blocking
+        self._backoff = backoff
+
+    def __await__(self):
+        return self.result().__await__()
+
+    async def wait(self, timeout=None):
+        await wait(self.job, timeout, blocking=self._blocking, **self._backoff)
+
+    async def result(self, timeout=None):
+        return await result(self.job, timeout, blocking=self._blocking, **self._backoff)
+
+    def status(self):
+        return self.job.status()
+
+    def cancel(self):
+        return self.job.cancel()
+
+    def __repr__(self):
+        return f"AsyncJob({self.job!r})"
@@ -0,0 +1,129 @@
+"""
+Batched circuit submission for QrBackendV2 (and the native backend).
+
+quantumrings-toolkit-qiskit-sampler.py runs circuits one at a time and waits
+on each job, to stay clear of batch failures. ``submit_batched`` keeps that
+safety without the serial cost:
+
+* every circuit is checked up front (qubit count, unbound parameters, and
+  for Qiskit circuits whether it uses only the backend target's operations,
+  i.e. was transpiled), so obviously bad circuits never reach the backend;
+* the rest are packed into as few submissions as ``backend.max_circuits``
+  allows, with up to ``max_in_flight`` submissions running at once;
+* a submission that fails is split in half and both halves resubmitted,
+  recursively, so a single bad circuit ends up alone and reported without
+  stopping the others.
+
+Usage:
+    from batch_submit import submit_batched
+    batch = submit_batched(backend, transpiled_circuits, shots=1000)
+    batch.raise_for_errors()
+    print(batch.counts[0])
+"""
+
+from collections import deque
+
+MAX_IN_FLIGHT = 8
+DIRECTIVES = {"barrier", "delay", "measure", "reset"}
+
+
+class BatchError(RuntimeError):
+    """Raised by ``BatchResult.raise_for_errors()``; ``errors`` maps circuit index to exception."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        detail = "; ".join(f"circuit {i}: {exc}" for i, exc in sorted(errors.items()))
+        super().__init__(f"{len(errors)} circuit(s) failed: {detail}")
+
+
+class BatchResult:
+    """Per-circuit counts (``None`` where it failed) plus the errors and submission count."""
+
+    def __init__(self, size):
+        self.counts = [None] * size
+        self.errors = {}
+        self.submissions = 0
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def raise_for_errors(self):
+        if self.errors:
+            raise BatchError(self.errors)
+
+    def __repr__(self):
+        done = sum(c is not None for c in self.counts)
+        return f"<BatchResult {done}/{len(self.counts)} ok, {len(self.errors)} failed, {self.submissions} submissions>"
+
+
+def validate_circuit(backend, circuit):
+    """Why ``circuit`` cannot run on ``backend`` (a string), or ``None`` if it looks fine."""
+    limit = getattr(backend, "num_qubits", None)
+    if limit is not None and circuit.num_qubits > limit:
+        return f"uses {circuit.num_qubits} qubits but the backend has {limit}"
+    if getattr(circuit, "num_parameters", 0):
+        return "has unbound parameters"
+    target = getattr(backend, "target", None)
+    data = getattr(circuit, "data", [])
+    if target is not None and data and hasattr(data[0], "operation"):
+        supported = set(target.operation_names) | DIRECTIVES
+        unsupported = sorted({item.operation.name for item in data} - supported)
+        if unsupported:
+            return f"uses {', '.join(unsupported)}, which the backend target lacks; transpile it first"
+    return None
+
+
+def submit_batched(backend, circuits, *, max_circuits=None, max_in_flight=MAX_IN_FLIGHT, validate=True,
+                   **run_options):
+    """
+    Run ``circuits`` on ``backend`` in as few submissions as possible and
+    return a :class:`BatchResult` in input order. ``max_circuits`` overrides
+    the backend's own limit; ``run_options`` (``shots=...``) go to every
+    ``backend.run`` call.
+    """
+    circuits = list(circuits)
+    batch = BatchResult(len(circuits))
+    runnable = []
+    for index, circuit in enumerate(circuits):
+        problem = validate_circuit(backend, circuit) if validate else None
+        if problem:
+            batch.errors[index] = ValueError(problem)
+        else:
+            runnable.append(index)
+
+    size = max_circuits or getattr(backend, "max_circuits", None) or max(len(runnable), 1)
+    queue = deque(runnable[k:k + size] for k in range(0, len(runnable), size))
+    in_flight = deque()
+
+    def failed(chunk, exc):
+        if len(chunk) == 1:
+            batch.errors[chunk[0]] = exc
+            return
+        # Bisect: both halves go back to the front of the queue.
+        middle = len(chunk) // 2
+        queue.appendleft(chunk[middle:])
+        queue.appendleft(chunk[:middle])
+
+    while queue or in_flight:
+        while queue and len(in_flight) < max_in_flight:
+            chunk = queue.popleft()
+            batch.submissions += 1
+            run_input = circuits[chunk[0]] if len(chunk) == 1 else [circuits[i] for i in chunk]
+            try:
+                in_flight.append((chunk, backend.run(run_input, **run_options)))
+            except Exception as exc:
+                failed(chunk, exc)
+        if not in_flight:
+            continue
+        chunk, job = in_flight.popleft()
+        try:
+            result = job.result()
+            if len(chunk) == 1:
+                batch.counts[chunk[0]] = result.get_counts()
+            else:
+                for position, index in enumerate(chunk):
+                    batch.counts[index] = result.get_counts(position)
+        except Exception as exc:
+            failed(chunk, exc)
+    return batch
@@ -0,0 +1,287 @@
+"""
+Scaling benchmarks for the example workloads, written to bench_output.txt.
+
+The workloads are the circuits the examples run:
+
+* ``chain``  - H + CNOT chain (QuantumRingsLib-basic-10.py, quantumrings-toolkit-qiskit-quantumcircuit.py)
+* ``batch``  - Bell / all-ones / GHZ batch (quantumrings-toolkit-qiskit-multi-10.py)
+* ``qaoa``   - RZZ cost + RX mixer layers (quantumrings-toolkit-qiskit-qaoa.py)
+* ``param``  - parameterized H/X, mcp, rx/ry/rz/u block, bound before running (QuantumRingsLib-param-10.py)
+
+Each is swept over qubit count, depth (repetitions of the workload's layer)
+and shots, on three paths: ``native`` (QuantumRingsLib circuit on the
+backend), ``toolkit`` (Qiskit circuit, transpile, QrBackendV2.run) and
+``sampler`` (Qiskit circuits as QrSamplerV2 PUBs). For every case the
+report gives build time (construction, binding, transpilation), run time as
+the best of ``--repeat`` runs, throughput in shots/s and the peak Python
+heap (tracemalloc, measured in a separate run so tracing does not skew the timings).
+
+Usage:
+    python Tools/benchmarks.py [--quick] [--sdk offline|installed] [--workload chain --path native]
+"""
+
+import argparse
+import collections
+import gc
+import itertools
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from example_headers import REPO_ROOT
+
+OUTPUT_PATH = REPO_ROOT / "bench_output.txt"
+TOOLS_DIR = Path(__file__).resolve().parent
+
+QUBITS = (4, 8, 12, 16)
+DEPTHS = (1, 4, 16)
+SHOTS = (100, 1000, 10000)
+QUICK = {"qubits": (4, 8), "depths": (1, 4), "shots": (100, 1000)}
+PATHS = ("native", "toolkit", "sampler")
+REPEAT = 3
+
+
+# ------------------------------------------------------------- workloads
+# Every builder takes a Library (QuantumRingsLib or qiskit classes), the
+# qubit count and the depth, and returns the list of circuits to run.
+
+Library = collections.namedtuple("Library", "QuantumCircuit ParameterVector native")
+
+
+def measure_all(qc, n):
+    # One measure() per bit works the same on both libraries.
+    for i in range(n):
+        qc.measure(i, i)
+
+
+def chain(lib, n, depth):
+    qc = lib.QuantumCircuit(n, n)
+    for _ in range(depth):
+        qc.h(0)
+        for i in range(n - 1):
+            qc.cx(i, i + 1)
+    measure_all(qc, n)
+    return [qc]
+
+
+def batch(lib, n, depth):
+    bell = lib.QuantumCircuit(2, 2)
+    bell.h(0)
+    bell.cx(0, 1)
+    measure_all(bell, 2)
+    ones = lib.QuantumCircuit(n, n)
+    for i in range(n):
+        ones.x(i)
+    measure_all(ones, n)
+    ghz = lib.QuantumCircuit(n, n)
+    ghz.h(0)
+    for _ in range(depth):
+        for i in range(n - 1):
+            ghz.cx(i, i + 1)
+    measure_all(ghz, n)
+    return [bell, ones, ghz]
+
+
+def qaoa(lib, n, depth):
+    gammas = [0.4 + 0.1 * k for k in range(depth)]
+    betas = [0.7 - 0.05 * k for k in range(depth)]
+    qc = lib.QuantumCircuit(n, n)
+    for i in range(n):
+        qc.h(i)
+    for gamma, beta in zip(gammas, betas):
+        for i in range(n - 1):
+            qc.rzz(2 * gamma, i, i + 1)
+        for i in range(n):
+            qc.rx(2 * beta, i)
+    measure_all(qc, n)
+    return [qc]
+
+
+def param(lib, n, depth):
+    qc = lib.QuantumCircuit(n, n)
+    values = {}
+    for layer in range(depth):
+        vec = lib.ParameterVector(f"p{layer}", 6)
+        for i in range(n):
+            if i % 3 == 1:
+                qc.x(i)
+            else:
+                qc.h(i)
+        qc.mcp(0.3, list(range(n - 1)), n - 1)
+        for i in range(n):
+            qc.rx(vec[i % 3], i)
+            if i % 2:
+                qc.ry(math.pi / 2, i)
+            else:
+                qc.rz(vec[5], i)
+        qc.u(vec[0], vec[1], vec[2], layer % n)
+        values.update({f"p{layer}[{k}]": math.pi / (k + 2) for k in range(6)})
+    measure_all(qc, n)
+    if not lib.native:
+        return [qc.assign_parameters({p: values[p.name] for p in qc.parameters})]
+    # Native binding: string keys, in place.
+    qc.assign_parameters(values, inplace=True)
+    return [qc]
+
+
+WORKLOADS = {"chain": chain, "batch": batch, "qaoa": qaoa, "param": param}
+
+
+# ----------------------------------------------------------------- paths
+
+class Paths:
+    """Build-and-run callables for each execution path, sharing one provider."""
+
+    def __init__(self):
+        import QuantumRingsLib
+        self.sdk = QuantumRingsLib
+        self.native = Library(QuantumRingsLib.QuantumCircuit, QuantumRingsLib.ParameterVector, True)
+        self.provider = QuantumRingsLib.QuantumRingsProvider()
+        self.backend = self.provider.get_backend("scarlet_quantum_rings")
+        self._qr_backends = {}
+        self._warm = set()
+
+    def _toolkit(self):
+        import qiskit
+        from quantumrings.toolkit.qiskit import QrBackendV2, QrSamplerV2
+        return qiskit, QrBackendV2, QrSamplerV2
+
+    def _qiskit_library(self):
+        qiskit, _, _ = self._toolkit()
+        return Library(qiskit.QuantumCircuit, qiskit.circuit.ParameterVector, False)
+
+    def qr_backend(self, n):
+        if n not in self._qr_backends:
+            _, QrBackendV2, _ = self._toolkit()
+            self._qr_backends[n] = QrBackendV2(self.provider, num_qubits=n)
+        return self._qr_backends[n]
+
+    def warm_up(self, path, n):
+        """One untimed small build, so a case's build time excludes importing the toolkit and creating its backend."""
+        if (path, n) not in self._warm:
+            self.build(path, "chain", n, 1)
+            self._warm.add((path, n))
+
+    def build(self, path, workload, n, depth):
+        if path == "native":
+            return WORKLOADS[workload](self.native, n, depth)
+        qiskit, _, _ = self._toolkit()
+        circuits = WORKLOADS[workload](self._qiskit_library(), n, depth)
+        if path == "toolkit":
+            backend = self.qr_backend(n)
+            return [qiskit.transpile(c, backend, initial_layout=list(range(c.num_qubits))) for c in circuits]
+        return circuits
+
+    def run(self, path, circuits, n, shots):
+        if path == "native":
+            for qc in circuits:
+                self.backend.run(qc, shots=shots, mode="sync").result()
+        elif path == "toolkit":
+            backend = self.qr_backend(n)
+            for qc in circuits:
+                backend.run(qc, shots=shots).result()
+        else:
+            _, _, QrSamplerV2 = self._toolkit()
+            QrSamplerV2(backend=self.qr_backend(n)).run([(c, [], shots) for c in circuits]).result()
+
+
+def measure(paths, path, workload, n, depth, shots, repeat=REPEAT):
+    """One benchmark case: timings, throughput and peak heap."""
+    paths.warm_up(path, n)
+    gc.collect()
+    started = time.perf_counter()
+    circuits = paths.build(path, workload, n, depth)
+    build = time.perf_counter() - started
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        paths.run(path, circuits, n, shots)
+        runs.append(time.perf_counter() - started)
+    run = min(runs)
+
+    gc.collect()
+    tracemalloc.start()
+    paths.run(path, paths.build(path, workload, n, depth), n, shots)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "workload": workload, "path": path, "qubits": n, "depth": depth, "shots": shots,
+        "circuits": len(circuits), "build_s": build, "run_s": run,
+        "shots_per_s": shots * len(circuits) / run if run else float("inf"),
+        "peak_mib": peak / 2 ** 20,
+    }
+
+
+# ---------------------------------------------------------------- report
+
+# (name, width, format spec); text columns are left-aligned.
+COLUMNS = [("workload", 8, ""), ("path", 8, ""), ("qubits", 6, "d"), ("depth", 5, "d"), ("shots", 6, "d"),
+           ("build_s", 9, ".4f"), ("run_s", 9, ".4f"), ("shots_per_s", 12, ".0f"), ("peak_mib", 9, ".2f")]
+
+
+def format_row(row):
+    return " ".join(f"{row[name]:<{width}}" if not spec else f"{row[name]:>{width}{spec}}"
+                    for name, width, spec in COLUMNS)
+
+
+def report(rows, environment):
+    lines = [f"# {key}: {value}" for key, value in environment.items()]
+    lines.append(" ".join(f"{name:<{width}}" if not spec else f"{name:>{width}}" for name, width, spec in COLUMNS))
+    lines += [format_row(row) for row in rows]
+    lines += ["", "# toolkit / native run time, median over matching cases (>1: native is faster)"]
+    native = {(r["workload"], r["qubits"], r["depth"], r["shots"]): r["run_s"] for r in rows if r["path"] == "native"}
+    for workload in WORKLOADS:
+        ratios = sorted(r["run_s"] / native[key] for r in rows if r["path"] == "toolkit"
+                        for key in [(r["workload"], r["qubits"], r["depth"], r["shots"])]
+                        if r["workload"] == workload and native.get(key))
+        if ratios:
+            lines.append(f"# {workload:<8} {ratios[len(ratios) // 2]:6.2f}x over {len(ratios)} cases")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sdk", choices=("offline", "installed"), default="offline")
+    parser.add_argument("--quick", action="store_true", help="small grid for a smoke run")
+    parser.add_argument("--workload", action="append", choices=sorted(WORKLOADS), help="repeatable; default all")
+    parser.add_argument("--path", action="append", choices=PATHS, help="repeatable; default all")
+    parser.add_argument("--qubits", type=int, nargs="+")
+    parser.add_argument("--depths", type=int, nargs="+")
+    parser.add_argument("--shots", type=int, nargs="+")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    args = parser.parse_args(argv)
+
+    if args.sdk == "offline":
+        sys.path.insert(0, str(TOOLS_DIR))
+        import offline_sdk
+        offline_sdk.install()
+    grid = QUICK if args.quick else {"qubits": QUBITS, "depths": DEPTHS, "shots": SHOTS}
+    qubits = args.qubits or grid["qubits"]
+    depths = args.depths or grid["depths"]
+    shots = args.shots or grid["shots"]
+    paths = Paths()
+    environment = {
+        "sdk": args.sdk,
+        "QuantumRingsLib": paths.sdk.version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+    rows = []
+    cases = itertools.product(args.workload or WORKLOADS, qubits, depths, shots, args.path or PATHS)
+    for workload, n, depth, shot_count, path in cases:
+        row = measure(paths, path, workload, n, depth, shot_count, args.repeat)
+        rows.append(row)
+        print(format_row(row), flush=True)
+    args.output.write_text(report(rows, environment), encoding="utf-8")
+    print(f"wrote {len(rows)} cases to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
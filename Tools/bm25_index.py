@@ -0,0 +1,237 @@
+"""
+Section-level BM25 retrieval over Documents/*.md.
+
+Documents are split into heading chunks (see doc_chunks.py) and written to an
+on-disk inverted index:
+
+    meta.json      chunk table, term dictionary (term -> offset, df), BM25 stats
+    postings.bin   uint32 (chunk id, term frequency) pairs, grouped by term
+    text.bin       UTF-8 chunk bodies, addressed by (offset, length)
+
+postings.bin and text.bin are memory-mapped when the index is opened, so a
+worker pays only for the term dictionary up front and for the postings of the
+terms it actually queries. The three files are written together as one
+generation directory (see index_store.py), so a reader never pairs the
+dictionary of one build with the postings of another.
+
+Usage:
+    python Tools/bm25_index.py "how do I bind parameters" -k 5
+"""
+
+import argparse
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import sys
+from array import array
+from collections import Counter
+from pathlib import Path
+
+import index_store
+from doc_chunks import chunk_documents, document_paths
+from example_headers import DOCUMENTS_DIR, REPO_ROOT
+
+INDEX_DIR = REPO_ROOT / "Tools" / ".cache" / "bm25"
+INDEX_VERSION = 1
+K1 = 1.2
+B = 0.75
+
+_TOKEN = re.compile(r"[a-z0-9_]+")
+
+
+def tokenize(text):
+    """
+    Lowercase word tokens. Identifiers joined by underscores are also split,
+    so ``assign_parameters`` matches both itself and ``parameters``.
+    """
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        tokens.append(token)
+        if "_" in token:
+            tokens.extend(part for part in token.split("_") if part)
+    return tokens
+
+
+def _fingerprint(documents_dir):
+    parts = []
+    for path in document_paths(documents_dir):
+        stat = path.stat()
+        parts.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(parts)
+
+
+def build_index(documents_dir=DOCUMENTS_DIR, index_dir=INDEX_DIR, chunks=None):
+    """Chunk ``documents_dir`` and write the index files into ``index_dir``."""
+    with index_store.writer_lock(index_dir):
+        return _build(documents_dir, index_dir, chunks)
+
+
+def _build(documents_dir, index_dir, chunks):
+    if chunks is None:
+        chunks = chunk_documents(documents_dir)
+
+    inverted = {}
+    table = []
+    text = bytearray()
+    total = 0
+    for chunk_id, chunk in enumerate(chunks):
+        counts = Counter(tokenize(chunk.heading + "\n" + chunk.text))
+        length = sum(counts.values())
+        total += length
+        for term, tf in counts.items():
+            inverted.setdefault(term, []).append((chunk_id, tf))
+        body = chunk.text.encode("utf-8")
+        record = chunk.to_dict()
+        record.update(length=length, text=[len(text), len(body)])
+        table.append(record)
+        text += body
+
+    postings = array("I")
+    terms = {}
+    for term in sorted(inverted):
+        entries = inverted[term]
+        terms[term] = [len(postings) // 2, len(entries)]
+        for chunk_id, tf in entries:
+            postings.append(chunk_id)
+            postings.append(tf)
+
+    meta = {
+        "version": INDEX_VERSION,
+        "fingerprint": _fingerprint(documents_dir),
+        "k1": K1,
+        "b": B,
+        "avgdl": total / len(table) if table else 0.0,
+        "chunks": table,
+        "terms": terms,
+    }
+
+    def write(directory):
+        (directory / "postings.bin").write_bytes(postings.tobytes())
+        (directory / "text.bin").write_bytes(bytes(text))
+        (directory / "meta.json").write_text(json.dumps(meta, separators=(",", ":")), encoding="utf-8")
+
+    # The files of the single-directory layout of older versions go too.
+    index_store.publish(index_dir, write, ("meta.json", "postings.bin", "text.bin"))
+    return meta
+
+
+def _map(path):
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class BM25Index:
+    """Read-only view of an on-disk index; cheap to open in every worker."""
+
+    def __init__(self, index_dir=INDEX_DIR):
+        index_store.read(index_dir, self._load)
+
+    def _load(self, directory):
+        meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"{directory} holds index version {meta.get('version')}, expected {INDEX_VERSION}")
+        self.meta = meta
+        self.chunks = meta["chunks"]
+        self.terms = meta["terms"]
+        self.k1 = meta["k1"]
+        self.b = meta["b"]
+        self.avgdl = meta["avgdl"] or 1.0
+        self._postings_map = _map(directory / "postings.bin")
+        self._postings = memoryview(self._postings_map).cast("I") if len(self._postings_map) else memoryview(array("I"))
+        self._text = _map(directory / "text.bin")
+
+    @classmethod
+    def open(cls, index_dir=INDEX_DIR, documents_dir=DOCUMENTS_DIR, rebuild_if_stale=True):
+        """Open the index, (re)building it first if it is missing or stale."""
+        try:
+            meta = json.loads((index_store.current(index_dir) / "meta.json").read_text(encoding="utf-8"))
+            stale = meta.get("version") != INDEX_VERSION or (
+                rebuild_if_stale and meta["fingerprint"] != _fingerprint(documents_dir))
+        except (OSError, ValueError):
+            stale = True
+        if stale:
+            build_index(documents_dir, index_dir)
+        return cls(index_dir)
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def text(self, chunk_id):
+        offset, length = self.chunks[chunk_id]["text"]
+        return bytes(self._text[offset:offset + length]).decode("utf-8")
+
+    def idf(self, term):
+        entry = self.terms.get(term)
+        if not entry:
+            return 0.0
+        df = entry[1]
+        return math.log(1.0 + (len(self.chunks) - df + 0.5) / (df + 0.5))
+
+    def scores(self, query):
+        """Return ``{chunk id: BM25 score}`` for every chunk sharing a query term."""
+        scores = {}
+        k1, b, avgdl = self.k1, self.b, self.avgdl
+        for term, qtf in Counter(tokenize(query)).items():
+            entry = self.terms.get(term)
+            if not entry:
+                continue
+            offset, df = entry
+            idf = self.idf(term) * qtf
+            postings = self._postings[2 * offset:2 * (offset + df)]
+            for i in range(0, 2 * df, 2):
+                chunk_id, tf = postings[i], postings[i + 1]
+                norm = k1 * (1.0 - b + b * self.chunks[chunk_id]["length"] / avgdl)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+        return scores
+
+    def search(self, query, k=5, docs=None):
+        """
+        Top-``k`` chunks for ``query`` as ``(score, chunk id, chunk record)``
+        tuples, best first. ``docs`` optionally restricts results to the
+        given document file names.
+        """
+        scores = self.scores(query)
+        if docs is not None:
+            docs = set(docs)
+            scores = {c: s for c, s in scores.items() if self.chunks[c]["doc"] in docs}
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(score, chunk_id, self.chunks[chunk_id]) for chunk_id, score in best]
+
+    def close(self):
+        self._postings.release()
+        for mapped in (self._postings_map, self._text):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("query", nargs="?")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--documents", type=Path, default=DOCUMENTS_DIR)
+    parser.add_argument("--index", type=Path, default=INDEX_DIR)
+    parser.add_argument("--build", action="store_true", help="only (re)build the index")
+    parser.add_argument("--show", action="store_true", help="print the chunk text of each hit")
+    args = parser.parse_args(argv)
+
+    if args.build or not args.query:
+        meta = build_index(args.documents, args.index)
+        print(f"indexed {len(meta['chunks'])} chunks, {len(meta['terms'])} terms into {args.index}")
+        return 0
+
+    index = BM25Index.open(args.index, args.documents)
+    for score, chunk_id, chunk in index.search(args.query, args.k):
+        print(f"{score:7.3f}  {chunk['doc']}  {' > '.join(chunk['path'])}  (lines {chunk['start']}-{chunk['end']})")
+        if args.show:
+            print(index.text(chunk_id))
+            print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
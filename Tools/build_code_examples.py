@@ -0,0 +1,247 @@
+"""
+Generate Documents/code-examples.md from the scripts in Code/.
+
+The build is incremental: every Code/*.py file is content-hashed and the
+rendered markdown section plus the parsed header are kept in a JSON cache.
+On the next run only files whose hash changed are re-read and re-rendered;
+the "Synergy & Compatibility Summary" is rebuilt only when a synergy line
+changed, and the document is written only when its bytes actually differ.
+
+Usage:
+    python Tools/build_code_examples.py [--check] [--full] [--cache PATH]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from example_headers import CODE_DIR, DOCUMENTS_DIR, REPO_ROOT, example_paths, parse_header
+
+OUTPUT_PATH = DOCUMENTS_DIR / "code-examples.md"
+CACHE_PATH = REPO_ROOT / "Tools" / ".cache" / "code-examples.json"
+
+# Bump when the rendered layout changes so stale caches are discarded.
+CACHE_VERSION = 1
+
+PREAMBLE = """# Auto-Generated Code Examples
+
+
+## Version & Synergy Notation
+
+> We use `(+)`, `(!)`, and `(?)` to denote:
+> - `(+)` => tested & works on that version
+> - `(!)` => known to fail on that version (or combination)
+> - `(?)` => untested/unknown behavior
+
+> **Synergy** lines indicate module-version conflicts or future support notes.
+
+"""
+
+SYNERGY_HEADING = """## Synergy & Compatibility Summary
+
+> **Note**: The table below captures synergy lines from each code file's header. 
+> It's meant to quickly show known module-version interactions.
+
+"""
+
+LLM_INSTRUCTIONS = """
+
+## **LLM Instructions**
+
+> - These examples are collected from real-world use cases.
+> - Each file includes a commented header with `# sdk:` or `# synergy:` lines for more details.
+> - If uncertain about user environment, ask which versions they have and reference the synergy info.
+> - If troubleshooting, see the **Common Issues** section at the bottom.
+> - Some examples may require Qiskit transpilation if they're using `quantumrings.toolkit.qiskit`.
+
+
+> **Note**:
+> The following sections embed the exact `.py` files, including any metadata in the header.
+
+
+"""
+
+COMMON_ISSUES = [
+    ("`Invalid Argument Passed for Quantum Circuit`",
+     "Received a wrong type of circuit.",
+     "**Use the correct circuit type.**"),
+    ("`job_monitor() TypeError`",
+     "`job_monitor()` does not work with the provided job type.",
+     "**Use manual polling (`while not job.in_final_state(): ...`)**"),
+    ("`Transpile Required`",
+     "Circuits **must be transpiled** before running.",
+     "**Use `transpile(qc, backend, initial_layout=...)` before execution.**"),
+]
+
+
+def file_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def render_section(name, source):
+    """Embed one example script verbatim as a fenced python block."""
+    return f"## {name}\n\n```python\n{source}\n```\n\n\n"
+
+
+def render_synergy(entries):
+    """``entries`` is a list of ``(file name, synergy lines)`` in document order."""
+    lines = []
+    for name, synergy in entries:
+        if not synergy:
+            continue
+        lines.append(f"- **{name}**:")
+        lines.extend(f"  - {note}" for note in synergy)
+    return SYNERGY_HEADING + "\n".join(lines) + "\n"
+
+
+def render_common_issues(issues=COMMON_ISSUES):
+    rows = [
+        "## **Common Issues & Fixes**",
+        "",
+        "| **Error Message** | **Cause** | **Solution** |",
+        "|------------------|-----------|--------------|",
+    ]
+    rows.extend(f"| {error} | {cause} | {fix} |" for error, cause, fix in issues)
+    return "\n".join(rows)
+
+
+def load_cache(path):
+    try:
+        cache = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": CACHE_VERSION, "files": {}, "fragments": {}}
+    if cache.get("version") != CACHE_VERSION:
+        return {"version": CACHE_VERSION, "files": {}, "fragments": {}}
+    return cache
+
+
+def save_cache(path, cache):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def refresh_entries(cache, code_dir=CODE_DIR):
+    """
+    Bring the per-file cache entries up to date with ``code_dir``.
+
+    A file whose size and mtime are unchanged is trusted without reading it;
+    otherwise it is hashed and only re-parsed/re-rendered when the hash moved.
+    Returns ``(entries, changed, removed)`` where ``entries`` is the ordered
+    list of cache records for the current files.
+    """
+    files = cache["files"]
+    entries, changed = [], []
+    seen = set()
+
+    for path in example_paths(code_dir):
+        name = path.name
+        seen.add(name)
+        stat = path.stat()
+        entry = files.get(name)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            entries.append(entry)
+            continue
+
+        data = path.read_bytes()
+        digest = file_digest(data)
+        if not entry or entry["sha256"] != digest:
+            source = data.decode("utf-8")
+            entry = {
+                "name": name,
+                "sha256": digest,
+                "header": parse_header(source),
+                "section": render_section(name, source),
+            }
+            changed.append(name)
+        entry["size"] = stat.st_size
+        entry["mtime_ns"] = stat.st_mtime_ns
+        files[name] = entry
+        entries.append(entry)
+
+    removed = sorted(set(files) - seen)
+    for name in removed:
+        del files[name]
+    return entries, changed, removed
+
+
+def build(cache, code_dir=CODE_DIR, full=False):
+    """
+    Return ``(document, report)`` for the current state of ``code_dir``.
+
+    ``report`` lists the sections that were re-rendered so callers (and CI
+    logs) can see how much work an incremental run actually did.
+    """
+    if full:
+        cache["files"], cache["fragments"] = {}, {}
+    entries, changed, removed = refresh_entries(cache, code_dir)
+    fragments = cache["fragments"]
+    rebuilt = []
+
+    synergy = [[e["name"], e["header"]["synergy"]] for e in entries]
+    if fragments.get("synergy_source") != synergy:
+        fragments["synergy_source"] = synergy
+        fragments["synergy"] = render_synergy(synergy)
+        rebuilt.append("Synergy & Compatibility Summary")
+
+    issues = [list(row) for row in COMMON_ISSUES]
+    if fragments.get("issues_source") != issues:
+        fragments["issues_source"] = issues
+        fragments["issues"] = render_common_issues()
+        rebuilt.append("Common Issues & Fixes")
+
+    document = "".join(
+        [PREAMBLE, fragments["synergy"], LLM_INSTRUCTIONS]
+        + [e["section"] for e in entries]
+        + [fragments["issues"]]
+    )
+    report = {"changed": changed, "removed": removed, "rebuilt": rebuilt}
+    return document, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--code-dir", type=Path, default=CODE_DIR)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH)
+    parser.add_argument("--full", action="store_true", help="ignore the cache and rebuild everything")
+    parser.add_argument("--check", action="store_true",
+                        help="exit non-zero if the output is out of date instead of writing it")
+    args = parser.parse_args(argv)
+
+    cache = load_cache(args.cache)
+    document, report = build(cache, args.code_dir, full=args.full)
+
+    try:
+        current = args.output.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        current = None
+
+    for name in report["changed"]:
+        print(f"re-rendered {name}")
+    for name in report["removed"]:
+        print(f"removed {name}")
+    for name in report["rebuilt"]:
+        print(f"rebuilt {name}")
+
+    if current == document:
+        print(f"{args.output.name} is up to date")
+        save_cache(args.cache, cache)
+        return 0
+    if args.check:
+        print(f"{args.output.name} is out of date; run Tools/build_code_examples.py")
+        return 1
+
+    args.output.write_text(document, encoding="utf-8")
+    save_cache(args.cache, cache)
+    print(f"wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
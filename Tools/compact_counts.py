@@ -0,0 +1,203 @@
+"""
+NumPy-backed measurement counts: sorted uint64 outcome keys plus int64 counts.
+
+``result.get_counts()`` is a dict of bitstrings. At 30+ qubits and 10^6
+shots that dict takes gigabytes, and marginalizing it means re-parsing
+every string. ``CompactCounts`` keeps two arrays instead. Key bit ``i`` is
+clbit ``i``, as in Qiskit's integer counts. It supports vectorized
+``marginalize``, ``top_k``, ``merge`` and Z-string ``expectation``. The
+``dict``-like view (``counts["0101"]``, ``counts.items()``,
+``plt.bar(counts.keys(), counts.values())``) builds its labels only when
+they are asked for.
+
+Build one from a counts dict, a Qiskit/offline ``Result``, or a sampler
+``BitArray`` (``result[0].data.meas``). The last two never go through
+bitstrings.
+
+Usage:
+    from compact_counts import CompactCounts
+    counts = CompactCounts.from_result(job.result())
+    counts.marginalize([0, 1]).top_k(4), counts.expectation("ZZII")
+"""
+
+import operator
+from collections.abc import Mapping
+
+import numpy as np
+
+MAX_BITS = 64
+# Marginals up to this many bits are folded with a dense bincount instead of a sort.
+DENSE_BITS = 24
+
+
+def _unique(keys, counts):
+    keys, inverse = np.unique(np.asarray(keys, dtype=np.uint64), return_inverse=True)
+    return keys, np.bincount(inverse.ravel(), weights=counts, minlength=len(keys)).astype(np.int64)
+
+
+def _parity(values):
+    for shift in (32, 16, 8, 4, 2, 1):
+        values = values ^ (values >> np.uint64(shift))
+    return values & np.uint64(1)
+
+
+class CompactCounts(Mapping):
+    """
+    Counts of ``num_bits``-bit outcomes. ``register_sizes`` (clbit 0's
+    register first) only affects how labels are printed: registers are
+    separated by spaces, most recent first, as in ``get_counts()``.
+    """
+
+    def __init__(self, keys, counts, num_bits, register_sizes=None):
+        if num_bits > MAX_BITS:
+            raise ValueError(f"CompactCounts holds at most {MAX_BITS} bits, got {num_bits}")
+        self.keys_array, self.counts_array = _unique(keys, np.asarray(counts, dtype=np.int64))
+        self.num_bits = int(num_bits)
+        self.register_sizes = list(register_sizes) if register_sizes else [self.num_bits]
+        self._labels = None
+
+    @classmethod
+    def _sorted(cls, keys, counts, num_bits, register_sizes=None):
+        # Trusted path: ``keys`` already unique and sorted.
+        self = cls.__new__(cls)
+        self.keys_array, self.counts_array = keys, counts
+        self.num_bits = num_bits
+        self.register_sizes = list(register_sizes) if register_sizes else [num_bits]
+        self._labels = None
+        return self
+
+    # constructors -----------------------------------------------------------
+
+    @classmethod
+    def from_dict(cls, counts):
+        """From ``{"bits": count}`` (space-separated registers allowed) or ``{int: count}``."""
+        if not counts:
+            return cls([], [], 0)
+        first = next(iter(counts))
+        if isinstance(first, str):
+            register_sizes = [len(part) for part in reversed(first.split())]
+            keys = [int(label.replace(" ", ""), 2) for label in counts]
+        else:
+            register_sizes = None
+            keys = [int(key) for key in counts]
+        num_bits = sum(register_sizes) if register_sizes else max(max(keys).bit_length(), 1)
+        return cls(keys, list(counts.values()), num_bits, register_sizes)
+
+    @classmethod
+    def from_bitarray(cls, bitarray):
+        """From a sampler ``BitArray``; shots of all parameter sets are pooled."""
+        nbytes = bitarray.array.shape[-1]
+        if nbytes > MAX_BITS // 8:
+            raise ValueError(f"CompactCounts holds at most {MAX_BITS} bits, got {bitarray.num_bits}")
+        packed = np.zeros((bitarray.array.size // nbytes, 8), dtype=np.uint8)
+        packed[:, 8 - nbytes:] = bitarray.array.reshape(-1, nbytes)
+        keys, counts = np.unique(packed.view(">u8").ravel(), return_counts=True)
+        return cls(keys, counts, bitarray.num_bits)
+
+    @classmethod
+    def from_result(cls, result, experiment=0):
+        """From one experiment of a ``Result`` (or a ``get_counts()`` dict)."""
+        if isinstance(result, Mapping):
+            return cls.from_dict(result)
+        # Offline SDK results already carry key/count arrays.
+        data = result.results[experiment]
+        if hasattr(data, "keys") and hasattr(data, "register_sizes"):
+            return cls(data.keys, data.counts, sum(data.register_sizes), data.register_sizes)
+        return cls.from_dict(result.get_counts(experiment))
+
+    # mapping view -----------------------------------------------------------
+
+    def _label(self, key):
+        parts, offset = [], 0
+        for size in self.register_sizes:
+            parts.append(format((key >> offset) & ((1 << size) - 1), f"0{size}b"))
+            offset += size
+        return " ".join(reversed(parts))
+
+    def labels(self):
+        if self._labels is None:
+            self._labels = [self._label(key) for key in self.keys_array.tolist()]
+        return self._labels
+
+    def __getitem__(self, label):
+        try:
+            key = np.uint64(int(label.replace(" ", ""), 2) if isinstance(label, str) else operator.index(label))
+        except (ValueError, OverflowError, TypeError):
+            raise KeyError(label) from None  # not a bitstring or outcome this could hold
+        index = np.searchsorted(self.keys_array, key)
+        if index < len(self.keys_array) and self.keys_array[index] == key:
+            return int(self.counts_array[index])
+        raise KeyError(label)
+
+    def __iter__(self):
+        return iter(self.labels())
+
+    def __len__(self):
+        return len(self.keys_array)
+
+    # Materialised rather than views: walking the arrays beats a lookup per label.
+    def values(self):
+        return self.counts_array.tolist()
+
+    def items(self):
+        return list(zip(self.labels(), self.counts_array.tolist()))
+
+    def int_counts(self):
+        return dict(zip(self.keys_array.tolist(), self.counts_array.tolist()))
+
+    def __repr__(self):
+        return f"<CompactCounts {len(self)} outcomes, {self.shots} shots, {self.num_bits} bits>"
+
+    # operations -------------------------------------------------------------
+
+    @property
+    def shots(self):
+        return int(self.counts_array.sum())
+
+    def probabilities(self):
+        return self.counts_array / self.shots
+
+    def marginalize(self, qubits):
+        """Counts over ``qubits`` only; bit ``i`` of the new keys is bit ``qubits[i]`` of the old."""
+        qubits = list(qubits)
+        keys = np.zeros(len(self.keys_array), dtype=np.uint64)
+        for position, qubit in enumerate(qubits):
+            keys |= ((self.keys_array >> np.uint64(qubit)) & np.uint64(1)) << np.uint64(position)
+        if len(qubits) <= DENSE_BITS:
+            dense = np.bincount(keys.astype(np.intp), weights=self.counts_array, minlength=1 << len(qubits))
+            seen = np.flatnonzero(dense)
+            return CompactCounts._sorted(seen.astype(np.uint64), dense[seen].astype(np.int64), len(qubits))
+        return CompactCounts(keys, self.counts_array, len(qubits))
+
+    def top_k(self, k):
+        """The ``k`` most frequent outcomes as ``CompactCounts``."""
+        if k >= len(self):
+            return self
+        chosen = np.argpartition(-self.counts_array, k - 1)[:k]
+        return CompactCounts(self.keys_array[chosen], self.counts_array[chosen], self.num_bits, self.register_sizes)
+
+    def most_frequent(self):
+        return self._label(int(self.keys_array[np.argmax(self.counts_array)]))
+
+    def merge(self, *others):
+        """Pooled counts of this and ``others`` (same bit layout)."""
+        keys = np.concatenate([self.keys_array] + [o.keys_array for o in others])
+        counts = np.concatenate([self.counts_array] + [o.counts_array for o in others])
+        num_bits = max([self.num_bits] + [o.num_bits for o in others])
+        return CompactCounts(keys, counts, num_bits, self.register_sizes if num_bits == self.num_bits else None)
+
+    def expectation(self, z):
+        """
+        ``<Z...Z>`` estimated from the counts. ``z`` is a label such as
+        ``"ZZIZ"`` (rightmost character is bit 0, ``I`` skipped) or a list
+        of bit indices.
+        """
+        if isinstance(z, str):
+            qubits = [i for i, char in enumerate(reversed(z.upper())) if char == "Z"]
+            if set(z.upper()) - {"Z", "I"}:
+                raise ValueError(f"expectation() takes a Z/I string, got {z!r}")
+        else:
+            qubits = list(z)
+        mask = np.uint64(sum(1 << q for q in qubits))
+        signs = 1 - 2 * _parity(self.keys_array & mask).astype(np.int64)
+        return float(signs @ self.counts_array / self.shots)
@@ -0,0 +1,223 @@
+"""
+Pack the most useful Documents/ sections for a question into a token budget.
+
+Sections are taken in priority order:
+
+    0. tested code examples whose header matches the user's versions
+    1. reference sections (QuantumRingsLib / Qiskit integration references)
+    2. overview and setup sections
+
+Within a tier, sections are ranked by BM25 relevance to the question. A
+section that does not fit the remaining budget first has its long docstring
+preambles trimmed (the QrEstimatorV1/V2 API dumps, for example); if it still
+does not fit it is dropped and the packer moves on to smaller candidates.
+
+Usage:
+    python Tools/context_packer.py "estimate ZZ expectation value" --budget 3000 --sdk QuantumRingsLib=0.10.11
+"""
+
+import argparse
+import math
+import re
+import sys
+from pathlib import Path
+
+from bm25_index import INDEX_DIR, BM25Index
+from example_headers import DOCUMENTS_DIR
+from example_index import INDEX_PATH, ExampleIndex
+
+EXAMPLES_TIER, REFERENCE_TIER, OVERVIEW_TIER = 0, 1, 2
+TIER_NAMES = {EXAMPLES_TIER: "example", REFERENCE_TIER: "reference", OVERVIEW_TIER: "overview"}
+
+REFERENCE_DOCS = ("QuantumRingsLib-Reference.md", "Qiskit-Integration-Reference.md")
+OVERVIEW_DOCS = ("Overview-and-Setup.md",)
+
+# Candidates considered per tier; the budget usually binds well before this.
+CANDIDATES_PER_TIER = 5
+# Docstrings longer than this are cut down to PREAMBLE_KEEP_LINES when trimming.
+PREAMBLE_MAX_LINES = 8
+PREAMBLE_KEEP_LINES = 3
+# Joins the rendered sections; each section starts with an HTML comment naming it.
+SEPARATOR = "\n\n"
+
+_TOKEN_PIECES = re.compile(r"\w+|[^\w\s]")
+_DOCSTRING = re.compile(r"^(?P<quote>'''|\"\"\")(?P<body>.*?)(?P=quote)[ \t]*$", re.S | re.M)
+
+
+def estimate_tokens(text):
+    """
+    Rough BPE token count without a tokenizer dependency: one token per
+    punctuation mark and one per ~4 characters of each word. Pass a real
+    tokenizer's length function as ``count_tokens`` for exact numbers.
+    """
+    return sum(max(1, math.ceil(len(p) / 4)) if p[0].isalnum() or p[0] == "_" else 1
+               for p in _TOKEN_PIECES.findall(text))
+
+
+def trim_preambles(text, max_lines=PREAMBLE_MAX_LINES, keep=PREAMBLE_KEEP_LINES):
+    """Shorten every triple-quoted block longer than ``max_lines`` to its first ``keep`` lines."""
+    def shorten(match):
+        lines = match.group("body").strip("\n").splitlines()
+        if len(lines) <= max_lines:
+            return match.group(0)
+        quote = match.group("quote")
+        kept = "\n".join(lines[:keep])
+        return f"{quote}\n{kept}\n[... {len(lines) - keep} docstring lines trimmed ...]\n{quote}"
+    return _DOCSTRING.sub(shorten, text)
+
+
+class Piece:
+    """One section chosen (or rejected) by the packer."""
+
+    __slots__ = ("chunk", "tier", "score", "text", "tokens", "trimmed", "reason")
+
+    def __init__(self, chunk, tier, score, text, tokens, trimmed=False, reason=None):
+        self.chunk = chunk
+        self.tier = tier
+        self.score = score
+        self.text = text
+        self.tokens = tokens
+        self.trimmed = trimmed
+        self.reason = reason
+
+    @property
+    def title(self):
+        return f"{self.chunk['doc']} > {self.chunk['heading']}"
+
+    @property
+    def block(self):
+        """The section as rendered: a title comment, then the text. ``tokens`` counts all of it."""
+        return f"<!-- {self.title} -->\n{self.text}"
+
+    def to_dict(self):
+        return {
+            "doc": self.chunk["doc"],
+            "heading": self.chunk["heading"],
+            "tier": TIER_NAMES[self.tier],
+            "score": round(self.score, 3),
+            "tokens": self.tokens,
+            "trimmed": self.trimmed,
+            "reason": self.reason,
+        }
+
+
+class Packing:
+    """Result of :func:`pack`: the kept pieces in prompt order plus a report."""
+
+    def __init__(self, budget, pieces, dropped, separator_tokens=0):
+        self.budget = budget
+        self.pieces = pieces
+        self.dropped = dropped
+        self.separator_tokens = separator_tokens
+
+    @property
+    def used(self):
+        """Tokens of :meth:`render`'s output: the sections with their titles, and the separators."""
+        joins = max(len(self.pieces) - 1, 0)
+        return sum(piece.tokens for piece in self.pieces) + joins * self.separator_tokens
+
+    def render(self):
+        return SEPARATOR.join(piece.block for piece in self.pieces)
+
+    def report(self):
+        return {
+            "budget": self.budget,
+            "used": self.used,
+            "pieces": [piece.to_dict() for piece in self.pieces],
+            "dropped": [piece.to_dict() for piece in self.dropped],
+        }
+
+
+def _tier(chunk, matching_examples):
+    if chunk["doc"] == "code-examples.md" and chunk["heading"].endswith(".py"):
+        return EXAMPLES_TIER if chunk["heading"] in matching_examples else None
+    if chunk["doc"] in REFERENCE_DOCS:
+        return REFERENCE_TIER
+    if chunk["doc"] in OVERVIEW_DOCS:
+        return OVERVIEW_TIER
+    return None
+
+
+def candidates(question, index, matching_examples, per_tier=CANDIDATES_PER_TIER):
+    """Relevant chunks as ``(tier, score, chunk id)``, best tier then best score first."""
+    ranked = sorted(index.scores(question).items(), key=lambda item: -item[1])
+    taken = {}
+    result = []
+    for chunk_id, score in ranked:
+        tier = _tier(index.chunks[chunk_id], matching_examples)
+        if tier is None or taken.get(tier, 0) >= per_tier:
+            continue
+        taken[tier] = taken.get(tier, 0) + 1
+        result.append((tier, score, chunk_id))
+    result.sort(key=lambda item: (item[0], -item[1]))
+    return result
+
+
+def pack(question, budget, versions=None, index=None, example_index=None,
+         count_tokens=estimate_tokens, per_tier=CANDIDATES_PER_TIER):
+    """
+    Choose sections for ``question`` whose rendered size stays within
+    ``budget`` tokens. Title comments and separators are charged too.
+
+    ``versions`` maps package names to the user's versions, e.g.
+    ``{"QuantumRingsLib": "0.10.11"}``; only examples marked tested(+) on all
+    of them are eligible for the top tier. Without versions, any example
+    relevant to the question qualifies.
+    """
+    index = index or BM25Index.open()
+    example_index = example_index or ExampleIndex.load()
+    if versions:
+        matching = {ex["name"] for ex in example_index.query(sdk=versions, status="tested")}
+    else:
+        matching = {ex["name"] for ex in example_index.examples}
+
+    pieces, dropped = [], []
+    separator = count_tokens(SEPARATOR)
+    remaining = budget
+    for tier, score, chunk_id in candidates(question, index, matching, per_tier):
+        piece = Piece(index.chunks[chunk_id], tier, score, index.text(chunk_id), 0)
+        piece.tokens = count_tokens(piece.block)
+        join = separator if pieces else 0
+        if piece.tokens + join > remaining:
+            shorter = trim_preambles(piece.text)
+            if shorter != piece.text:
+                piece.text, piece.trimmed = shorter, True
+                piece.tokens = count_tokens(piece.block)
+        if piece.tokens + join > remaining:
+            piece.reason = "over budget"
+            dropped.append(piece)
+            continue
+        pieces.append(piece)
+        remaining -= piece.tokens + join
+    return Packing(budget, pieces, dropped, separator)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("question")
+    parser.add_argument("--budget", type=int, default=4000)
+    parser.add_argument("--sdk", action="append", default=[], metavar="PACKAGE=VERSION")
+    parser.add_argument("--documents", type=Path, default=DOCUMENTS_DIR)
+    parser.add_argument("--index", type=Path, default=INDEX_DIR)
+    parser.add_argument("--example-index", type=Path, default=INDEX_PATH)
+    parser.add_argument("--render", action="store_true", help="print the packed context")
+    args = parser.parse_args(argv)
+
+    versions = dict(value.split("=", 1) for value in args.sdk)
+    packing = pack(args.question, args.budget, versions,
+                   BM25Index.open(args.index, args.documents),
+                   ExampleIndex.load(args.example_index))
+    if args.render:
+        print(packing.render())
+        return 0
+    for piece in packing.pieces:
+        note = " (trimmed)" if piece.trimmed else ""
+        print(f"{piece.tokens:6d}  {TIER_NAMES[piece.tier]:9s}  {piece.title}{note}")
+    for piece in packing.dropped:
+        print(f"{piece.tokens:6d}  dropped    {piece.title} ({piece.reason})")
+    print(f"{packing.used}/{packing.budget} tokens used")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
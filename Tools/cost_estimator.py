@@ -0,0 +1,412 @@
+"""
+Estimate what a circuit will cost before it is submitted, and refuse the ones that cannot run.
+
+Nothing in the examples checks a circuit against the account or the backend
+before ``backend.run()``, so an over-limit circuit is noticed only after it
+has waited in the queue. ``estimate`` takes one native or Qiskit circuit
+and, in a single pass over its instructions, reports:
+
+* qubits, depth, gate count and two-qubit (and larger) gate count;
+* a cut-width estimate: for every cut between qubit ``i`` and ``i + 1``,
+  the number of multi-qubit gates crossing it, capped by the qubits on the
+  smaller side. Each crossing gate adds at most one ebit of entanglement,
+  so the largest cut bounds how much entanglement the simulator must carry;
+* predicted run time and memory from a :class:`CostModel` calibrated on
+  ``bench_output.txt`` (Tools/benchmarks.py). A statevector simulator
+  touches all ``2^qubits`` amplitudes per gate, so run time is fitted per
+  execution path as ``a + b*2^n + c*gates*2^n + d*shots`` and peak memory as
+  ``m0 + k*(bytes of one state)``, with non-negative weights and relative
+  errors. ``scaling="cut_width"`` puts ``2^cut_width`` in place of ``2^n``
+  for an MPS-style backend whose cost follows the entanglement instead. The
+  benchmark circuits are rebuilt to profile them. The fit is cached in
+  ``Tools/.cache/cost_model.json`` and redone when the benchmark file
+  changes; without a benchmark file a built-in calibration is used, with a
+  warning. Circuits wider than the calibrated range get a warning too.
+
+``check`` compares a batch of estimates with :class:`Limits`. The limits come
+from ``provider.active_account()["max_qubits"]`` (a provider_session
+session works and is cached), from the backend's ``num_qubits`` and
+``max_circuits``, and from batch_submit's own validation, plus optional
+run-time and memory budgets. ``admit`` raises :class:`AdmissionError` on
+any problem and emits warnings for the rest.
+
+Usage:
+    from cost_estimator import admit, estimate
+    estimate(qc, shots=1000).runtime_s
+    admit(circuits, backend=backend, account=provider, shots=1000, max_runtime=600)
+    python Tools/cost_estimator.py circuits/*.qasm --shots 1000 --max-qubits 128 --max-runtime 600
+"""
+
+import argparse
+import collections
+import json
+import sys
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+from batch_submit import validate_circuit
+from example_headers import REPO_ROOT
+from validate_examples import write_json
+
+TOOLS_DIR = Path(__file__).resolve().parent
+BENCH_PATH = REPO_ROOT / "bench_output.txt"
+MODEL_PATH = TOOLS_DIR / ".cache" / "cost_model.json"
+MODEL_VERSION = 2
+SHOTS = 1024
+# complex128 amplitudes.
+AMPLITUDE_BYTES = 16
+IGNORED = frozenset({"barrier", "delay", "snapshot"})
+
+Profile = collections.namedtuple("Profile", "qubits depth gates two_qubit cut_width parameters")
+Estimate = collections.namedtuple("Estimate", "qubits depth gates two_qubit cut_width parameters shots "
+                                              "runtime_s memory_mib")
+Limits = collections.namedtuple("Limits", "max_qubits max_circuits max_runtime_s max_memory_mib")
+
+
+# ---------------------------------------------------------------- profiling
+
+def _operations(circuit):
+    """``(name, qubit indices)`` for both native and Qiskit circuits."""
+    data = circuit.data
+    if data and hasattr(data[0], "operation"):
+        index = {bit: i for i, bit in enumerate(circuit.qubits)}
+        return ((item.operation.name, [index[q] for q in item.qubits]) for item in data)
+    return ((inst.name, inst.qubits) for inst in data)
+
+
+def profile(circuit):
+    """The structural numbers behind an :class:`Estimate`, from one pass over ``circuit``."""
+    n = circuit.num_qubits
+    levels = [0] * n
+    crossings = [0] * max(n - 1, 0)  # difference array over the cuts between neighbouring qubits
+    gates = two_qubit = 0
+    for name, qubits in _operations(circuit):
+        if name in IGNORED or not qubits:
+            continue
+        level = 1 + max(levels[q] for q in qubits)
+        for q in qubits:
+            levels[q] = level
+        if name == "measure" or name == "reset":
+            continue
+        gates += 1
+        if len(qubits) > 1:
+            two_qubit += 1
+            low, high = min(qubits), max(qubits)
+            crossings[low] += 1
+            if high < n - 1:
+                crossings[high] -= 1
+    cut_width = running = 0
+    for i, delta in enumerate(crossings):
+        running += delta
+        cut_width = max(cut_width, min(running, i + 1, n - i - 1))
+    return Profile(n, max(levels, default=0), gates, two_qubit, cut_width, getattr(circuit, "num_parameters", 0))
+
+
+def _runtime_features(size, gates, shots):
+    return [1.0, float(size), float(gates) * size, float(shots)]
+
+
+def _memory_features(size):
+    return [1.0, size * AMPLITUDE_BYTES / 2 ** 20]
+
+
+# ------------------------------------------------------------------- model
+
+class CostModel:
+    """
+    Per-path weights for run seconds and peak MiB. Paths are the benchmark's
+    ``native``, ``toolkit`` and ``sampler``. ``scaling`` is ``"qubits"`` or
+    ``"cut_width"``, the width ``w`` of the ``2^w`` state the cost follows;
+    ``calibrated`` is the ``[lowest, highest]`` width in the calibration data.
+    """
+
+    def __init__(self, runtime, memory, source=None, scaling="qubits", calibrated=None):
+        if scaling not in ("qubits", "cut_width"):
+            raise ValueError(f"scaling must be 'qubits' or 'cut_width', not {scaling!r}")
+        self.runtime = runtime
+        self.memory = memory
+        self.source = source
+        self.scaling = scaling
+        self.calibrated = calibrated
+
+    def width(self, qubits, cut_width):
+        return qubits if self.scaling == "qubits" else cut_width
+
+    def predict(self, path, qubits, gates, cut_width, shots):
+        """``(run seconds, peak MiB)`` for one circuit on ``path``."""
+        path = path if path in self.runtime else next(iter(self.runtime))
+        size = 2.0 ** self.width(qubits, cut_width)
+        runtime = float(np.dot(_runtime_features(size, gates, shots), self.runtime[path]))
+        # Never less than the state itself, whatever the fit says.
+        memory = max(float(np.dot(_memory_features(size), self.memory[path])), _memory_features(size)[1])
+        return runtime, memory
+
+    def extrapolates(self, qubits, cut_width):
+        """Whether a circuit is wider than anything the model was calibrated on."""
+        return self.calibrated is not None and self.width(qubits, cut_width) > self.calibrated[1]
+
+    def to_json(self):
+        return {"version": MODEL_VERSION, "runtime": self.runtime, "memory": self.memory, "source": self.source,
+                "scaling": self.scaling, "calibrated": self.calibrated}
+
+    @classmethod
+    def from_json(cls, data):
+        if data.get("version") != MODEL_VERSION:
+            raise ValueError("cost model was written by another version")
+        return cls(data["runtime"], data["memory"], data.get("source"), data.get("scaling", "qubits"),
+                   data.get("calibrated"))
+
+
+# Fitted with calibrate() to the offline SDK's benchmarks.py grid over 4-22 qubits; used when
+# bench_output.txt is missing. Rerun benchmarks.py for numbers that match this machine.
+DEFAULT_CALIBRATION = {
+    "version": MODEL_VERSION,
+    "runtime": {"native": [0.001826, 3.095e-08, 8.677e-09, 0.0],
+                "toolkit": [0.002151, 0.0, 1.043e-08, 5.36e-09],
+                "sampler": [0.002985, 2.345e-08, 8.256e-09, 1.495e-07]},
+    "memory": {"native": [0.02615, 3.116], "toolkit": [0.1456, 3.024], "sampler": [0.04449, 3.124]},
+    "source": "built-in calibration (offline SDK, 4-22 qubits)",
+    "scaling": "qubits",
+    "calibrated": [4, 22],
+}
+
+
+def read_benchmarks(path=BENCH_PATH):
+    """The case rows of a benchmarks.py report, as dicts."""
+    rows, header = [], None
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        fields = line.split()
+        if header is None:
+            header = fields
+            continue
+        row = dict(zip(header, fields))
+        rows.append({key: value if key in ("workload", "path") else float(value) for key, value in row.items()})
+    return rows
+
+
+def _fit(features, targets):
+    """Non-negative weights for ``features @ w ~ targets``, minimizing the relative error."""
+    y = np.maximum(np.array(targets, dtype=float), 1e-6)
+    x = np.array(features, dtype=float) / y[:, None]
+    scale = np.maximum(np.abs(x).max(axis=0), 1e-300)
+    x = x / scale
+    active = list(range(x.shape[1]))
+    while True:
+        solution = np.linalg.lstsq(x[:, active], np.ones(len(y)), rcond=None)[0]
+        if (solution >= 0).all():
+            break
+        # Drop the most negative term and refit; a term cannot make the cost smaller.
+        active.pop(int(np.argmin(solution)))
+    weights = np.zeros(x.shape[1])
+    weights[active] = solution
+    return (weights / scale).tolist()
+
+
+def calibrate(bench_path=BENCH_PATH, scaling="qubits"):
+    """Fit a :class:`CostModel` to a benchmarks.py report, profiling the rebuilt workload circuits."""
+    from benchmarks import WORKLOADS, Library
+    from offline_sdk import native
+    library = Library(native.QuantumCircuit, native.ParameterVector, True)
+    profiles = {}
+    widths = []
+    width = CostModel({}, {}, scaling=scaling).width
+    samples = collections.defaultdict(lambda: ([], [], [], []))
+    for row in read_benchmarks(bench_path):
+        key = (row["workload"], int(row["qubits"]), int(row["depth"]))
+        if key not in profiles:
+            circuits = [profile(c) for c in WORKLOADS[key[0]](library, key[1], key[2])]
+            profiles[key] = (max(p.qubits for p in circuits), sum(p.gates for p in circuits),
+                             max(p.cut_width for p in circuits))
+        qubits, gates, cut_width = profiles[key]
+        size = 2.0 ** width(qubits, cut_width)
+        widths.append(width(qubits, cut_width))
+        runtime_features, runtimes, memory_features, memories = samples[row["path"]]
+        runtime_features.append(_runtime_features(size, gates, row["shots"]))
+        runtimes.append(row["run_s"])
+        memory_features.append(_memory_features(size))
+        memories.append(row["peak_mib"])
+    if not samples:
+        raise ValueError(f"{bench_path} has no benchmark rows")
+    runtime = {path: _fit(f, r) for path, (f, r, _, _) in samples.items()}
+    memory = {path: _fit(f, m) for path, (_, _, f, m) in samples.items()}
+    return CostModel(runtime, memory, str(bench_path), scaling, [min(widths), max(widths)])
+
+
+def load_model(bench_path=BENCH_PATH, model_path=MODEL_PATH):
+    """
+    The cached calibration for ``bench_path``, refitted if the report changed
+    since. Without the report (it is not checked in) the built-in
+    ``DEFAULT_CALIBRATION`` is returned, with a warning.
+    """
+    try:
+        stat = Path(bench_path).stat()
+    except FileNotFoundError:
+        warnings.warn(f"{bench_path} not found; using the built-in cost calibration. Run Tools/benchmarks.py "
+                      f"to calibrate for this machine", RuntimeWarning, stacklevel=2)
+        return CostModel.from_json(DEFAULT_CALIBRATION)
+    stamp = [str(bench_path), stat.st_size, stat.st_mtime_ns]
+    try:
+        data = json.loads(Path(model_path).read_text(encoding="utf-8"))
+        if data.get("stamp") == stamp:
+            return CostModel.from_json(data)
+    except (OSError, ValueError, KeyError):
+        pass
+    model = calibrate(bench_path)
+    write_json(model_path, dict(model.to_json(), stamp=stamp))
+    return model
+
+
+_MODEL = None
+
+
+def default_model():
+    global _MODEL
+    if _MODEL is None:
+        _MODEL = load_model()
+    return _MODEL
+
+
+# --------------------------------------------------------------- estimates
+
+def _path(circuit):
+    data = circuit.data
+    return "toolkit" if data and hasattr(data[0], "operation") else "native"
+
+
+def estimate(circuit, shots=SHOTS, *, path=None, model=None):
+    """An :class:`Estimate` for running ``circuit`` once with ``shots`` shots."""
+    p = profile(circuit)
+    runtime, memory = (model or default_model()).predict(path or _path(circuit), p.qubits, p.gates,
+                                                         p.cut_width, shots)
+    return Estimate(*p, shots, runtime, memory)
+
+
+def limits(backend=None, account=None, *, max_runtime=None, max_memory=None):
+    """
+    :class:`Limits` from ``account`` (the ``active_account()`` dict, a
+    provider or a provider_session session) and ``backend``. The tighter
+    qubit limit wins; a limit nobody sets is ``None``.
+    """
+    if account is not None and hasattr(account, "active_account"):
+        account = account.active_account()
+    bounds = [value for value in ((account or {}).get("max_qubits"), getattr(backend, "num_qubits", None))
+              if value is not None]
+    return Limits(min(bounds, default=None), getattr(backend, "max_circuits", None), max_runtime, max_memory)
+
+
+class AdmissionError(ValueError):
+    """Raised by ``Admission.raise_for_problems()``; ``problems`` maps circuit index (or ``None``) to the reason."""
+
+    def __init__(self, problems):
+        self.problems = problems
+        detail = "; ".join(f"{'batch' if i is None else f'circuit {i}'}: {reason}"
+                           for i, reason in sorted(problems.items(), key=lambda item: (item[0] is not None, item[0])))
+        super().__init__(f"{len(problems)} problem(s) before submission: {detail}")
+
+
+class Admission:
+    """Estimates for a batch plus the problems that block it and the warnings that do not."""
+
+    def __init__(self, estimates, limits):
+        self.estimates = estimates
+        self.limits = limits
+        self.problems = {}
+        self.warnings = []
+
+    @property
+    def ok(self):
+        return not self.problems
+
+    @property
+    def runtime_s(self):
+        return sum(e.runtime_s for e in self.estimates)
+
+    def raise_for_problems(self):
+        if self.problems:
+            raise AdmissionError(self.problems)
+
+    def __repr__(self):
+        return (f"<Admission {len(self.estimates)} circuit(s), ~{self.runtime_s:.3g}s, "
+                f"{len(self.problems)} problem(s), {len(self.warnings)} warning(s)>")
+
+
+def check(circuits, *, backend=None, account=None, shots=SHOTS, max_runtime=None, max_memory=None,
+          batched=False, path=None, model=None):
+    """
+    An :class:`Admission` for submitting ``circuits`` (one circuit or a list)
+    to ``backend``. ``max_runtime`` (seconds, whole batch) and ``max_memory``
+    (MiB, per circuit) are optional budgets. ``batched=True`` means the batch
+    goes through batch_submit, so ``max_circuits`` is not a problem.
+    ``path`` picks the calibration (default: ``native`` or ``toolkit`` by circuit type).
+    """
+    circuits = list(circuits) if isinstance(circuits, (list, tuple)) else [circuits]
+    model = model or default_model()
+    bounds = limits(backend, account, max_runtime=max_runtime, max_memory=max_memory)
+    admission = Admission([estimate(c, shots, path=path, model=model) for c in circuits], bounds)
+    for index, (circuit, e) in enumerate(zip(circuits, admission.estimates)):
+        if bounds.max_qubits is not None and e.qubits > bounds.max_qubits:
+            admission.problems[index] = f"uses {e.qubits} qubits but the account/backend allows {bounds.max_qubits}"
+        elif backend is not None and (problem := validate_circuit(backend, circuit)):
+            admission.problems[index] = problem
+        elif e.parameters:
+            admission.problems[index] = "has unbound parameters"
+        elif bounds.max_memory_mib is not None and e.memory_mib > bounds.max_memory_mib:
+            admission.problems[index] = f"needs ~{e.memory_mib:.3g} MiB, over the {bounds.max_memory_mib:g} MiB budget"
+        if model.extrapolates(e.qubits, e.cut_width):
+            admission.warnings.append(f"circuit {index}: {model.width(e.qubits, e.cut_width)} "
+                                      f"{model.scaling.replace('_', ' ')} is beyond the calibrated "
+                                      f"{model.calibrated[0]}-{model.calibrated[1]}; the estimates are extrapolated")
+    if not batched and bounds.max_circuits is not None and len(circuits) > bounds.max_circuits:
+        admission.problems[None] = (f"{len(circuits)} circuits in one run() but the backend takes "
+                                    f"{bounds.max_circuits}; use batch_submit.submit_batched")
+    if bounds.max_runtime_s is not None and admission.runtime_s > bounds.max_runtime_s:
+        admission.problems.setdefault(None, f"predicted ~{admission.runtime_s:.3g}s, over the "
+                                            f"{bounds.max_runtime_s:g}s budget")
+    return admission
+
+
+def admit(circuits, **options):
+    """:func:`check`, raising :class:`AdmissionError` on problems and warning about the rest; returns the estimates."""
+    admission = check(circuits, **options)
+    for message in admission.warnings:
+        warnings.warn(message, RuntimeWarning, stacklevel=2)
+    admission.raise_for_problems()
+    return admission.estimates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("qasm", nargs="+", type=Path, help="OpenQASM 2.0 files")
+    parser.add_argument("--shots", type=int, default=SHOTS)
+    parser.add_argument("--path", choices=("native", "toolkit", "sampler"), default="native")
+    parser.add_argument("--max-qubits", type=int)
+    parser.add_argument("--max-circuits", type=int)
+    parser.add_argument("--max-runtime", type=float, help="seconds for the whole batch")
+    parser.add_argument("--max-memory", type=float, help="MiB per circuit")
+    parser.add_argument("--bench", type=Path, default=BENCH_PATH, help="benchmarks.py report to calibrate on")
+    args = parser.parse_args(argv)
+
+    from qasm_loader import load
+    model = load_model(args.bench)
+    circuits = [load(path) for path in args.qasm]
+    account = {"max_qubits": args.max_qubits}
+    backend = argparse.Namespace(max_circuits=args.max_circuits) if args.max_circuits else None
+    admission = check(circuits, backend=backend, account=account, shots=args.shots, max_runtime=args.max_runtime,
+                      max_memory=args.max_memory, batched=args.max_circuits is None, path=args.path, model=model)
+    print(f"{'circuit':<24} {'qubits':>6} {'depth':>6} {'gates':>7} {'2q':>6} {'cut':>4} {'run_s':>9} {'MiB':>8}")
+    for path, e in zip(args.qasm, admission.estimates):
+        print(f"{path.name:<24} {e.qubits:>6} {e.depth:>6} {e.gates:>7} {e.two_qubit:>6} {e.cut_width:>4} "
+              f"{e.runtime_s:>9.3g} {e.memory_mib:>8.3g}")
+    for message in admission.warnings:
+        print(f"warning: {message}")
+    for index, reason in admission.problems.items():
+        print(f"rejected {'batch' if index is None else args.qasm[index].name}: {reason}")
+    return 1 if admission.problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Split Documents/*.md into heading-level chunks for retrieval.
+
+A chunk starts at every ``#``, ``##`` or ``###`` heading outside a fenced
+code block and runs to the next such heading, so "### OptimizeQuantumCircuit"
+or "### QrSamplerV1 / QrSamplerV2" each become one chunk. Deeper headings
+stay inside their parent. In code-examples.md every embedded example
+(``## <script>.py``) is one chunk, comments inside the code included.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+
+from example_headers import DOCUMENTS_DIR
+
+MAX_CHUNK_LEVEL = 3
+
+_HEADING = re.compile(r"^(?P<hashes>#{1,6})\s+(?P<title>.+?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+
+
+class Chunk:
+    """One heading-delimited section of a document."""
+
+    __slots__ = ("doc", "heading", "path", "level", "start", "end", "text")
+
+    def __init__(self, doc, heading, path, level, start, end, text):
+        self.doc = doc
+        self.heading = heading
+        self.path = path
+        self.level = level
+        self.start = start
+        self.end = end
+        self.text = text
+
+    @property
+    def chunk_id(self):
+        """Stable id: document plus heading path (line numbers drift too easily)."""
+        return f"{self.doc}#{' > '.join(self.path)}"
+
+    @property
+    def is_example(self):
+        return self.doc == "code-examples.md" and self.heading.endswith(".py")
+
+    def digest(self):
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
+    def to_dict(self):
+        return {
+            "doc": self.doc,
+            "heading": self.heading,
+            "path": list(self.path),
+            "level": self.level,
+            "start": self.start,
+            "end": self.end,
+        }
+
+    def __repr__(self):
+        return f"Chunk({self.chunk_id!r}, lines {self.start}-{self.end})"
+
+
+def chunk_markdown(text, doc, max_level=MAX_CHUNK_LEVEL):
+    """
+    Split markdown ``text`` into chunks. Line numbers are 1-based and
+    inclusive. Text before the first heading becomes a chunk named after
+    the document; chunks with nothing but whitespace are dropped.
+    """
+    lines = text.splitlines()
+    chunks = []
+    stack = []
+    start, heading, level = 0, doc, 0
+    in_fence = False
+
+    def flush(end):
+        body = "\n".join(lines[start:end]).strip()
+        if body and body != ("#" * level + " " + heading).strip():
+            chunks.append(Chunk(doc, heading, tuple(t for _, t in stack) or (doc,),
+                                level, start + 1, end, body))
+
+    for i, line in enumerate(lines):
+        if _FENCE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        match = _HEADING.match(line)
+        if not match or len(match.group("hashes")) > max_level:
+            continue
+        flush(i)
+        level = len(match.group("hashes"))
+        heading = match.group("title").strip("* ")
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        stack.append((level, heading))
+        start = i
+    flush(len(lines))
+    return chunks
+
+
+def chunk_file(path, max_level=MAX_CHUNK_LEVEL):
+    path = Path(path)
+    return chunk_markdown(path.read_text(encoding="utf-8"), path.name, max_level)
+
+
+def document_paths(documents_dir=DOCUMENTS_DIR):
+    return sorted(Path(documents_dir).glob("*.md"), key=lambda p: p.name)
+
+
+def chunk_documents(documents_dir=DOCUMENTS_DIR, max_level=MAX_CHUNK_LEVEL):
+    """All chunks of every markdown document in ``documents_dir``."""
+    chunks = []
+    for path in document_paths(documents_dir):
+        chunks.extend(chunk_file(path, max_level))
+    return chunks
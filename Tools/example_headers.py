@@ -0,0 +1,192 @@
+"""
+Parser for the YAML-like comment header at the top of every Code/*.py example.
+
+A header looks like::
+
+    # ---
+    # title: Qiskit Toolkit Basic 10
+    # synergy: |
+    #   - quantumrings.toolkit.qiskit 0.1.10 fails(!) with Qiskit 2.0
+    # sdk ["tested(+)", "fails(!)", "untested(?)"]:
+    #   QuantumRingsLib: [0.9.11(+), 0.10.11(+)]
+    #   Qiskit: [1.3.1(+), 1.4.1(+), 2.0(?)]
+    # python: [3.11(+)]
+    # os: [Windows 11(+), Ubuntu 22.04(?)]
+    # tags: ['Qiskit', 'QrBackendV2']
+    # description: >
+    #   Free text folded onto one line.
+    # ---
+
+The headers are hand written and not strictly YAML (unquoted version lists,
+markers glued to versions), so they are parsed line by line here instead of
+going through a YAML loader.
+"""
+
+import re
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CODE_DIR = REPO_ROOT / "Code"
+DOCUMENTS_DIR = REPO_ROOT / "Documents"
+
+HEADER_FENCE = "# ---"
+
+# (+) tested & works, (!) known to fail, (?) untested. No marker means untested.
+MARKERS = {"+": "tested", "!": "fails", "?": "untested"}
+
+_KEY_LINE = re.compile(r"^#\s(?P<key>[A-Za-z][\w-]*)(?P<rest>[^:]*):\s*(?P<value>.*)$")
+_NESTED_LINE = re.compile(r"^#\s{2,}(?P<key>[A-Za-z][\w.-]*):\s*(?P<value>.*)$")
+_CONTINUATION = re.compile(r"^#\s{2,}(?P<text>.*)$")
+_VERSION_ENTRY = re.compile(r"^(?P<name>.*?)\s*(?:\((?P<marker>[+!?])\))?$")
+
+
+def _split_list(value):
+    """Split an inline ``[a, 'b', c(+)]`` list into stripped, unquoted items."""
+    value = value.strip()
+    if value.startswith("[") and value.endswith("]"):
+        value = value[1:-1]
+    items = []
+    for item in value.split(","):
+        item = item.strip().strip("'\"").strip()
+        if item:
+            items.append(item)
+    return items
+
+
+def parse_entry(entry):
+    """Split ``"0.10.11(+)"`` into ``("0.10.11", "tested")``."""
+    match = _VERSION_ENTRY.match(entry.strip())
+    marker = match.group("marker")
+    return match.group("name"), MARKERS[marker] if marker else "untested"
+
+
+def header_lines(text):
+    """Return the comment lines between the two ``# ---`` fences, or []."""
+    lines = text.splitlines()
+    if not lines or lines[0].rstrip() != HEADER_FENCE:
+        return []
+    for end in range(1, len(lines)):
+        if lines[end].rstrip() == HEADER_FENCE:
+            return lines[1:end]
+    return []
+
+
+def parse_header(text):
+    """
+    Parse the metadata header of an example script.
+
+    Returns a dict with ``title``, ``synergy`` (list of lines), ``sdk``
+    (package -> list of ``[version, status]``), ``python``, ``os`` (same
+    shape as ``sdk`` values), ``tags`` (list), ``description`` (str) and
+    ``gpu`` (bool or None). Missing keys get empty values so callers never
+    have to special-case older headers.
+    """
+    header = {
+        "title": "",
+        "synergy": [],
+        "sdk": {},
+        "gpu": None,
+        "python": [],
+        "os": [],
+        "tags": [],
+        "description": "",
+    }
+    block = None
+    description = []
+
+    for line in header_lines(text):
+        key_match = _KEY_LINE.match(line)
+        if key_match and not line.startswith("#  "):
+            key = key_match.group("key").lower()
+            value = key_match.group("value").strip()
+            block = key
+            if key == "title":
+                header["title"] = value
+            elif key in ("python", "os"):
+                header[key] = [list(parse_entry(e)) for e in _split_list(value)]
+            elif key == "tags":
+                header["tags"] = _split_list(value)
+            elif key == "description" and value not in (">", "|", ""):
+                description.append(value)
+            continue
+
+        if block == "sdk":
+            nested = _NESTED_LINE.match(line)
+            if nested:
+                name = nested.group("key")
+                values = _split_list(nested.group("value"))
+                if name == "GPU-enabled":
+                    header["gpu"] = bool(values) and values[0].lower() == "true"
+                else:
+                    header["sdk"][name] = [list(parse_entry(v)) for v in values]
+            continue
+
+        continuation = _CONTINUATION.match(line)
+        if not continuation:
+            continue
+        content = continuation.group("text").rstrip()
+        if block == "synergy" and content.startswith("- "):
+            header["synergy"].append(content[2:])
+        elif block == "description" and content:
+            description.append(content.strip())
+
+    header["description"] = " ".join(description)
+    return header
+
+
+def read_header(path):
+    """Parse the header of the example at ``path``."""
+    return parse_header(Path(path).read_text(encoding="utf-8"))
+
+
+def example_paths(code_dir=CODE_DIR):
+    """All example scripts, in the order they appear in code-examples.md."""
+    return sorted(Path(code_dir).glob("*.py"), key=lambda p: p.name)
+
+
+def version_matches(entry, version):
+    """Whether a header entry (``0.10.11``, ``0.10.x``, ``2.0``) covers the concrete ``version``."""
+    if entry == version:
+        return True
+    if entry.endswith(".x"):
+        return version.startswith(entry[:-1])
+    return version.startswith(entry + ".")
+
+
+def set_marker(text, key, version, status):
+    """
+    Return ``text`` with the marker of ``version`` under ``key`` set to
+    ``status`` (``"tested"``, ``"fails"`` or ``"untested"``). ``key`` is
+    ``python``, ``os`` or a package listed under ``sdk``. Every entry that
+    covers ``version`` (``0.10.x`` covers ``0.10.11``) is updated; if none
+    does, ``version`` is appended. Keys missing from the header are left alone.
+    """
+    symbol = {name: marker for marker, name in MARKERS.items()}[status]
+    lines = text.splitlines(keepends=True)
+    if not header_lines(text):
+        return text
+    for i in range(1, len(lines)):
+        line = lines[i].rstrip("\r\n")
+        if line.rstrip() == HEADER_FENCE:
+            break
+        if key in ("python", "os"):
+            match = _KEY_LINE.match(line)
+            if not match or line.startswith("#  ") or match.group("key").lower() != key:
+                continue
+        else:
+            match = _NESTED_LINE.match(line)
+            if not match or match.group("key") != key:
+                continue
+        entries = _split_list(match.group("value"))
+        found = False
+        for j, entry in enumerate(entries):
+            name, _ = parse_entry(entry)
+            if version_matches(name, version):
+                entries[j] = f"{name}({symbol})"
+                found = True
+        if not found:
+            entries.append(f"{version}({symbol})")
+        ending = lines[i][len(line):]
+        lines[i] = f"{line[:match.start('value')]}[{', '.join(entries)}]{ending}"
+        break
+    return "".join(lines)
@@ -0,0 +1,258 @@
+"""
+Compiled metadata index over the Code/*.py example headers.
+
+All headers are parsed once and compiled into a packed JSON file of posting
+lists. Each posting key names one fact from a header, for example::
+
+    sdk:quantumringslib:0.10.11:tested
+    tag:parameter binding
+    os:windows 11:tested
+
+On load every posting list becomes an integer bitset, so a query is a handful
+of dict lookups and bitwise ANDs regardless of how many examples exist.
+Staleness is checked against each example's (size, mtime) stamp; only files
+whose stamp moved are read and hashed.
+
+Usage:
+    python Tools/example_index.py --sdk QuantumRingsLib=0.10.11 --status tested --tag "parameter binding"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from example_headers import CODE_DIR, REPO_ROOT, example_paths, parse_header
+
+INDEX_PATH = REPO_ROOT / "Tools" / ".cache" / "example-index.json"
+INDEX_VERSION = 2
+STATUSES = ("tested", "fails", "untested")
+
+
+def normalize(term):
+    """Case- and separator-insensitive form used for every posting key."""
+    return " ".join(term.lower().replace("_", " ").replace("-", " ").split())
+
+
+def version_keys(version):
+    """
+    Keys a concrete version matches: itself plus the ``.x`` wildcards headers
+    use, so ``0.10.11`` also finds examples marked ``0.10.x`` or ``0.x``.
+    """
+    parts = version.split(".")
+    keys = [version]
+    for i in range(len(parts) - 1, 0, -1):
+        keys.append(".".join(parts[:i]) + ".x")
+    return keys
+
+
+def _posting_keys(header):
+    keys = set()
+    for package, entries in header["sdk"].items():
+        package = normalize(package)
+        keys.add(f"package:{package}")
+        for version, status in entries:
+            keys.add(f"sdk:{package}:{version}:{status}")
+            keys.add(f"sdk:{package}:{version}:any")
+    for field in ("python", "os"):
+        for value, status in header[field]:
+            keys.add(f"{field}:{normalize(value)}:{status}")
+            keys.add(f"{field}:{normalize(value)}:any")
+    for tag in header["tags"]:
+        keys.add(f"tag:{normalize(tag)}")
+    if header["synergy"]:
+        keys.add("synergy")
+    if header["gpu"]:
+        keys.add("gpu")
+    return keys
+
+
+def _stamp(path):
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _digest(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def source_fingerprint(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode())
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def _changed(packed, paths):
+    """
+    Whether ``paths`` differ from the sources ``packed`` was compiled from.
+    A file that was only touched gets its new stamp in ``packed["sources"]``
+    and ``packed`` is marked ``"restamped"``.
+    """
+    stored = packed["sources"]
+    if [path.name for path in paths] != list(stored):
+        return True
+    for path in paths:
+        stamp = _stamp(path)
+        size, mtime_ns, digest = stored[path.name]
+        if stamp == [size, mtime_ns]:
+            continue
+        if stamp[0] != size or _digest(path) != digest:
+            return True
+        stored[path.name] = stamp + [digest]
+        packed["restamped"] = True
+    return False
+
+
+def compile_index(code_dir=CODE_DIR):
+    """Parse every header in ``code_dir`` and return the packed index dict."""
+    paths = example_paths(code_dir)
+    examples, postings, sources = [], {}, {}
+    for doc_id, path in enumerate(paths):
+        sources[path.name] = _stamp(path) + [_digest(path)]
+        header = parse_header(path.read_text(encoding="utf-8"))
+        examples.append({
+            "name": path.name,
+            "title": header["title"],
+            "tags": header["tags"],
+            "description": header["description"],
+            "synergy": header["synergy"],
+        })
+        for key in _posting_keys(header):
+            postings.setdefault(key, []).append(doc_id)
+    return {
+        "version": INDEX_VERSION,
+        "fingerprint": source_fingerprint(paths),
+        "sources": sources,
+        "examples": examples,
+        "postings": postings,
+    }
+
+
+def write_index(index, path=INDEX_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class ExampleIndex:
+    """In-memory form of the compiled index with bitset posting lists."""
+
+    def __init__(self, packed):
+        self.examples = packed["examples"]
+        self.fingerprint = packed["fingerprint"]
+        self._bits = {}
+        for key, ids in packed["postings"].items():
+            bits = 0
+            for doc_id in ids:
+                bits |= 1 << doc_id
+            self._bits[key] = bits
+        self._all = (1 << len(self.examples)) - 1
+
+    @classmethod
+    def load(cls, path=INDEX_PATH, code_dir=CODE_DIR, rebuild_if_stale=True):
+        """
+        Load the compiled index, recompiling it first when it is missing,
+        from an older format or (with ``rebuild_if_stale``) out of date with
+        ``code_dir``.
+        """
+        path = Path(path)
+        packed = None
+        try:
+            packed = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+        stale = (
+            packed is None
+            or packed.get("version") != INDEX_VERSION
+            or (rebuild_if_stale and _changed(packed, example_paths(code_dir)))
+        )
+        if stale:
+            packed = compile_index(code_dir)
+            write_index(packed, path)
+        elif packed.pop("restamped", False):
+            write_index(packed, path)  # so the touched files are not hashed again next time
+        return cls(packed)
+
+    def _union(self, keys):
+        bits = 0
+        for key in keys:
+            bits |= self._bits.get(key, 0)
+        return bits
+
+    def match(self, sdk=None, status="any", tags=(), python=None, os_name=None, synergy=None):
+        """
+        Return a bitset of examples matching every given constraint.
+
+        ``sdk`` maps package name to a version (``None`` means any version of
+        that package is listed). ``status`` is one of ``tested``, ``fails``,
+        ``untested`` or ``any`` and applies to every version constraint.
+        """
+        if status != "any" and status not in STATUSES:
+            raise ValueError(f"status must be one of {STATUSES + ('any',)}, not {status!r}")
+        bits = self._all
+        for package, version in (sdk or {}).items():
+            package = normalize(package)
+            if version is None:
+                bits &= self._bits.get(f"package:{package}", 0)
+            else:
+                bits &= self._union(f"sdk:{package}:{v}:{status}" for v in version_keys(version))
+        for field, value in (("python", python), ("os", os_name)):
+            if value is not None:
+                bits &= self._bits.get(f"{field}:{normalize(value)}:{status}", 0)
+        for tag in tags:
+            bits &= self._bits.get(f"tag:{normalize(tag)}", 0)
+        if synergy is not None:
+            has = self._bits.get("synergy", 0)
+            bits &= has if synergy else ~has
+        return bits
+
+    def query(self, **constraints):
+        """Like :meth:`match` but returns the matching example records."""
+        bits = self.match(**constraints)
+        return [ex for i, ex in enumerate(self.examples) if bits >> i & 1]
+
+    def tags(self):
+        return sorted(key[4:] for key in self._bits if key.startswith("tag:"))
+
+
+def _parse_sdk(values):
+    sdk = {}
+    for value in values:
+        package, _, version = value.partition("=")
+        sdk[package] = version or None
+    return sdk
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sdk", action="append", default=[], metavar="PACKAGE[=VERSION]")
+    parser.add_argument("--status", default="any", choices=STATUSES + ("any",))
+    parser.add_argument("--tag", action="append", default=[])
+    parser.add_argument("--python")
+    parser.add_argument("--os", dest="os_name")
+    parser.add_argument("--index", type=Path, default=INDEX_PATH)
+    parser.add_argument("--code-dir", type=Path, default=CODE_DIR)
+    parser.add_argument("--compile", action="store_true", help="only (re)compile the index")
+    args = parser.parse_args(argv)
+
+    if args.compile:
+        write_index(compile_index(args.code_dir), args.index)
+        print(f"wrote {args.index}")
+        return 0
+
+    index = ExampleIndex.load(args.index, args.code_dir)
+    results = index.query(sdk=_parse_sdk(args.sdk), status=args.status, tags=args.tag,
+                          python=args.python, os_name=args.os_name)
+    for example in results:
+        print(f"{example['name']}: {example['title']}")
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
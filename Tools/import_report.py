@@ -0,0 +1,157 @@
+"""
+Report how long each Code/*.py example spends importing, from ``python -X importtime``.
+
+For every script the module-level ``import`` statements are extracted with
+``ast`` and run on their own under ``-X importtime`` (the script body is not
+executed), against the offline SDK by default or the installed one with
+``--sdk installed``. Modules the bare interpreter already loads are left
+out. The report lists each script's import time with its most expensive
+top-level imports. It then lists the heaviest modules across all scripts
+and flags those above ``--flag-ms``. Those are the candidates for
+``lazy_sdk`` attribute access or for imports inside the function that needs
+them. Each script is measured ``--repeat`` times and the fastest run is kept,
+so disk-cache noise does not inflate the numbers.
+
+Usage:
+    python Tools/import_report.py [scripts...] [--sdk offline|installed] [--top 5] [--flag-ms 100] [--json out.json]
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from example_headers import CODE_DIR, example_paths
+from validate_examples import child_env
+
+REPEAT = 2
+TOP = 5
+FLAG_MS = 100.0
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_statements(source):
+    """The script's import statements (outside functions and classes), as source lines."""
+    lines = []
+
+    def visit(nodes):
+        for node in nodes:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                if not (isinstance(node, ast.ImportFrom) and node.module == "__future__"):
+                    lines.append(ast.unparse(node))
+            elif isinstance(node, (ast.If, ast.Try, ast.With)):
+                for field in ("body", "orelse", "finalbody"):
+                    visit(getattr(node, field, []))
+                for handler in getattr(node, "handlers", []):
+                    visit(handler.body)
+
+    visit(ast.parse(source).body)
+    return lines
+
+
+def parse_importtime(stderr):
+    """``[(module, self_us, cumulative_us, depth)]`` from ``-X importtime`` output, in load order."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2)), (len(match.group(3)) - 1) // 2))
+    return rows
+
+
+def measure(code, sdk):
+    """Rows for running ``code`` under ``-X importtime``; raises ``RuntimeError`` if it fails."""
+    if sdk == "offline":
+        code = "import offline_sdk; offline_sdk.install()\n" + code
+    env = child_env(sdk)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # compiling every module would swamp the numbers
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                          encoding="utf-8", errors="replace", env=env)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed")
+    return parse_importtime(proc.stderr)
+
+
+def script_report(path, sdk, baseline, repeat=REPEAT):
+    """Import cost of one script: total, top-level modules and every module's self time (all in ms)."""
+    statements = import_statements(path.read_text(encoding="utf-8"))
+    try:
+        runs = [measure("\n".join(statements), sdk) for _ in range(max(repeat, 1))]
+    except RuntimeError as exc:
+        return {"script": path.name, "error": str(exc), "total_ms": None, "top_level": [], "modules": {}}
+    rows = [row for row in min(runs, key=lambda rows: sum(r[2] for r in rows if r[3] == 0))
+            if row[0] not in baseline]
+    top_level = sorted(((name, cumulative / 1000) for name, _, cumulative, depth in rows if depth == 0),
+                       key=lambda item: -item[1])
+    return {
+        "script": path.name,
+        "error": None,
+        "total_ms": round(sum(ms for _, ms in top_level), 1),
+        "top_level": [(name, round(ms, 1)) for name, ms in top_level],
+        "modules": {name: round(self_us / 1000, 2) for name, self_us, _, _ in rows},
+    }
+
+
+def heaviest(reports, top):
+    """Modules by the largest cumulative time any script paid for them as a top-level import."""
+    cost, scripts = {}, {}
+    for report in reports:
+        for name, ms in report["top_level"]:
+            cost[name] = max(cost.get(name, 0.0), ms)
+            scripts.setdefault(name, []).append(report["script"])
+    ranked = sorted(cost, key=lambda name: -cost[name])[:top]
+    return [(name, cost[name], scripts[name]) for name in ranked]
+
+
+def slowest_modules(reports, top):
+    """Single modules by their largest self time, not counting the modules they import."""
+    cost = {}
+    for report in reports:
+        for name, ms in report["modules"].items():
+            cost[name] = max(cost.get(name, 0.0), ms)
+    return sorted(cost.items(), key=lambda item: -item[1])[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scripts", nargs="*", type=Path, help="examples to measure (default: all of Code/)")
+    parser.add_argument("--sdk", choices=("offline", "installed"), default="offline")
+    parser.add_argument("--jobs", type=int, default=None, help="parallel scripts (default: one per core)")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per script; the fastest is kept")
+    parser.add_argument("--top", type=int, default=TOP, help="imports listed per script and overall")
+    parser.add_argument("--flag-ms", type=float, default=FLAG_MS, help="flag modules slower than this")
+    parser.add_argument("--json", type=Path, help="also write the full report here")
+    args = parser.parse_args(argv)
+
+    paths = [p.resolve() for p in args.scripts] or example_paths(CODE_DIR)
+    baseline = {row[0] for row in measure("pass", args.sdk)}
+    with ThreadPoolExecutor(max_workers=args.jobs or os.cpu_count() or 1) as pool:
+        reports = list(pool.map(lambda path: script_report(path, args.sdk, baseline, args.repeat), paths))
+
+    for report in sorted(reports, key=lambda r: -(r["total_ms"] or 0)):
+        if report["error"]:
+            print(f"   error  {report['script']}: {report['error']}")
+            continue
+        top = ", ".join(f"{name} {ms:.0f}" for name, ms in report["top_level"][:args.top])
+        print(f"{report['total_ms']:6.0f}ms  {report['script']}  ({top})")
+    print(f"\nheaviest imports (ms, worst case; * = over {args.flag_ms:.0f}ms):")
+    for name, ms, scripts in heaviest(reports, args.top):
+        flag = "*" if ms > args.flag_ms else " "
+        print(f"{flag}{ms:7.0f}  {name}  in {len(scripts)} script(s)")
+    print("\nslowest single modules (own time, ms):")
+    for name, ms in slowest_modules(reports, args.top):
+        print(f"{'*' if ms > args.flag_ms else ' '}{ms:7.1f}  {name}")
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps({"sdk": args.sdk, "scripts": reports}, indent=1), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
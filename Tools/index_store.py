@@ -0,0 +1,97 @@
+"""
+Generation directories for the on-disk search indexes (bm25_index.py, tfidf_index.py).
+
+An index is a set of files that only make sense together, and workers open
+it while another process may be rebuilding it. Every write therefore
+produces a complete new generation:
+
+    <index_dir>/current          name of the live generation, replaced atomically
+    <index_dir>/gen-<...>/       one generation's files
+    <index_dir>/gen-<...>.tmp/   a generation still being written (private to its writer)
+    <index_dir>/lock             writers hold an exclusive flock on it (POSIX only)
+
+A writer fills a private ``.tmp`` directory named by time, pid and thread,
+renames it and swaps ``current`` to it. Readers resolve ``current`` without
+locking, so they never pair files from two generations. Writers are
+serialized by the lock and remove the generations they replaced.
+
+Usage:
+    with writer_lock(index_dir):
+        publish(index_dir, lambda directory: (directory / "data.bin").write_bytes(data))
+    index = read(index_dir, load)   # load(generation directory), retried if it was replaced meanwhile
+"""
+
+import contextlib
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are not serialized, generations still never mix
+    fcntl = None
+
+POINTER = "current"
+# An unfinished generation this old was left by a writer that died.
+STALE_SECONDS = 3600
+READ_ATTEMPTS = 3
+
+
+def current(index_dir):
+    """Directory of the live generation; ``OSError`` if the index was never written."""
+    index_dir = Path(index_dir)
+    return index_dir / (index_dir / POINTER).read_text(encoding="utf-8").strip()
+
+
+@contextlib.contextmanager
+def writer_lock(index_dir):
+    """Serialize writers of one index, across threads and processes; readers never wait."""
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    with open(index_dir / "lock", "a") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        yield
+
+
+def publish(index_dir, write, legacy=()):
+    """
+    Call ``write(directory)`` on a fresh private directory, then make it the
+    live generation and remove the replaced ones, plus ``legacy`` file names
+    left in ``index_dir`` by an older layout. The caller holds :func:`writer_lock`.
+    """
+    index_dir = Path(index_dir)
+    name = f"gen-{time.time_ns():x}-{os.getpid()}-{threading.get_ident()}"
+    directory = index_dir / f"{name}.tmp"
+    directory.mkdir(parents=True)
+    result = write(directory)
+    os.replace(directory, index_dir / name)
+    pointer = index_dir / f"{POINTER}.{os.getpid()}.{threading.get_ident()}.tmp"
+    pointer.write_text(name, encoding="utf-8")
+    os.replace(pointer, index_dir / POINTER)
+    _collect(index_dir, name)
+    for old in legacy:
+        (index_dir / old).unlink(missing_ok=True)
+    return result
+
+
+def _collect(index_dir, live):
+    for entry in Path(index_dir).glob("gen-*"):
+        if entry.name == live:
+            continue
+        if entry.suffix == ".tmp" and time.time() - entry.stat().st_mtime < STALE_SECONDS:
+            continue  # another writer's, if locking is unavailable
+        # Readers that already mapped these files keep them until they close (POSIX).
+        shutil.rmtree(entry, ignore_errors=True)
+
+
+def read(index_dir, load):
+    """``load(current generation)``, retried if a writer replaced and removed it in between."""
+    for attempt in range(READ_ATTEMPTS):
+        try:
+            return load(current(index_dir))
+        except FileNotFoundError:
+            if attempt == READ_ATTEMPTS - 1:
+                raise
@@ -0,0 +1,284 @@
+"""
+Watch many Quantum Rings jobs from one background thread, with one progress line.
+
+``QuantumRingsLib.job_monitor(job)`` follows a single native job, polls every
+second, blocks the caller and rejects toolkit jobs. With hundreds of jobs that
+means hundreds of status streams, each polling the service once a second.
+``JobMonitor`` takes native ``JobV1`` and ``QrBackendV2``/primitive jobs and
+watches all of them from one thread:
+
+* jobs that offer ``add_done_callback()`` (the offline SDK's) are not polled;
+  they wake the monitor when they finish;
+* every other job is polled on its own jittered exponential backoff
+  (``async_jobs.backoff_delays``), so short jobs are noticed quickly and
+  long ones cost at most one status call per ``maximum`` seconds;
+* ``watch()`` returns a ``concurrent.futures.Future`` for the job's result.
+  The result is fetched on a small worker pool, so a slow ``result()`` does
+  not hold up polling. An optional ``callback(job)`` runs on the monitor
+  thread when the job reaches a final state;
+* a single ``Jobs: 37/200 done, 2 failed, 161 pending`` line replaces the
+  per-job status output.
+
+Usage:
+    from job_monitor import JobMonitor, monitor_jobs
+    results = monitor_jobs([backend.run(qc, shots=1000) for qc in circuits])
+    with JobMonitor(maximum=5.0) as monitor:
+        futures = monitor.watch_all(jobs, callback=lambda job: print(job.job_id(), "finished"))
+"""
+
+import collections
+import heapq
+import itertools
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+
+from async_jobs import backoff_delays
+
+REFRESH = 0.5
+RESULT_WORKERS = 4
+FINAL_STATES = {"DONE", "CANCELLED", "ERROR"}
+LABELS = {"ERROR": "failed", "CANCELLED": "cancelled", "UNKNOWN": "unknown"}
+
+
+def _status(job):
+    status = job.status()
+    return getattr(status, "name", str(status)).upper()
+
+
+def _is_final(job):
+    if hasattr(job, "in_final_state"):
+        return job.in_final_state()
+    return _status(job) in FINAL_STATES
+
+
+class _Watch:
+    __slots__ = ("job", "future", "callback", "delays", "counted")
+
+    def __init__(self, job, callback, delays):
+        self.job = job
+        self.future = Future()
+        self.callback = callback
+        self.delays = delays
+        self.counted = False
+
+
+class JobMonitor:
+    """
+    Polls every watched job from one daemon thread. ``backoff`` overrides
+    ``initial``/``maximum``/``factor``/``jitter`` of the per-job poll delays.
+    With ``fetch_results=False`` futures resolve to the job itself. ``polls``
+    counts the status calls made.
+    """
+
+    def __init__(self, *, quiet=False, output=None, refresh=REFRESH, fetch_results=True,
+                 result_workers=RESULT_WORKERS, **backoff):
+        self.quiet = quiet
+        self.output = output
+        self.refresh = refresh
+        self.backoff = backoff
+        self.polls = 0
+        self._results = (ThreadPoolExecutor(max_workers=result_workers, thread_name_prefix="job-monitor-result")
+                         if fetch_results else None)
+        self._cond = threading.Condition()
+        self._schedule = []  # heap of (poll at, sequence, watch)
+        self._finished = collections.deque()  # watches whose job woke us through add_done_callback
+        self._sequence = itertools.count()
+        self._futures = []
+        self._statuses = collections.Counter()
+        self._pending = 0
+        self._closing = False
+        self._stopped = False
+        self._thread = None
+        self._shown = None
+        self._shown_at = 0.0
+
+    # watching ---------------------------------------------------------------
+
+    def watch(self, job, callback=None):
+        """Start watching ``job``; returns a ``Future`` for its result."""
+        watch = _Watch(job, callback, backoff_delays(**self.backoff))
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("cannot watch jobs on a closed JobMonitor")
+            self._futures.append(watch.future)
+            self._pending += 1
+            if hasattr(job, "add_done_callback"):
+                job.add_done_callback(lambda _: self._wake(watch))
+            else:
+                heapq.heappush(self._schedule, (time.monotonic(), next(self._sequence), watch))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="job-monitor", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return watch.future
+
+    def watch_all(self, jobs, callback=None):
+        return [self.watch(job, callback) for job in jobs]
+
+    def wait(self, timeout=None):
+        """Block until every job watched so far has its result; returns whether they all did."""
+        with self._cond:
+            futures = list(self._futures)
+        return not wait_futures(futures, timeout).not_done
+
+    def counts(self):
+        """``{"DONE": n, "ERROR": n, ..., "PENDING": n}`` over all watched jobs."""
+        with self._cond:
+            return dict(self._statuses, PENDING=self._pending)
+
+    def close(self, wait=True):
+        """Stop the monitor, after every watched job finished unless ``wait=False`` (then futures are cancelled)."""
+        with self._cond:
+            self._closing = True
+            self._stopped = not wait
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        if self._results is not None:
+            self._results.shutdown(wait=wait)
+        for future in self._futures:
+            future.cancel()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close(wait=exc[0] is None)
+
+    # monitor thread ---------------------------------------------------------
+
+    def _wake(self, watch):
+        with self._cond:
+            self._finished.append(watch)
+            self._cond.notify()
+
+    def _due(self):
+        # Called with the lock held: block until something finished or is due for a poll.
+        while True:
+            if self._stopped or (self._closing and not self._pending):
+                return None, None
+            now = time.monotonic()
+            finished = list(self._finished)
+            self._finished.clear()
+            polls = []
+            while self._schedule and self._schedule[0][0] <= now:
+                polls.append(heapq.heappop(self._schedule)[2])
+            if finished or polls:
+                return finished, polls
+            timeout = self._schedule[0][0] - now if self._schedule else None
+            if self._pending and not self.quiet:
+                timeout = min(timeout or self.refresh, self.refresh)
+            self._cond.wait(timeout)
+            self._progress()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                finished, polls = self._due()
+            if finished is None:
+                break
+            for watch in polls:
+                self.polls += 1
+                try:
+                    final = _is_final(watch.job)
+                except Exception:
+                    final = False  # a failed status call is retried on the next backoff step
+                if final:
+                    finished.append(watch)
+                else:
+                    with self._cond:
+                        heapq.heappush(self._schedule,
+                                       (time.monotonic() + next(watch.delays), next(self._sequence), watch))
+            for watch in finished:
+                try:
+                    self._finish(watch)
+                except Exception as exc:
+                    # One bad job must not stop the thread that watches all the others.
+                    self._abandon(watch, exc)
+            with self._cond:
+                self._progress(force=not self._pending)
+        with self._cond:
+            self._progress(force=True)
+
+    def _finish(self, watch):
+        try:
+            status = _status(watch.job)
+        except Exception:
+            status = "UNKNOWN"
+        if watch.callback is not None:
+            try:
+                watch.callback(watch.job)
+            except Exception:
+                traceback.print_exc()
+        if self._results is None:
+            self._done(watch, status)
+            if watch.future.set_running_or_notify_cancel():
+                watch.future.set_result(watch.job)
+        else:
+            self._results.submit(self._fetch, watch, status)
+
+    def _fetch(self, watch, status):
+        if not watch.future.set_running_or_notify_cancel():
+            self._done(watch, status)
+            return
+        try:
+            result = watch.job.result()
+        except BaseException as exc:
+            self._done(watch, status)
+            watch.future.set_exception(exc)
+        else:
+            # Counted before the future resolves, so waiters see a complete progress line.
+            self._done(watch, status)
+            watch.future.set_result(result)
+
+    def _abandon(self, watch, exc):
+        traceback.print_exc()
+        self._done(watch, "UNKNOWN")
+        if not watch.future.done() and watch.future.set_running_or_notify_cancel():
+            watch.future.set_exception(exc)
+
+    def _done(self, watch, status):
+        with self._cond:
+            if watch.counted:
+                return
+            watch.counted = True
+            self._statuses[status] += 1
+            self._pending -= 1
+            self._cond.notify()
+
+    def _progress(self, force=False):
+        # Called with the lock held.
+        if self.quiet:
+            return
+        done = sum(self._statuses.values())
+        total = done + self._pending
+        others = ", ".join(f"{count} {LABELS.get(name, name.lower())}"
+                           for name, count in sorted(self._statuses.items()) if name != "DONE")
+        line = f"Jobs: {self._statuses['DONE']}/{total} done{', ' + others if others else ''}, {self._pending} pending"
+        now = time.monotonic()
+        if line == self._shown or (not force and now - self._shown_at < self.refresh):
+            return
+        output = self.output or sys.stdout
+        end = "\n" if not self._pending else ""
+        print(f"\r{line}", end=end, file=output, flush=True)
+        self._shown, self._shown_at = line, now
+
+
+def monitor_jobs(jobs, callback=None, *, timeout=None, quiet=False, output=None, **backoff):
+    """
+    Results of ``jobs`` in order, watched by one :class:`JobMonitor` with a
+    single progress line. A failed job's exception is raised; ``timeout``
+    (seconds, for all jobs) raises ``TimeoutError`` and leaves the jobs running.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    monitor = JobMonitor(quiet=quiet, output=output, **backoff)
+    try:
+        futures = monitor.watch_all(jobs, callback)
+        return [future.result(None if deadline is None else max(deadline - time.monotonic(), 0))
+                for future in futures]
+    finally:
+        monitor.close(wait=False)
@@ -0,0 +1,57 @@
+"""
+Lazily imported Quantum Rings SDK names for short-lived scripts and workers.
+
+Every example imports QuantumRingsLib, qiskit, the toolkit and matplotlib
+at the top, even on paths that use none of them. Worker processes that start
+often pay that import time over and over. This package exposes the same
+names as module attributes (PEP 562 ``__getattr__``). The module that
+defines a name is imported the first time the name is used, and the value is
+then stored in the package, so later lookups are plain attribute reads.
+
+``lazy_sdk`` has the ``QuantumRingsLib`` names plus ``plt``
+(``matplotlib.pyplot``). ``lazy_sdk.toolkit`` has the toolkit primitives and
+the Qiskit names the toolkit examples use. Use ``import lazy_sdk as qr``
+and ``qr.QuantumCircuit(...)``. A ``from lazy_sdk import X`` import still
+works, but it resolves ``X`` (and only ``X``'s module) at that point.
+``python Tools/import_report.py`` shows what the imports cost.
+
+Usage:
+    import lazy_sdk as qr
+    provider = qr.QuantumRingsProvider()
+    qc = qr.QuantumCircuit(2, 2)
+"""
+
+import importlib
+
+# Exposed name -> (module, attribute); attribute None means the module itself.
+NAMES = {
+    **{name: ("QuantumRingsLib", name) for name in (
+        "AncillaRegister", "BackendV2", "ClassicalRegister", "JobStatus", "JobV1", "OptimizeQuantumCircuit",
+        "Parameter", "ParameterExpression", "ParameterVector", "QuantumCircuit", "QuantumRegister",
+        "QuantumRingsProvider", "job_monitor")},
+    "QuantumRingsLib": ("QuantumRingsLib", None),
+    "plt": ("matplotlib.pyplot", None),
+}
+
+
+def lazy_names(namespace, names):
+    """``(__getattr__, __dir__)`` for a module whose ``names`` resolve on first use into ``namespace``."""
+
+    def __getattr__(name):
+        try:
+            module_name, attribute = names[name]
+        except KeyError:
+            raise AttributeError(f"module {namespace['__name__']!r} has no attribute {name!r}") from None
+        module = importlib.import_module(module_name)
+        value = module if attribute is None else getattr(module, attribute)
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(names))
+
+    return __getattr__, __dir__
+
+
+__getattr__, __dir__ = lazy_names(globals(), NAMES)
+__all__ = sorted(NAMES)
@@ -0,0 +1,27 @@
+"""
+Lazily imported toolkit primitives and the Qiskit names the toolkit examples use.
+
+Like the ``lazy_sdk`` package: ``import lazy_sdk.toolkit as qrt`` and
+``qrt.QrBackendV2(...)`` import ``quantumrings.toolkit.qiskit`` (and with it
+Qiskit) only when the first name is used. ``QuantumCircuit`` here is Qiskit's.
+"""
+
+from . import lazy_names
+
+NAMES = {
+    **{name: ("quantumrings.toolkit.qiskit", name) for name in (
+        "QrBackendV2", "QrEstimatorV1", "QrEstimatorV2", "QrJobV1", "QrSamplerV1", "QrSamplerV2")},
+    **{name: ("qiskit", name) for name in (
+        "ClassicalRegister", "QuantumCircuit", "QuantumRegister", "transpile")},
+    "SparsePauliOp": ("qiskit.quantum_info", "SparsePauliOp"),
+    "Parameter": ("qiskit.circuit", "Parameter"),
+    "ParameterVector": ("qiskit.circuit", "ParameterVector"),
+    "QAOAAnsatz": ("qiskit.circuit.library", "QAOAAnsatz"),
+    "SessionEquivalenceLibrary": ("qiskit.circuit.equivalence_library", "SessionEquivalenceLibrary"),
+    "PassManager": ("qiskit.transpiler", "PassManager"),
+    "BasisTranslator": ("qiskit.transpiler.passes", "BasisTranslator"),
+    "plt": ("matplotlib.pyplot", None),
+}
+
+__getattr__, __dir__ = lazy_names(globals(), NAMES)
+__all__ = sorted(NAMES)
@@ -0,0 +1,253 @@
+"""
+Near-duplicate detection across Documents/*.md and Code/*.py.
+
+Every markdown heading chunk (doc_chunks.py) and every example script is a
+unit. Units are shingled into word 5-grams, summarised with MinHash and
+bucketed with LSH banding; candidate pairs whose estimated Jaccard
+similarity passes the threshold are merged into clusters. A second, exact
+pass finds runs of lines repeated verbatim in several units (such as the
+Qiskit 2.0 synergy note shared by the toolkit example headers).
+
+With ``--emit DIR`` a deduplicated copy of Documents/ is written: in every
+cluster the most complete unit is kept and the others are replaced by a
+one-line pointer to it.
+
+Usage:
+    python Tools/near_duplicates.py [--threshold 0.8] [--emit build/corpus]
+"""
+
+import argparse
+import hashlib
+import random
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from doc_chunks import chunk_documents
+from example_headers import CODE_DIR, DOCUMENTS_DIR, example_paths
+
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+BANDS = 16
+THRESHOLD = 0.8
+MIN_BLOCK_CHARS = 40
+
+_MERSENNE = (1 << 61) - 1
+_WORD = re.compile(r"\w+")
+
+
+class Unit:
+    """A chunk of text that can be kept or deduplicated as a whole."""
+
+    __slots__ = ("key", "source", "heading", "text", "chunk")
+
+    def __init__(self, key, source, heading, text, chunk=None):
+        self.key = key
+        self.source = source
+        self.heading = heading
+        self.text = text
+        self.chunk = chunk
+
+    def __repr__(self):
+        return f"Unit({self.key!r})"
+
+
+def collect_units(documents_dir=DOCUMENTS_DIR, code_dir=CODE_DIR):
+    units = [Unit(f"Documents/{c.chunk_id}", f"Documents/{c.doc}", c.heading, c.text, c)
+             for c in chunk_documents(documents_dir)]
+    for path in example_paths(code_dir):
+        units.append(Unit(f"Code/{path.name}", f"Code/{path.name}", path.name,
+                          path.read_text(encoding="utf-8")))
+    return units
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """64-bit hashes of the word ``size``-grams of ``text`` (case-insensitive)."""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        grams = {" ".join(words)} if words else set()
+    else:
+        grams = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return {int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), "little") for g in grams}
+
+
+class MinHasher:
+    """MinHash signatures from ``num_perm`` universal hash functions."""
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = random.Random(seed)
+        self.params = [(rng.randrange(1, _MERSENNE), rng.randrange(0, _MERSENNE)) for _ in range(num_perm)]
+
+    def signature(self, hashes):
+        if not hashes:
+            return (_MERSENNE,) * len(self.params)
+        return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in self.params)
+
+
+def estimated_jaccard(sig_a, sig_b):
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def near_duplicate_clusters(units, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """
+    Group ``units`` into clusters of near duplicates.
+
+    Returns a list of ``(members, similarity)`` where ``members`` are unit
+    indices (at least two) and ``similarity`` is the lowest estimated
+    Jaccard similarity of any merged pair.
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be a multiple of bands")
+    rows = num_perm // bands
+    hasher = MinHasher(num_perm)
+    signatures = [hasher.signature(shingles(unit.text)) for unit in units]
+
+    buckets = defaultdict(list)
+    for i, sig in enumerate(signatures):
+        if sig[0] == _MERSENNE:
+            continue
+        for band in range(bands):
+            buckets[(band, sig[band * rows:(band + 1) * rows])].append(i)
+
+    parent = list(range(len(units)))
+    weakest = {}
+    checked = set()
+    for members in buckets.values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                pair = (members[x], members[y])
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                similarity = estimated_jaccard(signatures[pair[0]], signatures[pair[1]])
+                if similarity < threshold:
+                    continue
+                a, b = _find(parent, pair[0]), _find(parent, pair[1])
+                root = min(a, b)
+                weakest[root] = min(similarity, weakest.get(a, 1.0), weakest.get(b, 1.0))
+                parent[max(a, b)] = root
+
+    groups = defaultdict(list)
+    for i in range(len(units)):
+        groups[_find(parent, i)].append(i)
+    return [(members, weakest.get(root, 1.0)) for root, members in sorted(groups.items()) if len(members) > 1]
+
+
+def _normal_line(line):
+    return " ".join(line.strip().lstrip("#>-*").split())
+
+
+def repeated_blocks(units, min_chars=MIN_BLOCK_CHARS):
+    """
+    Runs of consecutive lines that occur verbatim in more than one unit
+    (whitespace and comment/list markers normalised). Adjacent repeated
+    lines shared by the same set of units are reported as one block, so the
+    two-line Qiskit 2.0 synergy note shows up once rather than per line.
+    Returns ``[(block, [unit indices])]``, most widespread first.
+    """
+    owners = defaultdict(set)
+    unit_lines = []
+    for i, unit in enumerate(units):
+        lines = [_normal_line(line) for line in unit.text.splitlines()]
+        unit_lines.append(lines)
+        for line in lines:
+            if line:
+                owners[line].add(i)
+
+    blocks = defaultdict(set)
+    for i, lines in enumerate(unit_lines):
+        run, run_owners = [], None
+        for line in lines + [""]:
+            shared = frozenset(owners[line]) if line and len(owners[line]) > 1 else None
+            if shared is not None and shared == run_owners:
+                run.append(line)
+                continue
+            if run and sum(map(len, run)) >= min_chars:
+                blocks["\n".join(run)] |= run_owners
+            run, run_owners = ([line], shared) if shared is not None else ([], None)
+    repeated = [(text, sorted(ids)) for text, ids in blocks.items()]
+    return sorted(repeated, key=lambda item: (-len(item[1]), item[0]))
+
+
+def canonical(units, members):
+    """
+    The member to keep: the one from the most complete (largest) source
+    document, then the longest text, then the first in corpus order.
+    """
+    sizes = defaultdict(int)
+    for unit in units:
+        sizes[unit.source] += len(unit.text)
+    return max(members, key=lambda i: (sizes[units[i].source], len(units[i].text), -i))
+
+
+def emit_corpus(units, clusters, out_dir, documents_dir=DOCUMENTS_DIR):
+    """
+    Write a deduplicated copy of ``documents_dir`` into ``out_dir``. Duplicate
+    markdown chunks become a pointer to the kept copy; example scripts are not
+    part of the emitted corpus (code-examples.md already embeds them).
+    Returns the number of chunks replaced.
+    """
+    replace = {}
+    for members, _ in clusters:
+        keep = canonical(units, members)
+        for i in members:
+            if i != keep and units[i].chunk is not None:
+                replace[i] = keep
+
+    by_doc = defaultdict(list)
+    for i, unit in enumerate(units):
+        if unit.chunk is not None:
+            by_doc[unit.chunk.doc].append(i)
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for path in sorted(Path(documents_dir).glob("*.md")):
+        lines = path.read_text(encoding="utf-8").splitlines()
+        # Splice from the bottom up so earlier line numbers stay valid.
+        for i in sorted(by_doc.get(path.name, []), key=lambda i: -units[i].chunk.start):
+            if i not in replace:
+                continue
+            chunk, kept = units[i].chunk, units[replace[i]]
+            heading = lines[chunk.start - 1] if chunk.level else f"# {chunk.heading}"
+            pointer = f"> Same as {kept.source} › {kept.heading}."
+            lines[chunk.start - 1:chunk.end] = [heading, "", pointer, ""] if chunk.level else [pointer, ""]
+        (out_dir / path.name).write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return len(replace)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=Path, default=DOCUMENTS_DIR)
+    parser.add_argument("--code-dir", type=Path, default=CODE_DIR)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--emit", type=Path, metavar="DIR", help="write a deduplicated Documents/ copy here")
+    args = parser.parse_args(argv)
+
+    units = collect_units(args.documents, args.code_dir)
+    clusters = near_duplicate_clusters(units, args.threshold)
+    for members, similarity in clusters:
+        keep = canonical(units, members)
+        print(f"cluster (similarity >= {similarity:.2f}):")
+        for i in members:
+            print(f"  {'keep' if i == keep else 'dup '}  {units[i].key}")
+    for text, ids in repeated_blocks(units):
+        # Single repeated lines are mostly imports; only report real blocks.
+        if len(ids) > 2 and "\n" in text:
+            first = text.splitlines()[0]
+            print(f"block of {text.count(chr(10)) + 1} line(s) repeated in {len(ids)} units: {first[:70]}")
+    if args.emit:
+        replaced = emit_corpus(units, clusters, args.emit, args.documents)
+        print(f"wrote deduplicated corpus to {args.emit} ({replaced} chunks replaced)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
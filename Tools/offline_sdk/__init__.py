@@ -0,0 +1,65 @@
+"""
+Offline stand-in for the Quantum Rings SDK.
+
+``install()`` puts an import hook in front of ``sys.meta_path`` so that
+``import QuantumRingsLib`` and ``from quantumrings.toolkit.qiskit import ...``
+resolve to the NumPy implementations in this package. Nothing is contacted
+over the network and no account token is needed, so examples can be run and
+checked locally (and in CI) exactly as they are written.
+
+Usage:
+    PYTHONPATH=Tools python -m offline_sdk Code/QuantumRingsLib-basic-10.py
+"""
+
+import importlib
+import importlib.abc
+import importlib.machinery
+import sys
+import types
+
+# Public module name -> offline implementation (None for plain namespace packages).
+MODULES = {
+    "QuantumRingsLib": "offline_sdk.native",
+    "quantumrings": None,
+    "quantumrings.toolkit": None,
+    "quantumrings.toolkit.qiskit": "offline_sdk.toolkit",
+}
+
+
+class _OfflineLoader(importlib.abc.Loader):
+    def __init__(self, target):
+        self.target = target
+
+    def create_module(self, spec):
+        if self.target is None:
+            module = types.ModuleType(spec.name)
+            module.__path__ = []
+            return module
+        return importlib.import_module(self.target)
+
+    def exec_module(self, module):
+        pass
+
+
+class OfflineFinder(importlib.abc.MetaPathFinder):
+    """Resolves the SDK module names listed in :data:`MODULES`."""
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname not in MODULES:
+            return None
+        target = MODULES[fullname]
+        return importlib.machinery.ModuleSpec(fullname, _OfflineLoader(target), is_package=target is None)
+
+
+def install():
+    """Shadow the real SDK with the offline one for the rest of the process."""
+    if not any(isinstance(finder, OfflineFinder) for finder in sys.meta_path):
+        sys.meta_path.insert(0, OfflineFinder())
+    for name in MODULES:
+        sys.modules.pop(name, None)
+
+
+def uninstall():
+    sys.meta_path[:] = [f for f in sys.meta_path if not isinstance(f, OfflineFinder)]
+    for name in MODULES:
+        sys.modules.pop(name, None)
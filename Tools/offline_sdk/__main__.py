@@ -0,0 +1,23 @@
+"""Run a script with the offline SDK installed: ``python -m offline_sdk script.py [args...]``."""
+
+import argparse
+import runpy
+import sys
+
+from . import install
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m offline_sdk", description=__doc__)
+    parser.add_argument("script")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    install()
+    sys.argv = [args.script, *args.args]
+    runpy.run_path(args.script, run_name="__main__")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
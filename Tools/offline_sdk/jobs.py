@@ -0,0 +1,232 @@
+"""
+Jobs and results shared by the offline native backend and the toolkit stand-in.
+
+Work is submitted to a process-wide thread pool so jobs move through the
+same QUEUED -> RUNNING -> DONE states as remote ones, but without any network
+round trip: ``result()`` returns as soon as the NumPy simulation finishes.
+"""
+
+import enum
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+
+import numpy as np
+
+from .statevector import format_bits, format_counts
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def executor():
+    """The shared pool that runs offline jobs (one worker per core)."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                           thread_name_prefix="offline-job")
+        return _EXECUTOR
+
+
+class JobStatus(enum.Enum):
+    INITIALIZING = "job is being initialized"
+    QUEUED = "job is queued"
+    VALIDATING = "job is being validated"
+    RUNNING = "job is actively running"
+    CANCELLED = "job has been cancelled"
+    DONE = "job has successfully run"
+    ERROR = "job incurred error"
+
+
+JOB_FINAL_STATES = (JobStatus.DONE, JobStatus.CANCELLED, JobStatus.ERROR)
+
+
+class JobError(RuntimeError):
+    """Raised by ``result()`` when the offline simulation failed."""
+
+
+class JobTimeoutError(JobError):
+    """Raised when waiting for a job exceeds its timeout."""
+
+
+class OfflineJob:
+    """
+    A unit of work running on the shared executor.
+
+    ``fn`` is called with no arguments on a worker thread and its return
+    value becomes ``result()``. A ``synchronous`` job (``mode="sync"``) runs
+    on the caller's thread instead and is already final when constructed.
+    """
+
+    version = 1
+
+    def __init__(self, backend, fn, job_id=None, synchronous=False):
+        self._backend = backend
+        self._job_id = job_id or uuid.uuid4().hex
+        self._started = threading.Event()
+        self._fn = fn
+        if synchronous:
+            self._future = Future()
+            self._future.set_running_or_notify_cancel()
+            try:
+                self._future.set_result(self._run())
+            except Exception as exc:
+                self._future.set_exception(exc)
+        else:
+            self._future = executor().submit(self._run)
+
+    def _run(self):
+        self._started.set()
+        return self._fn()
+
+    def job_id(self):
+        return self._job_id
+
+    def backend(self):
+        return self._backend
+
+    def status(self):
+        future = self._future
+        if future.cancelled():
+            return JobStatus.CANCELLED
+        if future.done():
+            return JobStatus.ERROR if future.exception() is not None else JobStatus.DONE
+        return JobStatus.RUNNING if self._started.is_set() else JobStatus.QUEUED
+
+    def done(self):
+        return self.status() is JobStatus.DONE
+
+    def running(self):
+        return self.status() is JobStatus.RUNNING
+
+    def cancelled(self):
+        return self.status() is JobStatus.CANCELLED
+
+    def in_final_state(self):
+        return self._future.done()
+
+    def cancel(self):
+        """Cancel the job if it has not started yet; returns whether it was cancelled."""
+        return self._future.cancel()
+
+    def add_done_callback(self, fn):
+        """Call ``fn(job)`` once the job is final (right away if it already is)."""
+        self._future.add_done_callback(lambda _: fn(self))
+
+    def wait_for_final_state(self, timeout=None, wait=5, callback=None):
+        """
+        Block until the job finishes. ``callback(job_id, status, job)`` is
+        called every ``wait`` seconds while it is still running.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._future.done():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise JobTimeoutError(f"timeout while waiting for job {self._job_id}")
+            step = wait if remaining is None else min(wait, remaining)
+            try:
+                self._future.result(timeout=step)
+            except Exception:
+                pass
+            if callback is not None and not self._future.done():
+                callback(self._job_id, self.status(), self)
+
+    def result(self, timeout=None):
+        try:
+            return self._future.result(timeout=timeout)
+        except CancelledError:
+            raise JobError(f"job {self._job_id} was cancelled") from None
+        except TimeoutError:
+            raise JobTimeoutError(f"timeout while waiting for job {self._job_id}") from None
+        except JobError:
+            raise
+        except Exception as exc:
+            raise JobError(f"job {self._job_id} failed: {exc}") from exc
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self._job_id} {self.status().name}>"
+
+
+class ExperimentResult:
+    """Counts of one circuit: distinct classical values and their frequencies."""
+
+    def __init__(self, name, shots, keys, counts, register_sizes, seed=None, metadata=None):
+        self.name = name
+        self.shots = shots
+        self.keys = keys
+        self.counts = counts
+        self.register_sizes = list(register_sizes)
+        self.seed = seed
+        self.metadata = metadata or {}
+        self.success = True
+
+    @property
+    def num_clbits(self):
+        return sum(self.register_sizes)
+
+    def get_counts(self):
+        return format_counts(self.keys, self.counts, self.register_sizes)
+
+    def get_memory(self):
+        """Per-shot bitstrings in a seeded random order."""
+        samples = np.repeat(self.keys, self.counts)
+        np.random.default_rng(self.seed).shuffle(samples)
+        return [format_bits(int(v), self.register_sizes) for v in samples]
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "shots": self.shots,
+            "success": self.success,
+            "counts": self.get_counts(),
+            "metadata": self.metadata,
+        }
+
+
+class Result:
+    """Result of an offline job, modelled on ``qiskit.result.Result``."""
+
+    def __init__(self, backend_name, job_id, results, time_taken=0.0):
+        self.backend_name = backend_name
+        self.job_id = job_id
+        self.results = list(results)
+        self.success = all(r.success for r in self.results)
+        self.time_taken = time_taken
+
+    def _experiment(self, experiment):
+        if experiment is None:
+            if len(self.results) != 1:
+                raise ValueError("result holds several experiments; pass one explicitly")
+            return self.results[0]
+        if isinstance(experiment, int):
+            return self.results[experiment]
+        name = experiment if isinstance(experiment, str) else getattr(experiment, "name", None)
+        for result in self.results:
+            if result.name == name:
+                return result
+        raise KeyError(f"no experiment named {name!r} in this result")
+
+    def get_counts(self, experiment=None):
+        if experiment is None and len(self.results) > 1:
+            return [r.get_counts() for r in self.results]
+        return self._experiment(experiment).get_counts()
+
+    def get_memory(self, experiment=None):
+        return self._experiment(experiment).get_memory()
+
+    def to_dict(self):
+        return {
+            "backend_name": self.backend_name,
+            "job_id": self.job_id,
+            "success": self.success,
+            "time_taken": self.time_taken,
+            "results": [r.to_dict() for r in self.results],
+        }
+
+    def __repr__(self):
+        experiments = ", ".join(f"{r.name}: {r.get_counts()}" for r in self.results)
+        return (f"Result(backend_name='{self.backend_name}', job_id='{self.job_id}', "
+                f"success={self.success}, results=[{experiments}])")
@@ -0,0 +1,708 @@
+"""
+Offline stand-in for the ``QuantumRingsLib`` module.
+
+Implements the native surface the Code/ examples and QuantumRingsLib-Reference.md
+rely on — registers, ``QuantumCircuit``, ``Parameter``/``ParameterVector``,
+``QuantumRingsProvider``, the ``scarlet_quantum_rings`` ``BackendV2``, ``JobV1``,
+``job_monitor`` and ``OptimizeQuantumCircuit`` — on top of the local NumPy
+statevector engine. The documented native quirks are kept on purpose so
+examples behave as they do against the real SDK: classical registers cannot
+be sliced, a gate may not mix ``Parameter`` and float arguments,
+``assign_parameters`` only accepts string keys and returns ``None`` unless
+``inplace=True``, and ``job_monitor`` rejects toolkit jobs.
+"""
+
+import numbers
+import sys
+import time
+import uuid
+
+from . import statevector
+from .jobs import JOB_FINAL_STATES, ExperimentResult, JobStatus, OfflineJob, Result
+from .statevector import Instruction
+
+version = "0.10.11"
+__version__ = version
+
+DEFAULT_BACKEND = "scarlet_quantum_rings"
+# 2**28 amplitudes is 4 GiB of complex128; keep well below that by default.
+OFFLINE_MAX_QUBITS = 26
+OFFLINE_ACCOUNT = "offline@localhost"
+
+
+# ---------------------------------------------------------------- parameters
+
+class ParameterExpression:
+    """Linear combination of named parameters plus a constant."""
+
+    __slots__ = ("_terms", "_constant")
+
+    def __init__(self, terms, constant=0.0):
+        self._terms = dict(terms)
+        self._constant = float(constant)
+
+    @property
+    def parameters(self):
+        return set(self._terms)
+
+    @property
+    def terms(self):
+        """``{name: coefficient}`` of the linear part."""
+        return dict(self._terms)
+
+    @property
+    def constant(self):
+        return self._constant
+
+    def bind(self, values):
+        """Substitute ``values`` (name -> float); returns a float once fully bound."""
+        terms = {}
+        constant = self._constant
+        for name, coeff in self._terms.items():
+            if name in values:
+                constant += coeff * float(values[name])
+            else:
+                terms[name] = coeff
+        return constant if not terms else ParameterExpression(terms, constant)
+
+    def _combine(self, other, sign):
+        if isinstance(other, ParameterExpression):
+            terms = dict(self._terms)
+            for name, coeff in other._terms.items():
+                terms[name] = terms.get(name, 0.0) + sign * coeff
+            return ParameterExpression(terms, self._constant + sign * other._constant)
+        if isinstance(other, (int, float)):
+            return ParameterExpression(self._terms, self._constant + sign * other)
+        return NotImplemented
+
+    def __add__(self, other):
+        return self._combine(other, 1.0)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self._combine(other, -1.0)
+
+    def __rsub__(self, other):
+        return (-self)._combine(other, 1.0)
+
+    def __mul__(self, other):
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        return ParameterExpression({n: c * other for n, c in self._terms.items()}, self._constant * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        return self * (1.0 / other)
+
+    def __neg__(self):
+        return self * -1.0
+
+    def __repr__(self):
+        parts = [f"{c:g}*{n}" if c != 1 else n for n, c in self._terms.items()]
+        if self._constant:
+            parts.append(f"{self._constant:g}")
+        return " + ".join(parts) or "0"
+
+
+class Parameter(ParameterExpression):
+    """A named symbolic angle."""
+
+    __slots__ = ("_name",)
+
+    def __init__(self, name):
+        super().__init__({name: 1.0})
+        self._name = name
+
+    @property
+    def name(self):
+        return self._name
+
+    def __repr__(self):
+        return f"Parameter({self._name})"
+
+    def __str__(self):
+        return self._name
+
+    def __eq__(self, other):
+        return isinstance(other, Parameter) and other._name == self._name
+
+    def __hash__(self):
+        return hash(("Parameter", self._name))
+
+
+class ParameterVector:
+    """``length`` parameters named ``name[0]`` ... ``name[length-1]``."""
+
+    def __init__(self, name, length=0):
+        self._name = name
+        self._params = [Parameter(f"{name}[{i}]") for i in range(length)]
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def params(self):
+        return list(self._params)
+
+    def __getitem__(self, index):
+        return self._params[index]
+
+    def __len__(self):
+        return len(self._params)
+
+    def __iter__(self):
+        return iter(self._params)
+
+    def __repr__(self):
+        return f"ParameterVector({self._name}, {len(self)})"
+
+
+def _check_params(gate, params):
+    """Native gates take all-numeric or all-symbolic angles, never a mix."""
+    symbolic = [isinstance(p, ParameterExpression) for p in params]
+    if any(symbolic) and not all(symbolic):
+        raise TypeError(
+            f"{gate}(): incompatible function arguments; all angles must be Parameter objects "
+            f"or all must be floats, got {[type(p).__name__ for p in params]}")
+    for p, is_symbolic in zip(params, symbolic):
+        if not is_symbolic and not isinstance(p, numbers.Real):
+            raise TypeError(f"{gate}(): incompatible function arguments; cannot use {type(p).__name__} as an angle")
+    return tuple(p if isinstance(p, ParameterExpression) else float(p) for p in params)
+
+
+# ----------------------------------------------------------------- registers
+
+class Bit:
+    __slots__ = ("register", "index")
+
+    def __init__(self, register, index):
+        self.register = register
+        self.index = index
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other.register is self.register and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.register), self.index))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.register.name()}, {self.index})"
+
+
+class Qubit(Bit):
+    __slots__ = ()
+
+
+class Clbit(Bit):
+    __slots__ = ()
+
+
+class _Register:
+    bit_type = Bit
+    default_prefix = "r"
+
+    def __init__(self, size, name=""):
+        if size < 0:
+            raise ValueError("register size must be non-negative")
+        self._size = int(size)
+        self._name = name or f"{self.default_prefix}_"
+        self._bits = [self.bit_type(self, i) for i in range(self._size)]
+
+    def size(self):
+        return self._size
+
+    def name(self):
+        return self._name
+
+    def prefix(self):
+        return self.default_prefix
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return iter(self._bits)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            raise TypeError(f"{type(self).__name__} does not support slicing; index bits individually, e.g. reg[0]")
+        if not isinstance(index, int):
+            raise TypeError(f"register indices must be integers, not {type(index).__name__}")
+        return self._bits[index]
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._size}, '{self._name}')"
+
+
+class QuantumRegister(_Register):
+    bit_type = Qubit
+    default_prefix = "q"
+
+
+class AncillaRegister(QuantumRegister):
+    default_prefix = "a"
+
+
+class ClassicalRegister(_Register):
+    bit_type = Clbit
+    default_prefix = "c"
+
+
+# ------------------------------------------------------------------- circuit
+
+_GATE_SIGNATURES = {
+    # name: (number of angle parameters, number of qubit arguments)
+    name: (num_params, arity) for name, (arity, num_params, _) in statevector.GATES.items()
+}
+
+
+class InstructionSet:
+    """The instructions one gate call appended, so ``.c_if()`` can condition them."""
+
+    def __init__(self, circuit, instructions):
+        self._circuit = circuit
+        self.instructions = instructions
+
+    def c_if(self, classical, value):
+        clbits = self._circuit._resolve_clbits(classical)
+        for inst in self.instructions:
+            inst.condition = (tuple(clbits), int(value))
+        return self
+
+
+class QuantumCircuit:
+    """Native circuit: a list of engine instructions over flat qubit/clbit indices."""
+
+    def __init__(self, *regs, name=None):
+        self.name = name or "circuit"
+        self.qregs = []
+        self.cregs = []
+        self._qubit_index = {}
+        self._clbit_index = {}
+        self.num_qubits = 0
+        self.num_clbits = 0
+        self.data = []
+        self._parameters = {}
+        ints = [r for r in regs if isinstance(r, int)]
+        if ints:
+            if len(ints) != len(regs) or len(ints) > 2:
+                raise TypeError("QuantumCircuit() takes registers or (num_qubits[, num_clbits])")
+            self.add_register(QuantumRegister(ints[0], "q"))
+            if len(ints) == 2 and ints[1]:
+                self.add_register(ClassicalRegister(ints[1], "c"))
+        else:
+            for reg in regs:
+                self.add_register(reg)
+
+    # registers & bits -------------------------------------------------------
+
+    def add_register(self, register):
+        if isinstance(register, QuantumRegister):
+            for bit in register:
+                self._qubit_index[bit] = self.num_qubits
+                self.num_qubits += 1
+            self.qregs.append(register)
+        elif isinstance(register, ClassicalRegister):
+            for bit in register:
+                self._clbit_index[bit] = self.num_clbits
+                self.num_clbits += 1
+            self.cregs.append(register)
+        else:
+            raise TypeError(f"Invalid Argument Passed for Quantum Circuit: {register!r}")
+
+    def _resolve(self, arg, index, kind, total):
+        if isinstance(arg, _Register):
+            return [index[bit] for bit in arg]
+        if isinstance(arg, (list, tuple, range)):
+            out = []
+            for item in arg:
+                out.extend(self._resolve(item, index, kind, total))
+            return out
+        if isinstance(arg, Bit):
+            if arg not in index:
+                raise ValueError(f"{arg!r} is not in this circuit")
+            return [index[arg]]
+        if isinstance(arg, int):
+            if not 0 <= arg < total:
+                raise IndexError(f"{kind} index {arg} out of range for a circuit with {total} {kind}s")
+            return [arg]
+        raise TypeError(f"Invalid Argument Passed for Quantum Circuit: cannot use {type(arg).__name__} as a {kind}")
+
+    def _resolve_qubits(self, arg):
+        return self._resolve(arg, self._qubit_index, "qubit", self.num_qubits)
+
+    def _resolve_clbits(self, arg):
+        return self._resolve(arg, self._clbit_index, "clbit", self.num_clbits)
+
+    def _append(self, name, qubits, params=(), clbits=()):
+        inst = Instruction(name, qubits, params, clbits)
+        for p in params:
+            if isinstance(p, ParameterExpression):
+                for pname in p.parameters:
+                    self._parameters[pname] = None
+        self.data.append(inst)
+        return inst
+
+    # gates ------------------------------------------------------------------
+
+    def _gate(self, name, params, qubit_args):
+        params = _check_params(name, params)
+        resolved = [self._resolve_qubits(arg) for arg in qubit_args]
+        if len(resolved) == 1:
+            return InstructionSet(self, [self._append(name, (q,), params) for q in resolved[0]])
+        width = max(len(r) for r in resolved)
+        if any(len(r) not in (1, width) for r in resolved):
+            raise ValueError(f"{name}(): qubit arguments have mismatched lengths")
+        resolved = [r * width if len(r) == 1 else r for r in resolved]
+        appended = []
+        for qubits in zip(*resolved):
+            if len(set(qubits)) != len(qubits):
+                raise ValueError(f"{name}(): duplicate qubit arguments {qubits}")
+            appended.append(self._append(name, qubits, params))
+        return InstructionSet(self, appended)
+
+    def __getattr__(self, name):
+        # h/x/rx/cx/... are generated from the engine's gate table.
+        signature = _GATE_SIGNATURES.get(name)
+        if signature is None:
+            raise AttributeError(f"'QuantumCircuit' object has no attribute '{name}'")
+        num_params, arity = signature
+
+        def gate(*args):
+            if len(args) != num_params + arity:
+                raise TypeError(f"{name}() takes {num_params} angle(s) and {arity} qubit argument(s)")
+            return self._gate(name, args[:num_params], args[num_params:])
+
+        gate.__name__ = name
+        return gate
+
+    def mcp(self, lam, controls, target):
+        params = _check_params("mcp", (lam,))
+        qubits = self._resolve_qubits(controls) + self._resolve_qubits(target)
+        return InstructionSet(self, [self._append("mcp", qubits, params)])
+
+    def mcx(self, controls, target):
+        qubits = self._resolve_qubits(controls) + self._resolve_qubits(target)
+        return InstructionSet(self, [self._append("mcx", qubits)])
+
+    def barrier(self, *qubits):
+        targets = self._resolve_qubits(list(qubits)) if qubits else list(range(self.num_qubits))
+        return InstructionSet(self, [self._append("barrier", targets)])
+
+    def reset(self, qubit):
+        return InstructionSet(self, [self._append("reset", (q,)) for q in self._resolve_qubits(qubit)])
+
+    def measure(self, qubit, clbit):
+        qubits, clbits = self._resolve_qubits(qubit), self._resolve_clbits(clbit)
+        if len(qubits) != len(clbits):
+            raise ValueError("measure(): qubit and clbit arguments must have the same length")
+        return InstructionSet(self, [self._append("measure", (q,), (), (c,)) for q, c in zip(qubits, clbits)])
+
+    def measure_all(self):
+        """Measure qubit ``i`` into clbit ``i``, adding a classical register if needed."""
+        if self.num_clbits < self.num_qubits:
+            self.add_register(ClassicalRegister(self.num_qubits - self.num_clbits, "meas"))
+        self.barrier()
+        return self.measure(list(range(self.num_qubits)), list(range(self.num_qubits)))
+
+    # parameters -------------------------------------------------------------
+
+    @property
+    def parameters(self):
+        return [Parameter(name) for name in self._parameters]
+
+    @property
+    def num_parameters(self):
+        return len(self._parameters)
+
+    def assign_parameters(self, parameters, inplace=False):
+        """
+        Bind ``{"name": value}``. Keys must be strings (``"theta"``,
+        ``"vec[0]"``); unknown names are ignored. Mirrors the native SDK in
+        returning ``None`` and leaving the circuit untouched unless
+        ``inplace=True``.
+        """
+        for key in parameters:
+            if not isinstance(key, str):
+                raise TypeError(f"assign_parameters(): keys must be parameter names (str), not {type(key).__name__}")
+        if not inplace:
+            return None
+        for inst in self.data:
+            if any(isinstance(p, ParameterExpression) for p in inst.params):
+                inst.params = tuple(p.bind(parameters) if isinstance(p, ParameterExpression) else p
+                                    for p in inst.params)
+        for name in parameters:
+            self._parameters.pop(name, None)
+        return None
+
+    # introspection ----------------------------------------------------------
+
+    def copy(self, name=None):
+        new = QuantumCircuit(name=name or self.name)
+        for reg in self.qregs + self.cregs:
+            new.add_register(reg)
+        new.data = [Instruction(i.name, i.qubits, i.params, i.clbits, i.condition, i.matrix) for i in self.data]
+        new._parameters = dict(self._parameters)
+        return new
+
+    def size(self):
+        return sum(1 for inst in self.data if inst.name not in statevector.DIRECTIVES)
+
+    def __len__(self):
+        return len(self.data)
+
+    def depth(self):
+        levels = [0] * (self.num_qubits + self.num_clbits)
+        for inst in self.data:
+            if inst.name in statevector.DIRECTIVES:
+                continue
+            wires = list(inst.qubits) + [self.num_qubits + c for c in inst.clbits]
+            if inst.condition is not None:
+                wires += [self.num_qubits + c for c in inst.condition[0]]
+            level = 1 + max(levels[w] for w in wires)
+            for w in wires:
+                levels[w] = level
+        return max(levels, default=0)
+
+    def count_ops(self):
+        counts = {}
+        for inst in self.data:
+            counts[inst.name] = counts.get(inst.name, 0) + 1
+        return counts
+
+    def draw(self):
+        lines = [f"{self.name}: {self.num_qubits} qubits, {self.num_clbits} clbits"]
+        for inst in self.data:
+            args = ", ".join(f"q[{q}]" for q in inst.qubits)
+            if inst.clbits:
+                args += " -> " + ", ".join(f"c[{c}]" for c in inst.clbits)
+            params = f"({', '.join(str(p) if isinstance(p, ParameterExpression) else f'{p:.6g}' for p in inst.params)})" if inst.params else ""
+            cond = f" if c{list(inst.condition[0])}=={inst.condition[1]}" if inst.condition else ""
+            lines.append(f"  {inst.name}{params} {args}{cond}")
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.draw()
+
+    def qasm(self, formatted=False, filename=None):
+        """Serialise to OpenQASM 2.0 (flat ``q``/``c`` registers)."""
+        lines = ["OPENQASM 2.0;", 'include "qelib1.inc";', f"qreg q[{self.num_qubits}];"]
+        if self.num_clbits:
+            lines.append(f"creg c[{self.num_clbits}];")
+        for inst in self.data:
+            if any(isinstance(p, ParameterExpression) for p in inst.params):
+                raise ValueError("cannot export a circuit with unbound parameters to QASM")
+            name = {"cnot": "cx", "toffoli": "ccx", "fredkin": "cswap", "phase": "p", "cphase": "cp"}.get(inst.name, inst.name)
+            params = f"({','.join(repr(p) for p in inst.params)})" if inst.params else ""
+            qubits = ",".join(f"q[{q}]" for q in inst.qubits)
+            if inst.name == "measure":
+                text = f"measure q[{inst.qubits[0]}] -> c[{inst.clbits[0]}];"
+            else:
+                text = f"{name}{params} {qubits};"
+            if inst.condition is not None:
+                text = f"if(c=={inst.condition[1]}) {text}"
+            lines.append(text)
+        source = "\n".join(lines) + "\n"
+        if filename:
+            with open(filename, "w", encoding="utf-8") as handle:
+                handle.write(source)
+        if formatted:
+            print(source, end="")
+            return None
+        return source
+
+    @staticmethod
+    def from_qasm_str(qasm_str):
+        from .qasm import loads
+        return loads(qasm_str)
+
+    @staticmethod
+    def from_qasm_file(path):
+        from .qasm import load
+        return load(path)
+
+    # engine hand-off --------------------------------------------------------
+
+    def engine_instructions(self):
+        """The instruction list for the engine; fails if parameters are unbound."""
+        for inst in self.data:
+            for p in inst.params:
+                if isinstance(p, ParameterExpression):
+                    raise RuntimeError(
+                        f"circuit has unbound parameters {sorted(p.parameters)}; "
+                        "call assign_parameters({...}, inplace=True) before running it")
+        return self.data
+
+    def register_sizes(self):
+        return [len(reg) for reg in self.cregs] or [0]
+
+
+def OptimizeQuantumCircuit(qc):
+    """
+    In-place peephole optimisation: drops identities and cancels adjacent
+    self-inverse gate pairs on the same qubits. Returns ``True`` on success.
+    """
+    if not isinstance(qc, QuantumCircuit):
+        raise RuntimeError("OptimizeQuantumCircuit() only accepts QuantumRingsLib.QuantumCircuit")
+    self_inverse = {"x", "y", "z", "h", "cx", "cnot", "cy", "cz", "swap", "ccx", "toffoli", "cswap"}
+    out = []
+    for inst in qc.data:
+        if inst.name in ("id", "i") and inst.condition is None:
+            continue
+        prev = out[-1] if out else None
+        if (prev is not None and inst.name in self_inverse and prev.name == inst.name
+                and prev.qubits == inst.qubits and prev.condition is None and inst.condition is None):
+            out.pop()
+            continue
+        out.append(inst)
+    qc.data = out
+    return True
+
+
+# ------------------------------------------------------------------ backends
+
+class JobV1(OfflineJob):
+    """A native job on the offline backend."""
+
+
+class BackendV2:
+    """Offline ``scarlet_quantum_rings`` backend executing native circuits locally."""
+
+    version = 2
+
+    def __init__(self, provider=None, name=DEFAULT_BACKEND, num_qubits=OFFLINE_MAX_QUBITS, max_circuits=1):
+        self._provider = provider
+        self.name = name
+        self.num_qubits = num_qubits
+        self.max_circuits = max_circuits
+        self.description = "Offline NumPy statevector stand-in for the Quantum Rings backend"
+        self.online_date = None
+        self.backend_version = version
+
+    def provider(self):
+        return self._provider
+
+    def run(self, run_input, shots=1024, *, seed=None, mode="sync", performance="HighestEfficiency",
+            quiet=True, generate_amplitude=False, file=None, **kwargs):
+        """
+        Execute a native ``QuantumCircuit`` (``shots`` may be positional, as in
+        0.10.x). With ``mode="sync"`` the job has finished when it is returned;
+        ``performance`` and the other service options are accepted and ignored.
+        """
+        circuits = run_input if isinstance(run_input, (list, tuple)) else [run_input]
+        if len(circuits) > self.max_circuits:
+            raise ValueError(f"{self.name} accepts at most {self.max_circuits} circuit(s) per run")
+        for circuit in circuits:
+            if not isinstance(circuit, QuantumCircuit):
+                raise TypeError("Invalid Argument Passed for Quantum Circuit: "
+                                f"{self.name} runs QuantumRingsLib.QuantumCircuit, not {type(circuit).__module__}.{type(circuit).__name__}")
+            if circuit.num_qubits > self.num_qubits:
+                raise ValueError(f"circuit uses {circuit.num_qubits} qubits; {self.name} allows {self.num_qubits}")
+            circuit.engine_instructions()
+        shots = int(shots)
+        snapshot = [c.copy() for c in circuits]
+        job_id = uuid.uuid4().hex
+
+        def execute():
+            started = time.perf_counter()
+            results = []
+            for circuit, circuit_seed in zip(snapshot, statevector.spawn_seeds(seed, len(snapshot))):
+                keys, counts = statevector.sample(circuit.num_qubits, circuit.engine_instructions(), shots,
+                                                  circuit_seed)
+                results.append(ExperimentResult(circuit.name, shots, keys, counts, circuit.register_sizes(), seed))
+            return Result(self.name, job_id, results, time.perf_counter() - started)
+
+        return JobV1(self, execute, job_id, synchronous=mode == "sync")
+
+    def __repr__(self):
+        return f"<BackendV2('{self.name}')>"
+
+
+class QuantumRingsProvider:
+    """
+    Offline provider: no credentials, no network. ``active_account()`` reports
+    the local simulator limits and ``get_backend()`` returns offline backends.
+    """
+
+    _saved = {}
+
+    def __init__(self, token=None, name=None, backend=None, max_qubits=OFFLINE_MAX_QUBITS, **kwargs):
+        saved = self._saved.get("default", {})
+        self._token = token or saved.get("token") or "offline"
+        self._name = name or saved.get("name") or OFFLINE_ACCOUNT
+        self._max_qubits = max_qubits
+        self._backends = {}
+
+    def active_account(self):
+        return {
+            "name": self._name,
+            "token": self._token,
+            "max_qubits": self._max_qubits,
+            "backend": DEFAULT_BACKEND,
+            "channel": "offline",
+        }
+
+    def backends(self, name=None, **filters):
+        names = [DEFAULT_BACKEND] if name is None else [name]
+        return [self.get_backend(n) for n in names]
+
+    def get_backend(self, name=DEFAULT_BACKEND, **kwargs):
+        if name not in self._backends:
+            self._backends[name] = BackendV2(self, name or DEFAULT_BACKEND, self._max_qubits)
+        return self._backends[name]
+
+    def save_account(self, token=None, name=None, channel=None, account_name="default", overwrite=True, **kwargs):
+        if account_name in self._saved and not overwrite:
+            raise ValueError(f"account {account_name!r} already saved; pass overwrite=True")
+        type(self)._saved[account_name] = {"token": token, "name": name}
+
+    def saved_accounts(self, default=True, name=None):
+        if name is not None:
+            return {name: self._saved[name]} if name in self._saved else {}
+        return dict(self._saved)
+
+    def delete_account(self, name="default"):
+        return self._saved.pop(name, None) is not None
+
+    def __repr__(self):
+        return f"<QuantumRingsProvider(name='{self._name}', offline)>"
+
+
+def job_monitor(job, interval=1, quiet=False, output=sys.stdout):
+    """Wait for a native job, printing its status. Toolkit jobs are rejected."""
+    if not isinstance(job, JobV1):
+        raise TypeError(f"job_monitor() accepts QuantumRingsLib.JobV1, not {type(job).__name__}")
+    status = job.status()
+    while status not in JOB_FINAL_STATES:
+        if not quiet:
+            print(f"\rJob Status: {status.value}", end="", file=output)
+        try:
+            job.result(timeout=interval)
+        except Exception:
+            pass
+        status = job.status()
+    if not quiet:
+        print(f"\rJob Status: {status.value}", file=output)
+
+
+__all__ = [
+    "AncillaRegister",
+    "BackendV2",
+    "ClassicalRegister",
+    "JobStatus",
+    "JobV1",
+    "OptimizeQuantumCircuit",
+    "Parameter",
+    "ParameterExpression",
+    "ParameterVector",
+    "QuantumCircuit",
+    "QuantumRegister",
+    "QuantumRingsProvider",
+    "job_monitor",
+    "version",
+]
@@ -0,0 +1,400 @@
+"""
+OpenQASM 2.0 loader for the offline native ``QuantumCircuit``.
+
+Mirrors ``QuantumRingsLib.qasm2.load``/``loads``: registers are flattened in
+declaration order, ``qelib1.inc`` gates map onto the engine's gate table and
+user ``gate`` definitions are expanded inline. Files are tokenized line by
+line, so a circuit with millions of gates never exists as one string. Gate
+bodies are parsed once, at definition. Other ``include`` files are looked up
+on the include path, and their gates are parsed once per process.
+"""
+
+import ast
+import functools
+import keyword
+import math
+import operator
+import re
+import threading
+from pathlib import Path
+
+from . import statevector
+
+QELIB_ALIASES = {"CX": "cx", "U": "u", "cu1": "cp", "u0": "id", "c3x": "mcx", "c4x": "mcx"}
+# Qubit counts of the aliases that map onto variable-width engine gates.
+QELIB_WIDTHS = {"c3x": 4, "c4x": 5}
+# qelib1.inc gates without an engine counterpart, expanded with qelib1.inc's own bodies.
+QELIB_DEFINITIONS = """
+gate cu(theta,phi,lambda,gamma) c,t { p(gamma) c; p((lambda+phi)/2) c; p((lambda-phi)/2) t; cx c,t;
+  u(-theta/2,0,-(phi+lambda)/2) t; cx c,t; u(theta/2,phi,0) t; }
+gate rccx a,b,c { u2(0,pi) c; u1(pi/4) c; cx b,c; u1(-pi/4) c; cx a,c; u1(pi/4) c; cx b,c; u1(-pi/4) c;
+  u2(0,pi) c; }
+gate rc3x a,b,c,d { u2(0,pi) d; u1(pi/4) d; cx c,d; u1(-pi/4) d; u2(0,pi) d; cx a,d; u1(pi/4) d; cx b,d;
+  u1(-pi/4) d; cx a,d; u1(pi/4) d; cx b,d; u1(-pi/4) d; u2(0,pi) d; u1(pi/4) d; cx c,d; u1(-pi/4) d;
+  u2(0,pi) d; }
+gate c3sqrtx a,b,c,d { h d; cu1(pi/8) a,d; h d; cx a,b; h d; cu1(-pi/8) b,d; h d; cx a,b; h d;
+  cu1(pi/8) b,d; h d; cx b,c; h d; cu1(-pi/8) c,d; h d; cx a,c; h d; cu1(pi/8) c,d; h d; cx b,c; h d;
+  cu1(-pi/8) c,d; h d; cx a,c; h d; cu1(pi/8) c,d; h d; }
+"""
+# Distinct gate statements remembered per load; circuits repeat "cx q[0],q[1];" a lot.
+APPLICATION_CACHE = 1 << 16
+
+_NAME = re.compile(r"[A-Za-z_]\w*")
+_BINARY = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+           ast.Div: operator.truediv, ast.Pow: operator.pow}
+_FUNCTIONS = {"sin": math.sin, "cos": math.cos, "tan": math.tan, "exp": math.exp,
+              "ln": math.log, "sqrt": math.sqrt, "acos": math.acos, "asin": math.asin, "atan": math.atan}
+
+
+class QasmError(ValueError):
+    """Raised for QASM the loader cannot parse."""
+
+
+def _walk(node, scope, expression):
+    if isinstance(node, ast.Expression):
+        return _walk(node.body, scope, expression)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return float(node.value)
+    if isinstance(node, ast.Name):
+        if node.id == "pi":
+            return math.pi
+        if node.id in scope:
+            return scope[node.id]
+        raise QasmError(f"unknown identifier {node.id!r} in {expression!r}")
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _walk(node.operand, scope, expression)
+        return -value if isinstance(node.op, ast.USub) else value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+        return _BINARY[type(node.op)](_walk(node.left, scope, expression), _walk(node.right, scope, expression))
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _FUNCTIONS:
+        return _FUNCTIONS[node.func.id](*(_walk(arg, scope, expression) for arg in node.args))
+    raise QasmError(f"unsupported expression {expression!r}")
+
+
+def _identifier(name):
+    # QASM parameters may be Python keywords (qelib1's own "lambda"); they are parsed with a trailing "_".
+    return f"{name}_" if keyword.iskeyword(name) else name
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse(expression):
+    try:
+        return ast.parse(_NAME.sub(lambda m: _identifier(m.group()), expression.replace("^", "**")), mode="eval")
+    except SyntaxError as exc:
+        raise QasmError(f"bad expression {expression!r}") from exc
+
+
+@functools.lru_cache(maxsize=65536)
+def _constant(expression):
+    try:
+        return float(expression)
+    except ValueError:
+        return _walk(_parse(expression), {}, expression)
+
+
+def evaluate(expression, scope=None):
+    """Evaluate a QASM angle expression (``pi/2``, ``-theta*2``, ``cos(0.3)``)."""
+    if not scope:
+        return _constant(expression.strip())
+    return _walk(_parse(expression.strip()), scope, expression)
+
+
+_STATEMENT = re.compile(r"[^;{}]*(?:;|\{[^}]*\})", re.S)
+_APPLY = re.compile(r"^(?P<name>[A-Za-z_]\w*)\s*(?:\((?P<params>(?:[^()]|\([^()]*\))*)\))?\s*(?P<args>.*)$", re.S)
+_ARG = re.compile(r"^(?P<reg>[A-Za-z_]\w*)\s*(?:\[\s*(?P<index>\d+)\s*\])?$")
+_DEFINITION = re.compile(r"^(?:gate|opaque)\s+(?P<name>\w+)\s*(?:\((?P<params>[^)]*)\))?\s*(?P<args>[^{;]*)"
+                         r"(?:\{(?P<body>.*)\})?", re.S)
+_DECLARATION = re.compile(r"^(qreg|creg)\s+(\w+)\s*\[\s*(\d+)\s*\]$")
+_CONDITION = re.compile(r"^if\s*\(\s*(\w+)\s*==\s*(\d+)\s*\)\s*(.*)$", re.S)
+_MEASURE = re.compile(r"^measure\s+(.+?)\s*->\s*(.+)$", re.S)
+_INCLUDE = re.compile(r'^include\s+"(?P<file>[^"]+)"$')
+
+
+# Gate definitions of include files by (path, mtime, size), shared by every load in the process.
+_INCLUDES = {}
+_INCLUDES_LOCK = threading.Lock()
+
+
+def _check_arity(name, params, qubits, num_params, num_qubits):
+    if len(params) != num_params:
+        raise QasmError(f"gate {name!r} takes {num_params} parameter(s), got {len(params)}")
+    if len(qubits) != num_qubits:
+        raise QasmError(f"gate {name!r} acts on {num_qubits} qubit(s), got {len(qubits)}")
+    if len(set(qubits)) != len(qubits):
+        raise QasmError(f"gate {name!r} is applied to the same qubit twice")
+
+
+def _split_args(text):
+    return [a.strip() for a in text.split(",") if a.strip()]
+
+
+def _split_params(text):
+    if not text:
+        return []
+    if "(" not in text:
+        return _split_args(text)
+    # Commas inside function calls (none in qelib1 but allowed) need depth tracking.
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current.append(char)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def statements(source):
+    """
+    Yield complete statements (``...;`` or ``gate ... { ... }``) without
+    comments. ``source`` is a string or an iterable of lines such as an open
+    file; only the statement being read is held in memory.
+    """
+    lines = source.splitlines() if isinstance(source, str) else source
+    buffer = ""
+    for line in lines:
+        line = line.split("//", 1)[0].strip()
+        if not line:
+            continue
+        buffer = f"{buffer} {line}" if buffer else line
+        if ";" not in line and "}" not in line:
+            continue
+        if "{" not in buffer and buffer.endswith(";") and buffer.count(";") == 1:
+            # One statement per line, the common case.
+            if buffer != ";":
+                yield buffer
+            buffer = ""
+            continue
+        if buffer.count("{") > buffer.count("}"):
+            continue  # inside a gate body
+        end = 0
+        for match in _STATEMENT.finditer(buffer):
+            end = match.end()
+            statement = match.group(0).strip()
+            if statement and statement != ";":
+                yield statement
+        buffer = buffer[end:].strip()
+    if buffer:
+        raise QasmError(f"unterminated statement {buffer[:60]!r}")
+
+
+def _definition(statement):
+    """``(name, (params, args, body))`` of a ``gate``/``opaque`` statement."""
+    match = _DEFINITION.match(statement)
+    if not match:
+        raise QasmError(f"bad gate definition: {statement!r}")
+    # The body is parsed once here; applying the gate only evaluates angles.
+    body = []
+    for sub in statements(match.group("body") or ""):
+        apply = _APPLY.match(sub.rstrip(";").strip())
+        if not apply:
+            raise QasmError(f"cannot parse {sub!r} in gate {match.group('name')}")
+        body.append((apply.group("name"),
+                     [(p, _parse(p)) for p in _split_params(apply.group("params"))],
+                     _split_args(apply.group("args"))))
+    params = [_identifier(p) for p in _split_args(match.group("params") or "")]
+    args = _split_args(match.group("args"))
+    for sub_name, _, sub_args in body:
+        if not set(sub_args) <= set(args):
+            raise QasmError(f"{sub_name} in gate {match.group('name')} uses undeclared qubits "
+                            f"{sorted(set(sub_args) - set(args))}")
+    # An opaque gate has no body to expand; applying it is an error, not a no-op.
+    return match.group("name"), (params, args, None if statement.startswith("opaque") else body)
+
+
+_QELIB_GATES = dict(_definition(s) for s in statements(QELIB_DEFINITIONS))
+
+
+def included_gates(path):
+    """Gate definitions of an include file, parsed once per process while the file is unchanged."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _INCLUDES_LOCK:
+        gates = _INCLUDES.get(key)
+    if gates is None:
+        builder = _Builder(path.stem, [path.parent])
+        with open(path, encoding="utf-8") as handle:
+            for statement in statements(handle):
+                builder.statement(statement)
+        if builder.circuit.num_qubits or builder.circuit.num_clbits or builder.circuit.data:
+            raise QasmError(f"{path} declares registers or operations; an include may only define gates")
+        gates = builder.gates
+        with _INCLUDES_LOCK:
+            _INCLUDES[key] = gates
+    return gates
+
+
+class _Builder:
+    def __init__(self, name, include_path=()):
+        from .native import ClassicalRegister, QuantumCircuit, QuantumRegister
+        self._qreg, self._creg = QuantumRegister, ClassicalRegister
+        self.circuit = QuantumCircuit(name=name)
+        self.qregs, self.cregs = {}, {}
+        self.gates = dict(_QELIB_GATES)
+        self.include_path = [Path(p) for p in include_path]
+        self.includes = []
+        self._bits = {}
+        self._applications = {}
+
+    def bits(self, arg, registers, kind):
+        cached = self._bits.get((kind, arg))
+        if cached is not None:
+            return cached
+        match = _ARG.match(arg)
+        if not match or match.group("reg") not in registers:
+            raise QasmError(f"unknown {kind} {arg!r}")
+        offset, size = registers[match.group("reg")]
+        if match.group("index") is None:
+            bits = list(range(offset, offset + size))
+        else:
+            index = int(match.group("index"))
+            if index >= size:
+                raise QasmError(f"{arg} is out of range")
+            bits = [offset + index]
+        self._bits[(kind, arg)] = bits
+        return bits
+
+    def declare(self, kind, name, size):
+        if kind == "qreg":
+            self.qregs[name] = (self.circuit.num_qubits, size)
+            self.circuit.add_register(self._qreg(size, name))
+        else:
+            self.cregs[name] = (self.circuit.num_clbits, size)
+            self.circuit.add_register(self._creg(size, name))
+
+    def define(self, statement):
+        name, definition = _definition(statement)
+        self.gates[name] = definition
+
+    def include(self, statement):
+        match = _INCLUDE.match(statement.rstrip(";").strip())
+        if not match:
+            raise QasmError(f"bad include: {statement!r}")
+        filename = match.group("file")
+        if filename == "qelib1.inc":
+            return  # built in: the engine's gate table
+        for directory in self.include_path:
+            if (directory / filename).is_file():
+                path = (directory / filename).resolve()
+                break
+        else:
+            raise QasmError(f"cannot find {filename!r} in {[str(d) for d in self.include_path]}")
+        self.gates.update(included_gates(path))
+        self.includes.append(path)
+
+    def apply(self, name, params, qubits, condition=None):
+        """Append gate ``name`` with evaluated ``params`` on flat ``qubits``."""
+        if name == "u0":
+            params = ()  # u0(gamma) is an identity of duration gamma
+        if name in QELIB_WIDTHS:
+            _check_arity(name, params, qubits, 0, QELIB_WIDTHS[name])
+        name = QELIB_ALIASES.get(name, name)
+        if name in self.gates:
+            formal_params, formal_args, body = self.gates[name]
+            if body is None:
+                raise QasmError(f"opaque gate {name!r} has no definition the simulator can run")
+            _check_arity(name, params, qubits, len(formal_params), len(formal_args))
+            scope = dict(zip(formal_params, params))
+            wires = dict(zip(formal_args, qubits))
+            for sub_name, sub_params, sub_args in body:
+                self.apply(sub_name, [_walk(tree, scope, text) for text, tree in sub_params],
+                           [wires[a] for a in sub_args], condition)
+            return
+        if name in statevector.GATES:
+            num_qubits, num_params, _ = statevector.GATES[name]
+            _check_arity(name, params, qubits, num_params, num_qubits)
+        elif name in statevector.MULTI_CONTROLLED:
+            _check_arity(name, params, qubits, statevector.MULTI_CONTROLLED[name][0], max(len(qubits), 2))
+        elif name != "barrier":
+            raise QasmError(f"unknown gate {name!r}")
+        self.circuit.data.append(statevector.Instruction(name, qubits, params, (), condition))
+
+    def statement(self, statement):
+        statement = statement.strip()
+        if statement.startswith("OPENQASM"):
+            return
+        if statement.startswith("include"):
+            self.include(statement)
+            return
+        if statement.startswith(("gate ", "opaque ")):
+            self.define(statement)
+            return
+        body = statement.rstrip(";").strip()
+        if body.startswith(("qreg", "creg")):
+            decl = _DECLARATION.match(body)
+            if decl:
+                self.declare(decl.group(1), decl.group(2), int(decl.group(3)))
+                return
+        condition = None
+        if body.startswith("if"):
+            cond = _CONDITION.match(body)
+            if cond:
+                if cond.group(1) not in self.cregs:
+                    raise QasmError(f"unknown creg {cond.group(1)!r} in {statement!r}")
+                offset, size = self.cregs[cond.group(1)]
+                condition = (tuple(range(offset, offset + size)), int(cond.group(2)))
+                body = cond.group(3)
+        if body.startswith("measure"):
+            measure = _MEASURE.match(body)
+            if measure:
+                qubits = self.bits(measure.group(1), self.qregs, "qubit")
+                clbits = self.bits(measure.group(2), self.cregs, "clbit")
+                if len(qubits) != len(clbits):
+                    raise QasmError(f"measure size mismatch: {statement!r}")
+                for q, c in zip(qubits, clbits):
+                    self.circuit.data.append(statevector.Instruction("measure", (q,), (), (c,), condition))
+                return
+        parsed = self._applications.get(body)
+        if parsed is None:
+            match = _APPLY.match(body)
+            if not match:
+                raise QasmError(f"cannot parse {statement!r}")
+            parsed = (match.group("name"), [evaluate(p) for p in _split_params(match.group("params"))],
+                      [self.bits(a, self.qregs, "qubit") for a in _split_args(match.group("args"))])
+            if len(self._applications) < APPLICATION_CACHE:
+                self._applications[body] = parsed
+        name, params, args = parsed
+        if name == "barrier":
+            self.apply("barrier", (), [q for arg in args for q in arg])
+            return
+        if name == "reset":
+            for q in args[0]:
+                self.circuit.data.append(statevector.Instruction("reset", (q,), (), (), condition))
+            return
+        if all(len(a) == 1 for a in args):
+            self.apply(name, params, [a[0] for a in args], condition)
+            return
+        widths = {len(a) for a in args if len(a) != 1}
+        if len(widths) > 1:
+            raise QasmError(f"registers of different sizes in {statement!r}")
+        width = widths.pop()
+        for i in range(width):
+            self.apply(name, params, [a[0] if len(a) == 1 else a[i] for a in args], condition)
+
+
+def parse(source, name="circuit", include_path=()):
+    """
+    ``(circuit, includes)`` from a QASM string or iterable of lines:
+    the native ``QuantumCircuit`` and the resolved include files it used.
+    """
+    builder = _Builder(name, include_path)
+    for statement in statements(source):
+        builder.statement(statement)
+    return builder.circuit, builder.includes
+
+
+def loads(qasm_str, name="circuit", include_path=None):
+    """Build a native ``QuantumCircuit`` from an OpenQASM 2.0 string."""
+    return parse(qasm_str, name, include_path or [Path.cwd()])[0]
+
+
+def load(filename, include_path=None):
+    """Build a native ``QuantumCircuit`` from an OpenQASM 2.0 file, reading it line by line."""
+    path = Path(filename)
+    with open(path, encoding="utf-8") as handle:
+        return parse(handle, path.stem, include_path or [path.parent, Path.cwd()])[0]
@@ -0,0 +1,518 @@
+"""
+NumPy statevector engine behind the offline provider.
+
+Circuits reach the engine as a flat list of :class:`Instruction` records with
+integer qubit/clbit indices, so native QuantumRingsLib circuits and Qiskit
+circuits share one execution path. The state is an ``n``-axis tensor of shape
+``(2,) * n`` where qubit ``k`` lives on axis ``n - 1 - k``; flattening it gives
+the usual little-endian basis index (qubit 0 is the least significant bit).
+
+When every measurement is terminal the final state is computed once and all
+shots are drawn from it with a single multinomial sample. Circuits with
+mid-circuit measurement, reset or classically conditioned gates fall back to
+per-shot trajectories that share the simulated prefix. Many parameter
+bindings of one circuit can be simulated together on a leading batch axis
+(:func:`final_states`, :func:`sample_batch`).
+"""
+
+import cmath
+import math
+
+import numpy as np
+
+_SQRT1_2 = 1 / math.sqrt(2)
+
+I2 = np.eye(2, dtype=complex)
+X = np.array([[0, 1], [1, 0]], dtype=complex)
+Y = np.array([[0, -1j], [1j, 0]], dtype=complex)
+Z = np.array([[1, 0], [0, -1]], dtype=complex)
+H = np.array([[1, 1], [1, -1]], dtype=complex) * _SQRT1_2
+PAULIS = {"I": I2, "X": X, "Y": Y, "Z": Z}
+
+
+def _phase(lam):
+    return np.array([[1, 0], [0, cmath.exp(1j * lam)]], dtype=complex)
+
+
+def _rx(theta):
+    c, s = math.cos(theta / 2), math.sin(theta / 2)
+    return np.array([[c, -1j * s], [-1j * s, c]], dtype=complex)
+
+
+def _ry(theta):
+    c, s = math.cos(theta / 2), math.sin(theta / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+
+def _rz(theta):
+    return np.array([[cmath.exp(-0.5j * theta), 0], [0, cmath.exp(0.5j * theta)]], dtype=complex)
+
+
+def _u(theta, phi, lam):
+    c, s = math.cos(theta / 2), math.sin(theta / 2)
+    return np.array([
+        [c, -cmath.exp(1j * lam) * s],
+        [cmath.exp(1j * phi) * s, cmath.exp(1j * (phi + lam)) * c],
+    ], dtype=complex)
+
+
+def _pauli_rotation(pauli):
+    def matrix(theta):
+        return _expm_pauli(np.kron(pauli, pauli), theta)
+    return matrix
+
+
+def _expm_pauli(op, theta):
+    """exp(-i theta/2 P) for a Pauli product ``op`` (P^2 = I)."""
+    return math.cos(theta / 2) * np.eye(len(op), dtype=complex) - 1j * math.sin(theta / 2) * op
+
+
+def controlled(matrix, num_controls=1):
+    """Controlled version of ``matrix``; control qubits come first in the qubit list."""
+    size = len(matrix)
+    full = np.eye(size << num_controls, dtype=complex)
+    full[-size:, -size:] = matrix
+    return full
+
+
+SWAP = np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=complex)
+
+# name -> (number of qubits, number of parameters, matrix factory). Matrices are
+# written with the first listed qubit as the most significant bit, so
+# cx(control, target) is the textbook [[I, 0], [0, X]].
+GATES = {
+    "id": (1, 0, lambda: I2),
+    "i": (1, 0, lambda: I2),
+    "x": (1, 0, lambda: X),
+    "y": (1, 0, lambda: Y),
+    "z": (1, 0, lambda: Z),
+    "h": (1, 0, lambda: H),
+    "s": (1, 0, lambda: _phase(math.pi / 2)),
+    "sdg": (1, 0, lambda: _phase(-math.pi / 2)),
+    "t": (1, 0, lambda: _phase(math.pi / 4)),
+    "tdg": (1, 0, lambda: _phase(-math.pi / 4)),
+    "sx": (1, 0, lambda: np.array([[1 + 1j, 1 - 1j], [1 - 1j, 1 + 1j]], dtype=complex) / 2),
+    "sxdg": (1, 0, lambda: np.array([[1 - 1j, 1 + 1j], [1 + 1j, 1 - 1j]], dtype=complex) / 2),
+    "rx": (1, 1, _rx),
+    "ry": (1, 1, _ry),
+    "rz": (1, 1, _rz),
+    "p": (1, 1, _phase),
+    "phase": (1, 1, _phase),
+    "u1": (1, 1, _phase),
+    "u2": (1, 2, lambda phi, lam: _u(math.pi / 2, phi, lam)),
+    "u": (1, 3, _u),
+    "u3": (1, 3, _u),
+    "cx": (2, 0, lambda: controlled(X)),
+    "cnot": (2, 0, lambda: controlled(X)),
+    "cy": (2, 0, lambda: controlled(Y)),
+    "cz": (2, 0, lambda: controlled(Z)),
+    "ch": (2, 0, lambda: controlled(H)),
+    "cs": (2, 0, lambda: controlled(_phase(math.pi / 2))),
+    "csdg": (2, 0, lambda: controlled(_phase(-math.pi / 2))),
+    "csx": (2, 0, lambda: controlled(GATES["sx"][2]())),
+    "swap": (2, 0, lambda: SWAP),
+    "crx": (2, 1, lambda theta: controlled(_rx(theta))),
+    "cry": (2, 1, lambda theta: controlled(_ry(theta))),
+    "crz": (2, 1, lambda theta: controlled(_rz(theta))),
+    "cp": (2, 1, lambda lam: controlled(_phase(lam))),
+    "cphase": (2, 1, lambda lam: controlled(_phase(lam))),
+    "cu1": (2, 1, lambda lam: controlled(_phase(lam))),
+    "cu3": (2, 3, lambda theta, phi, lam: controlled(_u(theta, phi, lam))),
+    "rxx": (2, 1, _pauli_rotation(X)),
+    "ryy": (2, 1, _pauli_rotation(Y)),
+    "rzz": (2, 1, _pauli_rotation(Z)),
+    "ccx": (3, 0, lambda: controlled(X, 2)),
+    "toffoli": (3, 0, lambda: controlled(X, 2)),
+    "ccz": (3, 0, lambda: controlled(Z, 2)),
+    "cswap": (3, 0, lambda: controlled(SWAP)),
+    "fredkin": (3, 0, lambda: controlled(SWAP)),
+}
+
+# Variable-arity gates: the last qubit is the target, all others are controls.
+MULTI_CONTROLLED = {
+    "mcx": (0, lambda: X),
+    "mcp": (1, _phase),
+    "mcphase": (1, _phase),
+    "mcu1": (1, _phase),
+}
+
+DIRECTIVES = frozenset({"barrier", "delay", "snapshot"})
+
+
+class Instruction:
+    """
+    One operation in engine form.
+
+    ``condition`` is ``None`` or ``(clbits, value)``: the instruction only
+    applies when the integer formed by ``clbits`` (first listed bit least
+    significant) equals ``value``. ``matrix`` carries an explicit unitary for
+    gates the engine does not know by name (``name == "unitary"``).
+    """
+
+    __slots__ = ("name", "qubits", "params", "clbits", "condition", "matrix")
+
+    def __init__(self, name, qubits, params=(), clbits=(), condition=None, matrix=None):
+        self.name = name
+        self.qubits = tuple(qubits)
+        self.params = tuple(params)
+        self.clbits = tuple(clbits)
+        self.condition = condition
+        self.matrix = matrix
+
+    def __repr__(self):
+        params = f", params={self.params}" if self.params else ""
+        clbits = f", clbits={self.clbits}" if self.clbits else ""
+        return f"Instruction({self.name!r}, qubits={self.qubits}{params}{clbits})"
+
+
+def gate_matrix(instruction):
+    """Unitary of ``instruction`` with its first qubit as the most significant bit."""
+    name = instruction.name
+    if instruction.matrix is not None:
+        return np.asarray(instruction.matrix, dtype=complex)
+    if name in GATES:
+        arity, num_params, factory = GATES[name]
+        if len(instruction.params) != num_params or len(instruction.qubits) != arity:
+            raise ValueError(f"{name} takes {arity} qubit(s) and {num_params} parameter(s), got {instruction}")
+        return factory(*(float(p) for p in instruction.params))
+    if name in MULTI_CONTROLLED:
+        num_params, factory = MULTI_CONTROLLED[name]
+        return controlled(factory(*(float(p) for p in instruction.params[:num_params])),
+                          len(instruction.qubits) - 1)
+    raise NotImplementedError(f"offline engine has no gate named {name!r}")
+
+
+def zero_state(num_qubits):
+    state = np.zeros((2,) * num_qubits, dtype=complex)
+    state[(0,) * num_qubits] = 1.0
+    return state
+
+
+def _axes(num_qubits, qubits):
+    return [num_qubits - 1 - q for q in qubits]
+
+
+def apply_matrix(state, matrix, qubits):
+    """Apply ``matrix`` (first listed qubit most significant) to ``qubits`` of ``state``."""
+    n = state.ndim
+    m = len(qubits)
+    tensor = matrix.reshape((2,) * (2 * m))
+    axes = _axes(n, qubits)
+    result = np.tensordot(tensor, state, axes=(list(range(m, 2 * m)), axes))
+    return np.moveaxis(result, list(range(m)), axes)
+
+
+def _apply_diagonal_phase(state, qubits, phase):
+    """Multiply the all-ones subspace of ``qubits`` by ``phase`` (mcp fast path)."""
+    index = [slice(None)] * state.ndim
+    for axis in _axes(state.ndim, qubits):
+        index[axis] = 1
+    state[tuple(index)] *= phase
+    return state
+
+
+def apply_gate(state, instruction):
+    if instruction.name in ("mcp", "mcphase", "mcu1", "cp", "cphase", "cu1", "cz", "ccz") and instruction.matrix is None:
+        lam = float(instruction.params[0]) if instruction.params else math.pi
+        return _apply_diagonal_phase(state, instruction.qubits, cmath.exp(1j * lam))
+    return apply_matrix(state, gate_matrix(instruction), instruction.qubits)
+
+
+def probability_of_one(state, qubit):
+    index = [slice(None)] * state.ndim
+    index[state.ndim - 1 - qubit] = 1
+    return float(np.sum(np.abs(state[tuple(index)]) ** 2))
+
+
+def collapse(state, qubit, outcome, probability):
+    """Project ``qubit`` onto ``outcome`` and renormalise."""
+    index = [slice(None)] * state.ndim
+    index[state.ndim - 1 - qubit] = 1 - outcome
+    state[tuple(index)] = 0.0
+    norm = math.sqrt(probability if outcome else 1.0 - probability)
+    if norm > 0:
+        state /= norm
+    return state
+
+
+def _condition_holds(condition, clbit_values):
+    if condition is None:
+        return True
+    bits, value = condition
+    current = 0
+    for position, clbit in enumerate(bits):
+        current |= clbit_values[clbit] << position
+    return current == value
+
+
+def is_dynamic(instructions):
+    """True if the circuit needs per-shot trajectories."""
+    measured = set()
+    for inst in instructions:
+        if inst.condition is not None or inst.name == "reset":
+            return True
+        if inst.name in DIRECTIVES:
+            continue
+        if inst.name == "measure":
+            measured.update(inst.qubits)
+            continue
+        if measured.intersection(inst.qubits):
+            return True
+    return False
+
+
+def final_state(num_qubits, instructions):
+    """Statevector after all unitary instructions; measurements are ignored."""
+    state = zero_state(num_qubits)
+    for inst in instructions:
+        if inst.name in DIRECTIVES or inst.name == "measure":
+            continue
+        if inst.name == "reset" or inst.condition is not None:
+            raise ValueError("final_state() needs a circuit without reset or classical conditions")
+        state = apply_gate(state, inst)
+    return state
+
+
+def probabilities(state):
+    """Basis-state probabilities as a flat little-endian vector."""
+    probs = np.abs(state.reshape(-1)) ** 2
+    return probs / probs.sum()
+
+
+def _measure_map(instructions):
+    """``[(qubit, clbit)]`` with the last measurement into each clbit winning."""
+    mapping = {}
+    for inst in instructions:
+        if inst.name == "measure":
+            for qubit, clbit in zip(inst.qubits, inst.clbits):
+                mapping[clbit] = qubit
+    return [(qubit, clbit) for clbit, qubit in sorted(mapping.items())]
+
+
+def _basis_to_clbits(indices, mapping):
+    values = np.zeros(len(indices), dtype=np.uint64)
+    indices = indices.astype(np.uint64)
+    for qubit, clbit in mapping:
+        values |= ((indices >> np.uint64(qubit)) & np.uint64(1)) << np.uint64(clbit)
+    return values
+
+
+def _merge(keys, counts):
+    unique, inverse = np.unique(keys, return_inverse=True)
+    return unique, np.bincount(inverse, weights=counts, minlength=len(unique)).astype(np.int64)
+
+
+def spawn_seeds(seed, count):
+    """
+    One seed per circuit of a run seeded with ``seed``, so circuits draw
+    independent streams that are still reproducible. ``None`` stays ``None``
+    (fresh entropy each time); a ``Generator`` is shared and drawn from in order.
+    """
+    if seed is None or isinstance(seed, np.random.Generator):
+        return [seed] * count
+    sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return sequence.spawn(count)
+
+
+def sample(num_qubits, instructions, shots, seed=None):
+    """
+    Run ``shots`` shots and return ``(keys, counts)``: the distinct classical
+    register values (uint64, clbit 0 least significant) and how often each
+    occurred.
+    """
+    rng = np.random.default_rng(seed)
+    if shots <= 0:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+    mapping = _measure_map(instructions)
+    if not is_dynamic(instructions):
+        if not mapping:
+            return np.zeros(1, dtype=np.uint64), np.array([shots], dtype=np.int64)
+        probs = probabilities(final_state(num_qubits, instructions))
+        basis_counts = rng.multinomial(shots, probs)
+        nonzero = np.flatnonzero(basis_counts)
+        return _merge(_basis_to_clbits(nonzero, mapping), basis_counts[nonzero])
+    return _sample_trajectories(num_qubits, instructions, shots, rng)
+
+
+def distribution(num_qubits, instructions):
+    """
+    Exact ``(keys, probabilities)`` of the classical register for circuits
+    whose measurements are all terminal.
+    """
+    if is_dynamic(instructions):
+        raise ValueError("distribution() needs a circuit without mid-circuit measurement, reset or conditions")
+    mapping = _measure_map(instructions)
+    if not mapping:
+        return np.zeros(1, dtype=np.uint64), np.ones(1)
+    probs = probabilities(final_state(num_qubits, instructions))
+    nonzero = np.flatnonzero(probs > 1e-15)
+    keys = _basis_to_clbits(nonzero, mapping)
+    unique, inverse = np.unique(keys, return_inverse=True)
+    return unique, np.bincount(inverse, weights=probs[nonzero], minlength=len(unique))
+
+
+# Batched execution: one circuit, many parameter bindings. States carry a
+# leading batch axis, so qubit ``k`` lives on axis ``n - k``.
+
+_DIAGONAL = ("mcp", "mcphase", "mcu1", "cp", "cphase", "cu1", "cz", "ccz")
+
+
+def apply_batched_matrix(states, matrices, qubits):
+    """Apply ``(d, d)`` or per-row ``(batch, d, d)`` ``matrices`` to ``qubits`` of batched ``states``."""
+    n = states.ndim - 1
+    m = len(qubits)
+    axes = [n - q for q in qubits]
+    moved = np.moveaxis(states, axes, list(range(1, m + 1)))
+    shape = moved.shape
+    result = np.matmul(matrices, moved.reshape(shape[0], 1 << m, -1))
+    return np.moveaxis(result.reshape(shape), list(range(1, m + 1)), axes)
+
+
+def _batched_matrices(instruction, params):
+    name = instruction.name
+    if name in GATES:
+        factory = GATES[name][2]
+        return np.stack([factory(*row) for row in params.tolist()])
+    num_params, factory = MULTI_CONTROLLED[name]
+    controls = len(instruction.qubits) - 1
+    return np.stack([controlled(factory(*row[:num_params]), controls) for row in params.tolist()])
+
+
+def final_states(num_qubits, instructions, batch, params=None):
+    """
+    Statevectors of ``batch`` bindings of one circuit, shape ``(batch,) + (2,) * n``.
+
+    ``params`` maps an instruction's position in ``instructions`` to a
+    ``(batch, num_params)`` array that replaces its ``params`` row by row;
+    all other instructions are applied to every row alike.
+    """
+    params = params or {}
+    states = np.zeros((batch,) + (2,) * num_qubits, dtype=complex)
+    states[(slice(None),) + (0,) * num_qubits] = 1.0
+    for position, inst in enumerate(instructions):
+        if inst.name in DIRECTIVES or inst.name == "measure":
+            continue
+        if inst.name == "reset" or inst.condition is not None:
+            raise ValueError("final_states() needs a circuit without reset or classical conditions")
+        rows = params.get(position)
+        if rows is None:
+            states = apply_batched_matrix(states, gate_matrix(inst), inst.qubits)
+        elif inst.name in _DIAGONAL and inst.matrix is None:
+            index = [slice(None)] * states.ndim
+            for axis in _axes(num_qubits, inst.qubits):
+                index[axis + 1] = 1
+            phases = np.exp(1j * np.asarray(rows[:, 0], dtype=float))
+            states[tuple(index)] *= phases.reshape((batch,) + (1,) * (num_qubits - len(inst.qubits)))
+        else:
+            states = apply_batched_matrix(states, _batched_matrices(inst, np.asarray(rows, dtype=float)), inst.qubits)
+    return states
+
+
+def sample_batch(num_qubits, instructions, batch, params, shots, seed=None):
+    """
+    Sample every binding of :func:`final_states` and return ``(keys, counts)``:
+    the classical values seen in any row (uint64, sorted) and a
+    ``(batch, len(keys))`` int64 matrix of how often each row produced them.
+    """
+    if is_dynamic(instructions):
+        raise ValueError("sample_batch() needs a circuit without mid-circuit measurement, reset or conditions")
+    rng = np.random.default_rng(seed)
+    mapping = _measure_map(instructions)
+    if not mapping or shots <= 0:
+        return np.zeros(1, dtype=np.uint64), np.full((batch, 1), max(shots, 0), dtype=np.int64)
+    states = final_states(num_qubits, instructions, batch, params)
+    probs = np.abs(states.reshape(batch, -1)) ** 2
+    basis_counts = rng.multinomial(shots, probs / probs.sum(axis=1, keepdims=True))
+    # Fold basis states that share a classical value, then drop values no row saw.
+    keys, inverse = np.unique(_basis_to_clbits(np.arange(probs.shape[1]), mapping), return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    starts = np.searchsorted(inverse[order], np.arange(len(keys)))
+    counts = np.add.reduceat(basis_counts[:, order], starts, axis=1).astype(np.int64)
+    seen = counts.any(axis=0)
+    return keys[seen], counts[:, seen]
+
+
+def _sample_trajectories(num_qubits, instructions, shots, rng):
+    # Simulate the deterministic prefix once and branch from there per shot.
+    prefix = zero_state(num_qubits)
+    start = 0
+    for start, inst in enumerate(instructions):
+        if inst.name in ("measure", "reset") or inst.condition is not None:
+            break
+        if inst.name not in DIRECTIVES:
+            prefix = apply_gate(prefix, inst)
+    else:
+        start = len(instructions)
+
+    num_clbits = 1 + max((c for inst in instructions for c in inst.clbits), default=-1)
+    for inst in instructions:
+        if inst.condition is not None:
+            num_clbits = max(num_clbits, 1 + max(inst.condition[0], default=-1))
+    tail = instructions[start:]
+    outcomes = {}
+    for _ in range(shots):
+        state = prefix.copy()
+        clbits = [0] * num_clbits
+        for inst in tail:
+            if inst.name in DIRECTIVES or not _condition_holds(inst.condition, clbits):
+                continue
+            if inst.name == "measure":
+                for qubit, clbit in zip(inst.qubits, inst.clbits):
+                    p1 = probability_of_one(state, qubit)
+                    bit = int(rng.random() < p1)
+                    state = collapse(state, qubit, bit, p1)
+                    clbits[clbit] = bit
+            elif inst.name == "reset":
+                for qubit in inst.qubits:
+                    p1 = probability_of_one(state, qubit)
+                    bit = int(rng.random() < p1)
+                    state = collapse(state, qubit, bit, p1)
+                    if bit:
+                        state = apply_matrix(state, X, (qubit,))
+            else:
+                state = apply_gate(state, inst)
+        key = sum(bit << i for i, bit in enumerate(clbits))
+        outcomes[key] = outcomes.get(key, 0) + 1
+    keys = np.fromiter(outcomes.keys(), dtype=np.uint64, count=len(outcomes))
+    counts = np.fromiter(outcomes.values(), dtype=np.int64, count=len(outcomes))
+    order = np.argsort(keys)
+    return keys[order], counts[order]
+
+
+def pauli_expectation(state, label):
+    """
+    ``<psi|P|psi>`` for a Pauli string in Qiskit order (rightmost character
+    acts on qubit 0).
+    """
+    phi = state
+    copied = False
+    for qubit, char in enumerate(reversed(label.upper())):
+        if char == "I":
+            continue
+        if char not in PAULIS:
+            raise ValueError(f"not a Pauli label: {label!r}")
+        if not copied:
+            phi, copied = phi.copy(), True
+        phi = apply_matrix(phi, PAULIS[char], (qubit,))
+    return float(np.vdot(state.reshape(-1), phi.reshape(-1)).real)
+
+
+def format_counts(keys, counts, register_sizes):
+    """
+    Turn ``(keys, counts)`` into Qiskit-style ``{"bits": count}``. Registers
+    are printed most recent first and separated by spaces, clbit 0 rightmost.
+    """
+    result = {}
+    for key, count in zip(keys.tolist(), counts.tolist()):
+        bits = format_bits(key, register_sizes)
+        result[bits] = result.get(bits, 0) + count
+    return result
+
+
+def format_bits(value, register_sizes):
+    parts = []
+    offset = 0
+    for size in register_sizes:
+        parts.append(format((value >> offset) & ((1 << size) - 1), f"0{size}b") if size else "")
+        offset += size
+    return " ".join(reversed([p for p in parts if p])) or "0"
@@ -0,0 +1,345 @@
+"""
+Offline stand-in for ``quantumrings.toolkit.qiskit`` (toolkit 0.1.10 on Qiskit 1.x).
+
+``QrBackendV2`` is a real ``qiskit.providers.BackendV2`` with a target, so
+``transpile(qc, backend)`` works unchanged; its ``run()`` and the primitives
+convert the Qiskit circuit into engine instructions and execute them on the
+same NumPy engine as the native backend. Estimators are exact (statevector
+expectation values, ``stds`` of zero). Requires ``qiskit``.
+"""
+
+import time
+import uuid
+import warnings
+
+import numpy as np
+from qiskit.circuit import ClassicalRegister as QiskitClassicalRegister
+from qiskit.circuit import Clbit as QiskitClbit
+from qiskit.circuit import QuantumCircuit as QiskitQuantumCircuit
+from qiskit.primitives import BaseEstimatorV2, BaseSamplerV2, EstimatorResult, SamplerResult
+from qiskit.primitives.containers import BitArray, DataBin, PrimitiveResult, PubResult, SamplerPubResult
+from qiskit.primitives.containers.estimator_pub import EstimatorPub
+from qiskit.primitives.containers.sampler_pub import SamplerPub
+from qiskit.providers import BackendV2, Options
+from qiskit.quantum_info import SparsePauliOp
+from qiskit.result import QuasiDistribution
+from qiskit.transpiler import Target
+
+from . import statevector
+from .jobs import ExperimentResult, JobStatus, OfflineJob, Result
+from .native import DEFAULT_BACKEND, OFFLINE_MAX_QUBITS
+from .statevector import DIRECTIVES, GATES, MULTI_CONTROLLED, Instruction
+
+version = "0.1.10"
+__version__ = version
+
+BASIS_GATES = [
+    "id", "x", "y", "z", "h", "s", "sdg", "t", "tdg", "sx", "sxdg",
+    "rx", "ry", "rz", "p", "u", "u1", "u2", "u3",
+    "cx", "cy", "cz", "ch", "cs", "csdg", "csx", "swap", "crx", "cry", "crz", "cp", "cu3",
+    "rxx", "ryy", "rzz", "ccx", "ccz", "cswap",
+    "measure", "reset", "delay",
+]
+
+
+# ------------------------------------------------------------ circuit bridge
+
+def _condition(circuit, operation, clbit_map):
+    with warnings.catch_warnings():
+        # Instruction.condition is deprecated in Qiskit 1.3+, but c_if circuits still carry it.
+        warnings.simplefilter("ignore", DeprecationWarning)
+        condition = getattr(operation, "condition", None)
+    if condition is None:
+        return None
+    target, value = condition
+    if isinstance(target, QiskitClbit):
+        bits = [target]
+    elif isinstance(target, QiskitClassicalRegister):
+        bits = list(target)
+    else:
+        raise NotImplementedError("offline toolkit only supports c_if conditions on a clbit or register")
+    return tuple(clbit_map[circuit.find_bit(b).index] for b in bits), int(value)
+
+
+def _flatten(circuit, qubit_map, clbit_map, condition, out):
+    for item in circuit.data:
+        operation = item.operation
+        name = operation.name
+        qubits = [qubit_map[circuit.find_bit(q).index] for q in item.qubits]
+        clbits = [clbit_map[circuit.find_bit(c).index] for c in item.clbits]
+        cond = _condition(circuit, operation, clbit_map) or condition
+        if name in DIRECTIVES:
+            continue
+        if name in ("measure", "reset"):
+            out.append(Instruction(name, qubits, (), clbits, cond))
+            continue
+        if getattr(operation, "is_parameterized", lambda: False)():
+            raise RuntimeError(
+                f"circuit {circuit.name!r} has unbound parameters; bind them with "
+                "assign_parameters() or pass parameter values to the primitive")
+        if (name in GATES and GATES[name][:2] == (len(qubits), len(operation.params))) or name in MULTI_CONTROLLED:
+            out.append(Instruction(name, qubits, [float(p) for p in operation.params], (), cond))
+        elif operation.definition is not None and name != "unitary":
+            inner = operation.definition
+            _flatten(inner, qubits, clbits, cond, out)
+        elif hasattr(operation, "to_matrix"):
+            # Qiskit matrices are little-endian; the engine wants the first qubit most significant.
+            out.append(Instruction("unitary", qubits[::-1], (), (), cond, operation.to_matrix()))
+        else:
+            raise NotImplementedError(f"offline toolkit cannot execute {name!r}")
+
+
+def circuit_instructions(circuit):
+    """Engine instructions for a Qiskit ``QuantumCircuit`` (gates decomposed as needed)."""
+    if not isinstance(circuit, QiskitQuantumCircuit):
+        raise TypeError(f"expected a qiskit QuantumCircuit, got {type(circuit).__module__}.{type(circuit).__name__}")
+    out = []
+    _flatten(circuit, list(range(circuit.num_qubits)), list(range(circuit.num_clbits)), None, out)
+    return out
+
+
+def register_sizes(circuit):
+    return [creg.size for creg in circuit.cregs] or [0]
+
+
+def _bind(circuit, values):
+    # The toolkit ignores values passed for a circuit without parameters.
+    if not circuit.parameters or values is None:
+        return circuit
+    values = list(values)
+    return circuit.assign_parameters(values) if values else circuit
+
+
+def _observable(observable, circuit):
+    op = SparsePauliOp(observable) if not isinstance(observable, SparsePauliOp) else observable
+    if circuit.layout is not None and op.num_qubits != circuit.num_qubits:
+        op = op.apply_layout(circuit.layout)
+    elif op.num_qubits < circuit.num_qubits:
+        op = op.apply_layout(None, circuit.num_qubits)
+    return op
+
+
+def expectation(state, observable):
+    """``<psi|O|psi>`` of a ``SparsePauliOp`` on an engine state."""
+    return float(sum(coeff.real * statevector.pauli_expectation(state, label)
+                     for label, coeff in observable.to_list()))
+
+
+def _unitary_state(circuit):
+    stripped = circuit.remove_final_measurements(inplace=False)
+    return statevector.final_state(stripped.num_qubits, circuit_instructions(stripped))
+
+
+# ----------------------------------------------------------------- backend
+
+class QrJobV1(OfflineJob):
+    """Job returned by the toolkit backend and primitives."""
+
+
+class QrBackendV2(BackendV2):
+    """
+    Offline ``QrBackendV2``: an all-to-all target of ``num_qubits`` qubits
+    over the engine's gate set. ``run()`` takes transpiled Qiskit circuits.
+    """
+
+    def __init__(self, provider=None, num_qubits=OFFLINE_MAX_QUBITS, name=DEFAULT_BACKEND,
+                 max_circuits=1, **options):
+        super().__init__(provider=provider, name=name,
+                         description="Offline NumPy statevector stand-in for QrBackendV2",
+                         backend_version=version)
+        self._num_qubits = int(num_qubits)
+        self._max_circuits = max_circuits
+        self._target = Target.from_configuration(BASIS_GATES, num_qubits=self._num_qubits)
+        if options:
+            self.set_options(**{k: v for k, v in options.items() if k in self.options})
+
+    @classmethod
+    def _default_options(cls):
+        return Options(shots=1024, seed_simulator=None, memory=False, mode="sync",
+                       performance="HighestEfficiency", quiet=True)
+
+    @property
+    def target(self):
+        return self._target
+
+    @property
+    def max_circuits(self):
+        return self._max_circuits
+
+    def run(self, run_input, **options):
+        circuits = run_input if isinstance(run_input, (list, tuple)) else [run_input]
+        if self._max_circuits is not None and len(circuits) > self._max_circuits:
+            raise ValueError(f"{self.name} accepts at most {self._max_circuits} circuit(s) per run")
+        for circuit in circuits:
+            if circuit.num_qubits > self._num_qubits:
+                raise ValueError(f"circuit uses {circuit.num_qubits} qubits; backend has {self._num_qubits}")
+        opts = {**dict(self.options.items()), **options}
+        shots = int(opts["shots"])
+        seed = opts.get("seed_simulator")
+        prepared = [(c.name, c.num_qubits, circuit_instructions(c), register_sizes(c)) for c in circuits]
+        job_id = uuid.uuid4().hex
+
+        def execute():
+            started = time.perf_counter()
+            results = []
+            seeds = statevector.spawn_seeds(seed, len(prepared))
+            for (name, num_qubits, instructions, sizes), circuit_seed in zip(prepared, seeds):
+                keys, counts = statevector.sample(num_qubits, instructions, shots, circuit_seed)
+                results.append(ExperimentResult(name, shots, keys, counts, sizes, seed))
+            return Result(self.name, job_id, results, time.perf_counter() - started)
+
+        return QrJobV1(self, execute, job_id, synchronous=opts.get("mode") == "sync")
+
+
+# -------------------------------------------------------------- primitives
+
+class _Primitive:
+    def __init__(self, *, backend=None, options=None, run_options=None):
+        self._backend = backend
+        self._options = dict(options or {})
+        self._options.update(run_options or {})
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @property
+    def options(self):
+        return self._options
+
+    def _default_shots(self):
+        if "shots" in self._options:
+            return self._options["shots"]
+        return self._backend.options.shots if self._backend is not None else None
+
+
+def _as_list(value):
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+class QrSamplerV1(_Primitive):
+    """
+    ``run(circuits, parameter_values, **run_options)`` returning quasi
+    distributions. Without ``shots`` the distributions are exact.
+    """
+
+    def run(self, circuits, parameter_values=None, parameters=None, **run_options):
+        circuits = _as_list(circuits)
+        values = parameter_values if parameter_values is not None else [None] * len(circuits)
+        bound = [_bind(c, v) for c, v in zip(circuits, values)]
+        shots = run_options.get("shots", self._options.get("shots"))
+        seed = run_options.get("seed", self._options.get("seed"))
+
+        def execute():
+            dists = []
+            for circuit, circuit_seed in zip(bound, statevector.spawn_seeds(seed, len(bound))):
+                instructions = circuit_instructions(circuit)
+                if shots is None and not statevector.is_dynamic(instructions):
+                    keys, probs = statevector.distribution(circuit.num_qubits, instructions)
+                else:
+                    keys, counts = statevector.sample(circuit.num_qubits, instructions, shots or 1024,
+                                                      circuit_seed)
+                    probs = counts / counts.sum()
+                dists.append(QuasiDistribution(dict(zip(keys.tolist(), probs.tolist())), shots=shots))
+            return SamplerResult(dists, [{"shots": shots}] * len(dists))
+
+        return QrJobV1(self._backend, execute)
+
+
+class QrEstimatorV1(_Primitive):
+    """``run(circuits, observables, parameter_values)`` returning exact expectation values."""
+
+    def run(self, circuits, observables, parameter_values=None, **run_options):
+        circuits = _as_list(circuits)
+        observables = _as_list(observables)
+        if len(observables) != len(circuits):
+            raise ValueError(f"got {len(circuits)} circuit(s) but {len(observables)} observable(s)")
+        values = parameter_values if parameter_values is not None else [None] * len(circuits)
+        bound = [_bind(c, v) for c, v in zip(circuits, values)]
+
+        def execute():
+            evs = [expectation(_unitary_state(c), _observable(o, c)) for c, o in zip(bound, observables)]
+            return EstimatorResult(np.array(evs), [{}] * len(evs))
+
+        return QrJobV1(self._backend, execute)
+
+
+def _packed(values, offset, num_bits):
+    """Pack bits ``offset .. offset+num_bits`` of each uint64 into big-endian bytes."""
+    bits = (values[:, None] >> np.arange(offset, offset + num_bits, dtype=np.uint64)[::-1]) & np.uint64(1)
+    bits = np.pad(bits.astype(np.uint8), ((0, 0), (-num_bits % 8, 0)))
+    return np.packbits(bits, axis=-1)
+
+
+class QrSamplerV2(_Primitive, BaseSamplerV2):
+    """Sampler over PUBs ``(circuit, parameter_values, shots)`` with per-register ``BitArray`` data."""
+
+    def run(self, pubs, *, shots=None):
+        shots = shots or self._default_shots() or 1024
+        coerced = [SamplerPub.coerce(pub, shots) for pub in pubs]
+        seed = self._options.get("seed")
+        return QrJobV1(self._backend, lambda: PrimitiveResult(
+            [self._run_pub(p, s) for p, s in zip(coerced, statevector.spawn_seeds(seed, len(coerced)))],
+            metadata={"version": 2}))
+
+    @staticmethod
+    def _run_pub(pub, seed):
+        circuit = pub.circuit
+        bound = pub.parameter_values.bind_all(circuit)
+        arrays = {creg.name: np.zeros(bound.shape + (pub.shots, (creg.size + 7) // 8), dtype=np.uint8)
+                  for creg in circuit.cregs}
+        rng = np.random.default_rng(seed)
+        for index, bound_circuit in np.ndenumerate(bound):
+            keys, counts = statevector.sample(circuit.num_qubits, circuit_instructions(bound_circuit),
+                                              pub.shots, rng)
+            memory = np.repeat(keys, counts)
+            rng.shuffle(memory)
+            offset = 0
+            for creg in circuit.cregs:
+                arrays[creg.name][index] = _packed(memory, offset, creg.size)
+                offset += creg.size
+        meas = {creg.name: BitArray(arrays[creg.name], creg.size) for creg in circuit.cregs}
+        return SamplerPubResult(DataBin(**meas, shape=pub.shape),
+                                metadata={"shots": pub.shots, "circuit_metadata": circuit.metadata})
+
+
+class QrEstimatorV2(_Primitive, BaseEstimatorV2):
+    """Estimator over PUBs ``(circuit, observables[, parameter_values[, precision]])``."""
+
+    def run(self, pubs, *, precision=None):
+        precision = precision if precision is not None else self._options.get("default_precision", 0.0)
+        coerced = [EstimatorPub.coerce(pub, precision) for pub in pubs]
+        return QrJobV1(self._backend, lambda: PrimitiveResult([self._run_pub(p) for p in coerced],
+                                                              metadata={"version": 2}))
+
+    @staticmethod
+    def _run_pub(pub):
+        bound = pub.parameter_values.bind_all(pub.circuit)
+        observables = pub.observables
+        if observables.ndim == 1 and bound.ndim == 1:
+            # Toolkit 0.1.x pairs every observable with every parameter set: evs[observable, set].
+            observables = observables.reshape(-1, 1)
+        circuits, observables = np.broadcast_arrays(bound, observables)
+        evs = np.zeros(circuits.shape, dtype=float)
+        states = {}
+        for index in np.ndindex(*circuits.shape):
+            circuit = circuits[index]
+            if id(circuit) not in states:
+                states[id(circuit)] = _unitary_state(circuit)
+            labels, coeffs = zip(*observables[index].items())
+            evs[index] = expectation(states[id(circuit)], SparsePauliOp(labels, coeffs))
+        data = DataBin(evs=evs, stds=np.zeros_like(evs), shape=evs.shape)
+        return PubResult(data, metadata={"target_precision": pub.precision,
+                                         "circuit_metadata": pub.circuit.metadata})
+
+
+__all__ = [
+    "JobStatus",
+    "QrBackendV2",
+    "QrEstimatorV1",
+    "QrEstimatorV2",
+    "QrJobV1",
+    "QrSamplerV1",
+    "QrSamplerV2",
+    "circuit_instructions",
+]
@@ -0,0 +1,167 @@
+"""
+Run one parameterized native QuantumRingsLib circuit over many parameter points.
+
+QuantumRingsLib-param-10.py binds with ``assign_parameters({...}, inplace=True)``,
+which mutates the circuit, so a sweep written the obvious way rebuilds and
+rebinds a circuit in Python for every point. ``ParameterSweep`` takes the
+template once, with the parameter names that label the columns of an
+``(N, P)`` value array, and resolves every name to its column a single time.
+
+On the offline SDK the whole sweep is one batched NumPy workload: the gate
+angles of all N points come from one matrix product and the N statevectors
+are evolved together (``statevector.sample_batch``), in chunks that bound
+memory. Elsewhere each point is a bound ``copy()`` of the template, and the
+copies go through ``batch_submit.submit_batched``. Either way the result is
+a stacked ``(N, K)`` count matrix over the K outcomes seen.
+
+Usage:
+    from param_sweep import ParameterSweep
+    sweep = ParameterSweep(qc, ["theta", "phi"])
+    result = sweep.run(backend, values, shots=1000)   # values has shape (N, 2)
+    result.counts[i], result.keys, result.get_counts(i)
+"""
+
+import sys
+
+import numpy as np
+
+from batch_submit import submit_batched
+
+# Rows per offline chunk are capped so chunk * 2**num_qubits stays at this
+# many amplitudes (64 MiB of complex128).
+MAX_AMPLITUDES = 1 << 22
+
+
+class SweepResult:
+    """Stacked counts: ``counts[i, k]`` is how often point ``i`` gave ``keys[k]``."""
+
+    def __init__(self, keys, counts, shots):
+        self.keys = list(keys)
+        self.counts = counts
+        self.shots = shots
+
+    def __len__(self):
+        return len(self.counts)
+
+    def get_counts(self, row):
+        """Qiskit-style ``{"bits": count}`` for one point."""
+        return {key: int(count) for key, count in zip(self.keys, self.counts[row]) if count}
+
+    def probabilities(self):
+        return self.counts / self.shots
+
+    def __repr__(self):
+        return f"<SweepResult {len(self.counts)} points x {len(self.keys)} outcomes, {self.shots} shots>"
+
+
+def _stack(blocks, shots):
+    # blocks: (labels, (rows, len(labels)) counts) in row order.
+    keys = sorted(set().union(*(labels for labels, _ in blocks)))
+    column = {key: k for k, key in enumerate(keys)}
+    counts = np.zeros((sum(len(block) for _, block in blocks), len(keys)), dtype=np.int64)
+    start = 0
+    for labels, block in blocks:
+        counts[start:start + len(block), [column[label] for label in labels]] = block
+        start += len(block)
+    return SweepResult(keys, counts, shots)
+
+
+class ParameterSweep:
+    """
+    A native template plus the parameter names that label the value columns.
+
+    Every unbound parameter of the template must be named, and every name
+    must belong to the template, so a typo fails here rather than as a
+    silently ignored ``assign_parameters`` key.
+    """
+
+    def __init__(self, template, names):
+        self.template = template
+        self.names = [str(name) for name in names]
+        self.slots = {name: k for k, name in enumerate(self.names)}
+        if len(self.slots) != len(self.names):
+            raise ValueError("parameter names must be unique")
+        parameters = getattr(template, "parameters", None)
+        if parameters is not None:
+            available = {p.name for p in parameters}
+            unknown = sorted(set(self.names) - available)
+            missing = sorted(available - set(self.names))
+            if unknown:
+                raise ValueError(f"template has no parameter(s) {unknown}")
+            if missing:
+                raise ValueError(f"no values given for parameter(s) {missing}")
+        self._forms = None
+
+    def values(self, values):
+        """``values`` as a float ``(N, P)`` array."""
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values.reshape(-1, len(self.names))
+        if values.ndim != 2 or values.shape[1] != len(self.names):
+            raise ValueError(f"expected values of shape (N, {len(self.names)}), got {values.shape}")
+        return values
+
+    def bind(self, row):
+        """A bound copy of the template for one row of values."""
+        circuit = self.template.copy()
+        circuit.assign_parameters(dict(zip(self.names, map(float, row))), inplace=True)
+        return circuit
+
+    def run(self, backend, values, shots=1024, **run_options):
+        """Run every row of ``values`` and return a :class:`SweepResult`."""
+        values = self.values(values)
+        if self._offline(backend):
+            return self._run_offline(backend, values, shots, run_options.get("seed"))
+        batch = submit_batched(backend, [self.bind(row) for row in values], shots=shots, **run_options)
+        batch.raise_for_errors()
+        return _stack([(list(row), np.array([list(row.values())])) for row in batch.counts], shots)
+
+    # offline fast path ------------------------------------------------------
+
+    def _offline(self, backend):
+        native = sys.modules.get("offline_sdk.native")
+        if native is None or not isinstance(self.template, native.QuantumCircuit):
+            return False
+        from offline_sdk import statevector
+        return isinstance(backend, native.BackendV2) and not statevector.is_dynamic(self.template.data)
+
+    def _linear_forms(self):
+        # Instruction position -> (coefficients (P, num_params), constants), so
+        # the angles of N points are values @ coefficients + constants.
+        if self._forms is None:
+            from offline_sdk.native import ParameterExpression
+            forms = {}
+            for position, inst in enumerate(self.template.data):
+                if not any(isinstance(p, ParameterExpression) for p in inst.params):
+                    continue
+                coefficients = np.zeros((len(self.names), len(inst.params)))
+                constants = np.zeros(len(inst.params))
+                for j, param in enumerate(inst.params):
+                    if isinstance(param, ParameterExpression):
+                        for name, coefficient in param.terms.items():
+                            coefficients[self.slots[name], j] += coefficient
+                        constants[j] = param.constant
+                    else:
+                        constants[j] = param
+                forms[position] = (coefficients, constants)
+            self._forms = forms
+        return self._forms
+
+    def _run_offline(self, backend, values, shots, seed):
+        from offline_sdk import statevector
+        template = self.template
+        if template.num_qubits > backend.num_qubits:
+            raise ValueError(f"circuit uses {template.num_qubits} qubits; {backend.name} allows {backend.num_qubits}")
+        forms = self._linear_forms()
+        rng = np.random.default_rng(seed)
+        chunk = max(1, MAX_AMPLITUDES >> template.num_qubits)
+        blocks = []
+        for start in range(0, len(values), chunk):
+            block = values[start:start + chunk]
+            params = {position: block @ coefficients + constants
+                      for position, (coefficients, constants) in forms.items()}
+            keys, counts = statevector.sample_batch(template.num_qubits, template.data, len(block), params,
+                                                    int(shots), rng)
+            labels = [statevector.format_bits(key, template.register_sizes()) for key in keys.tolist()]
+            blocks.append((labels, counts))
+        return _stack(blocks, shots)
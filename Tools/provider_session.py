@@ -0,0 +1,350 @@
+"""
+Process-wide provider sessions with TTL-cached account and backend metadata.
+
+Scripts construct ``QuantumRingsProvider()`` and call ``active_account()``
+several times per run. QuantumRingsLib-provider.py calls it twice in one
+``print``. Every worker process repeats all of that at startup.
+``session()`` returns one :class:`Session` per account and process:
+
+* the provider is constructed once, on first use, and shared, so its
+  authenticated connection is reused;
+* ``active_account()`` and ``backends()`` are cached for ``ttl`` seconds, in
+  memory and in ``Tools/.cache/sessions``. A new worker therefore reads the
+  metadata from disk and does not contact the service, or construct a
+  provider, until it actually needs a backend. Tokens are never written to
+  disk.
+
+With ``url`` set, metadata is read over HTTP (``GET {url}/account`` and
+``{url}/backends``, bearer token) through a keep-alive :class:`ConnectionPool`
+shared by every session in the process. :class:`StandInServer` answers
+those two endpoints locally and counts the requests it serves, so the
+caching can be tested without an account or network.
+
+Usage:
+    from provider_session import StandInServer, session
+    qr = session(token, name)
+    qr.active_account()["max_qubits"], qr.get_backend("scarlet_quantum_rings")
+    with StandInServer(latency=0.05) as server:
+        session(url=server.url, directory=None).active_account(); server.requests
+"""
+
+import argparse
+import collections
+import hashlib
+import http.client
+import http.server
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+TOOLS_DIR = Path(__file__).resolve().parent
+CACHE_DIR = TOOLS_DIR / ".cache" / "sessions"
+TTL = 300.0
+TIMEOUT = 10.0
+POOL_SIZE = 4
+
+CacheInfo = collections.namedtuple("CacheInfo", "hits disk_hits fetches")
+
+
+class ConnectionPool:
+    """Idle keep-alive HTTP(S) connections per host, at most ``maxsize`` each."""
+
+    def __init__(self, maxsize=POOL_SIZE, timeout=TIMEOUT):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._idle = collections.defaultdict(list)
+        self._lock = threading.Lock()
+
+    def _connect(self, scheme, netloc):
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(netloc, timeout=self.timeout)
+
+    def request(self, method, url, headers=None, body=None):
+        """``(status, body bytes)``; a stale pooled connection is replaced and the request retried once."""
+        parts = urlsplit(url)
+        host = (parts.scheme, parts.netloc)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        with self._lock:
+            connection = self._idle[host].pop() if self._idle[host] else None
+        reused = connection is not None
+        while True:
+            connection = connection or self._connect(*host)
+            try:
+                connection.request(method, path or "/", body=body, headers=headers or {})
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError):
+                connection.close()
+                if not reused:
+                    raise
+                connection, reused = None, False  # the server dropped an idle connection
+                continue
+            break
+        if response.will_close:
+            connection.close()
+        else:
+            with self._lock:
+                if len(self._idle[host]) < self.maxsize:
+                    self._idle[host].append(connection)
+                    connection = None
+            if connection is not None:
+                connection.close()
+        return response.status, data
+
+    def close(self):
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+
+POOL = ConnectionPool()
+
+
+class Session:
+    """
+    One account's provider and its cached metadata. Attributes the session
+    does not define (``get_backend``, ``save_account``, ...) are forwarded
+    to the provider, which is constructed on first use.
+    """
+
+    def __init__(self, token=None, name=None, *, url=None, ttl=TTL, directory=CACHE_DIR, pool=POOL,
+                 **provider_options):
+        self.token = token
+        self.name = name
+        self.url = url.rstrip("/") if url else None
+        self.ttl = ttl
+        self.directory = Path(directory) if directory is not None else None
+        self.pool = pool
+        self.provider_options = provider_options
+        self._provider = None
+        self._entries = {}
+        self._lock = threading.RLock()
+        self._hits = self._disk_hits = self._fetches = 0
+
+    @property
+    def key(self):
+        blob = repr((self.url, self.token, self.name, sorted(self.provider_options.items())))
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    @property
+    def provider(self):
+        with self._lock:
+            if self._provider is None:
+                from QuantumRingsLib import QuantumRingsProvider
+                options = {k: v for k, v in (("token", self.token), ("name", self.name)) if v is not None}
+                self._provider = QuantumRingsProvider(**options, **self.provider_options)
+            return self._provider
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+
+    # cached metadata --------------------------------------------------------
+
+    def active_account(self):
+        """The account dict, as ``provider.active_account()`` returns it."""
+        account = dict(self._cached("account", self._fetch_account))
+        if self.token is not None:
+            account.setdefault("token", self.token)  # stripped from the disk copy
+        return account
+
+    def backends(self):
+        """``[{"name": ..., "num_qubits": ...}]`` for the account's backends."""
+        return [dict(entry) for entry in self._cached("backends", self._fetch_backends)]
+
+    def refresh(self):
+        """Drop the cached metadata (memory and disk) so the next lookup asks the service."""
+        with self._lock:
+            self._entries.clear()
+            if self.directory is not None:
+                self._path().unlink(missing_ok=True)
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._disk_hits, self._fetches)
+
+    def _cached(self, what, fetch):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(what)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._hits += 1
+                return entry[1]
+            entry = self._load().get(what)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._disk_hits += 1
+                self._entries[what] = entry
+                return entry[1]
+            self._fetches += 1
+            entry = (now, fetch())
+            self._entries[what] = entry
+            self._store()
+            return entry[1]
+
+    def _fetch_account(self):
+        if self.url is not None:
+            return self._get("/account")
+        return dict(self.provider.active_account())
+
+    def _fetch_backends(self):
+        if self.url is not None:
+            return self._get("/backends")
+        return [{"name": backend.name, "num_qubits": backend.num_qubits} for backend in self.provider.backends()]
+
+    def _get(self, path):
+        headers = {"Accept": "application/json"}
+        if self.token is not None:
+            headers["Authorization"] = f"Bearer {self.token}"
+        status, body = self.pool.request("GET", self.url + path, headers=headers)
+        if status in (401, 403):
+            raise PermissionError(f"{self.url}{path} rejected the token ({status})")
+        if status != 200:
+            raise RuntimeError(f"{self.url}{path} answered {status}")
+        return json.loads(body)
+
+    # disk tier --------------------------------------------------------------
+
+    def _path(self):
+        return self.directory / f"{self.key}.json"
+
+    def _load(self):
+        if self.directory is None:
+            return {}
+        try:
+            with open(self._path(), encoding="utf-8") as handle:
+                return {what: tuple(entry) for what, entry in json.load(handle).items()}
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self):
+        if self.directory is None:
+            return
+        record = {}
+        for what, (fetched, value) in self._entries.items():
+            if what == "account":
+                value = {k: v for k, v in value.items() if k != "token"}  # never persist credentials
+            record[what] = [fetched, value]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path()
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as handle:
+            json.dump(record, handle)
+        os.replace(tmp, path)
+
+    def __repr__(self):
+        where = self.url or "provider"
+        return f"<Session {self.name or 'default'} via {where}, ttl={self.ttl:g}s>"
+
+
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def session(token=None, name=None, *, url=None, ttl=TTL, directory=CACHE_DIR, **provider_options):
+    """
+    The process-wide :class:`Session` for this account, created on first
+    call. Asking again with a different ``ttl`` or ``directory`` raises
+    ``ValueError`` rather than quietly returning the existing settings.
+    """
+    candidate = Session(token, name, url=url, ttl=ttl, directory=directory, **provider_options)
+    with _SESSIONS_LOCK:
+        existing = _SESSIONS.setdefault(candidate.key, candidate)
+    if (existing.ttl, existing.directory) != (candidate.ttl, candidate.directory):
+        raise ValueError(f"{existing!r} already exists with ttl={existing.ttl:g}, directory={existing.directory}; "
+                         f"construct a Session directly for different settings")
+    return existing
+
+
+class _StandInHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections are exercised
+
+    def do_GET(self):
+        server = self.server.stand_in
+        with server.lock:
+            server.requests[self.path] += 1
+        time.sleep(server.latency)
+        if server.token is not None and self.headers.get("Authorization") != f"Bearer {server.token}":
+            self._reply(401, {"error": "invalid token"})
+        elif self.path == "/account":
+            self._reply(200, server.account)
+        elif self.path == "/backends":
+            self._reply(200, server.backends)
+        else:
+            self._reply(404, {"error": f"no such endpoint {self.path}"})
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """
+    Local account service for tests: ``/account`` and ``/backends`` on
+    127.0.0.1, optional bearer ``token`` check and per-request ``latency``.
+    ``requests`` counts the requests served per path.
+    """
+
+    def __init__(self, account=None, backends=None, token=None, latency=0.0, port=0):
+        self.account = account or {"name": "stand-in@example.com", "max_qubits": 128,
+                                    "backend": "scarlet_quantum_rings", "channel": "stand-in"}
+        self.backends = backends or [{"name": "scarlet_quantum_rings", "num_qubits": 128}]
+        self.token = token
+        self.latency = latency
+        self.requests = collections.Counter()
+        self.lock = threading.Lock()
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", port), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.stand_in = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stand-in-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the stand-in account service until interrupted.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    args = parser.parse_args(argv)
+    with StandInServer(token=args.token, latency=args.latency, port=args.port) as server:
+        print(f"stand-in account service on {server.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Load directories of OpenQASM 2.0 circuits in parallel, caching the parsed gate lists.
+
+QuantumRingsLib-qasm-10.py loads one file with
+``QuantumCircuit.from_qasm_file``. A benchmark library is hundreds of files,
+some with 10^5-10^6 gates, and parsing them again on every run dominates the
+time. ``load_directory`` parses the files in a process pool, using the
+offline SDK's line-by-line QASM reader. Each parsed gate list is stored in
+``Tools/.cache/qasm`` as a compact binary (``marshal``) record. The record is
+keyed by the file's path, size and modification time and by the Python
+version, and it lists the include files that were used. A reload whose
+source and includes are unchanged rebuilds the circuit from that record and
+skips parsing altogether.
+
+Circuits are offline native ``QuantumCircuit`` objects. They run on the
+offline backend, or under ``python -m offline_sdk``.
+
+Usage:
+    from qasm_loader import load, load_directory
+    circuits = load_directory("benchmarks/qasm", workers=8)   # {path: QuantumCircuit}
+    circuits, errors = load_directory("benchmarks/qasm", errors=True)  # {path: exception} for failures
+    qc = load("benchmarks/qasm/qft_30.qasm")
+
+    python qasm_loader.py benchmarks/qasm --workers 8   # exit status 1 if any file fails
+"""
+
+import argparse
+import hashlib
+import marshal
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from offline_sdk import qasm
+from offline_sdk.native import ClassicalRegister, QuantumCircuit, QuantumRegister
+from offline_sdk.statevector import Instruction
+
+TOOLS_DIR = Path(__file__).resolve().parent
+CACHE_DIR = TOOLS_DIR / ".cache" / "qasm"
+FORMAT = 1
+
+
+def _stamp(path):
+    stat = path.stat()
+    return str(path), stat.st_size, stat.st_mtime_ns
+
+
+def _cache_path(path, cache_dir):
+    # marshal's format may change between Python versions, so they do not share records.
+    key = repr((_stamp(path), FORMAT, sys.version_info[:2]))
+    return Path(cache_dir) / f"{hashlib.sha256(key.encode()).hexdigest()}.qc"
+
+
+def pack(circuit, includes=()):
+    """``circuit``'s registers and gate list as bytes; ``includes`` are checked by :func:`unpack`."""
+    rows = tuple((i.name, i.qubits, i.params, i.clbits, i.condition) for i in circuit.data)
+    registers = [[(r.name(), r.size()) for r in regs] for regs in (circuit.qregs, circuit.cregs)]
+    return marshal.dumps((FORMAT, circuit.name, *registers, [_stamp(Path(p)) for p in includes], rows))
+
+
+def unpack(data):
+    """The circuit stored by :func:`pack`, or ``None`` if the record is stale or unreadable."""
+    try:
+        version, name, qregs, cregs, includes, rows = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        return None
+    if version != FORMAT:
+        return None
+    for stamp in includes:
+        try:
+            if _stamp(Path(stamp[0])) != tuple(stamp):
+                return None
+        except OSError:
+            return None
+    circuit = QuantumCircuit(name=name)
+    for register_name, size in qregs:
+        circuit.add_register(QuantumRegister(size, register_name))
+    for register_name, size in cregs:
+        circuit.add_register(ClassicalRegister(size, register_name))
+    circuit.data = [Instruction(*row) for row in rows]
+    return circuit
+
+
+def _cached(path, cache_dir):
+    if cache_dir is None:
+        return None
+    try:
+        return unpack(_cache_path(path, cache_dir).read_bytes())
+    except OSError:
+        return None
+
+
+def _parse(path, cache_dir, include_path=None):
+    """Parse ``path`` and return the packed circuit, storing it in ``cache_dir`` (runs in workers)."""
+    path = Path(path)
+    with open(path, encoding="utf-8") as handle:
+        circuit, includes = qasm.parse(handle, path.stem, include_path or [path.parent, Path.cwd()])
+    data = pack(circuit, includes)
+    if cache_dir is not None:
+        target = _cache_path(path, cache_dir)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+    return data
+
+
+def load(path, cache_dir=CACHE_DIR, include_path=None):
+    """One QASM file as a native ``QuantumCircuit``, from the cache when it is current."""
+    path = Path(path).resolve()
+    circuit = _cached(path, cache_dir)
+    return circuit if circuit is not None else unpack(_parse(path, cache_dir, include_path))
+
+
+def load_directory(directory, pattern="*.qasm", *, workers=None, cache_dir=CACHE_DIR, include_path=None,
+                   errors=False):
+    """
+    ``{path: QuantumCircuit}`` for every file matching ``pattern``
+    (``"**/*.qasm"`` recurses) under ``directory``. Cached circuits are
+    loaded directly; the rest are parsed by ``workers`` processes (default:
+    one per core).
+
+    One bad file does not stop the others. With ``errors=False`` the first
+    failure is raised once every file has been tried, naming the file; with
+    ``errors=True`` the result is ``(circuits, {path: exception})``.
+    """
+    paths = sorted(p.resolve() for p in Path(directory).glob(pattern) if p.is_file())
+    circuits = {path: _cached(path, cache_dir) for path in paths}
+    missing = [path for path, circuit in circuits.items() if circuit is None]
+    failures = {}
+    workers = min(workers or os.cpu_count() or 1, len(missing))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {path: pool.submit(_parse, path, cache_dir, include_path) for path in missing}
+            for path, future in futures.items():
+                try:
+                    circuits[path] = unpack(future.result())
+                except Exception as exc:  # one bad file must not stop the others
+                    failures[path] = exc
+    else:
+        for path in missing:
+            try:
+                circuits[path] = unpack(_parse(path, cache_dir, include_path))
+            except Exception as exc:  # one bad file must not stop the others
+                failures[path] = exc
+    for path in failures:
+        del circuits[path]
+    if errors:
+        return circuits, failures
+    if failures:
+        path, exc = next(iter(failures.items()))
+        raise qasm.QasmError(f"{path}: {exc} ({len(failures)} of {len(paths)} file(s) failed)") from exc
+    return circuits
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--pattern", default="*.qasm")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    circuits, failures = load_directory(args.directory, args.pattern, workers=args.workers,
+                                        cache_dir=None if args.no_cache else CACHE_DIR, errors=True)
+    for path, circuit in circuits.items():
+        print(f"{path.name}: {circuit.num_qubits} qubits, {len(circuit.data)} operations")
+    for path, exc in failures.items():
+        print(f"{path.name}: FAILED: {exc}", file=sys.stderr)
+    print(f"{len(circuits)} circuit(s) in {time.perf_counter() - started:.2f}s"
+          + (f", {len(failures)} failed" if failures else ""))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""
+Cache counts and expectation values of circuits that were already run.
+
+The examples and notebooks re-run identical circuits all the time: the
+multi-10 batch rebuilds the same Bell and GHZ states on every run, and the
+sampler example submits three identical Bell circuits. Each duplicate costs
+plan quota and queue time for a result we already have. ``ResultCache``
+keys a result by:
+
+* a structural fingerprint of the circuit, for a native ``QuantumCircuit``
+  or a Qiskit one (registers, operations, wiring and angles; the circuit's
+  name and ``Parameter`` object identity do not matter);
+* the shots;
+* the runner: backend or primitive name, its options (``seed_simulator``,
+  a sampler's ``seed``) and the ``run_options`` of the call (``seed=...``).
+
+Hits come from an in-memory LRU first and then, with ``directory`` set,
+from one JSON file per result. The directory is kept under ``max_bytes``
+by deleting the least recently used files. A list of circuits is
+deduplicated first, so only distinct misses are submitted: in one
+``submit_batched`` call for a backend, or one ``run()`` for a sampler.
+
+An unseeded result is cached like a seeded one, so asking again returns the
+same sample. Pass a seed, or ``refresh=True``, when fresh shots are the
+point.
+
+Usage:
+    from result_cache import CACHE_DIR, ResultCache
+    cache = ResultCache(directory=CACHE_DIR)
+    counts = cache.counts(backend, qc, shots=1000)                    # dict, like get_counts()
+    evs = cache.expectation_values(QrEstimatorV2(backend=backend), qc, observables, values)
+"""
+
+import collections
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.primitives import BaseEstimatorV2, BaseSamplerV2, BitArray
+
+from batch_submit import submit_batched
+from transpile_cache import _feed_circuit, _param
+
+TOOLS_DIR = Path(__file__).resolve().parent
+CACHE_DIR = TOOLS_DIR / ".cache" / "results"
+MAXSIZE = 1024
+MAX_BYTES = 256 * 1024 * 1024
+SHOTS = 1024
+
+CacheInfo = collections.namedtuple("CacheInfo", "hits disk_hits misses maxsize currsize disk_bytes")
+
+
+def _feed_native(circuit, feed):
+    feed("native", circuit.num_qubits, circuit.num_clbits,
+         [(r.name(), r.size()) for r in circuit.qregs], [(r.name(), r.size()) for r in circuit.cregs])
+    for inst in circuit.data:
+        feed(inst.name, inst.qubits, inst.clbits, [_param(p) for p in inst.params], inst.condition,
+             None if inst.matrix is None else _param(np.asarray(inst.matrix)))
+
+
+def circuit_fingerprint(circuit):
+    """Hex digest of ``circuit``'s structure; equal for rebuilt copies of the same circuit."""
+    digest = hashlib.sha256()
+
+    def feed(*parts):
+        digest.update(repr(parts).encode())
+
+    if isinstance(circuit, QuantumCircuit):
+        _feed_circuit(circuit, feed)
+    else:
+        _feed_native(circuit, feed)
+    return digest.hexdigest()
+
+
+def _options(runner):
+    options = getattr(runner, "options", None)
+    if options is None:
+        return {}
+    return dict(options.items()) if hasattr(options, "items") else dict(vars(options))
+
+
+def _runner_key(runner):
+    backend = getattr(runner, "backend", None) or runner
+    return [type(runner).__name__, getattr(backend, "name", None), getattr(backend, "num_qubits", None),
+            sorted((key, repr(value)) for key, value in _options(runner).items())]
+
+
+def _key(*parts):
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def _observable_key(observable):
+    if hasattr(observable, "to_list"):
+        return sorted((label, repr(complex(coeff))) for label, coeff in observable.to_list())
+    return repr(observable)
+
+
+def _sampler_counts(circuit, pub_result):
+    data = pub_result.data
+    arrays = [getattr(data, creg.name) for creg in circuit.cregs]
+    return (arrays[0] if len(arrays) == 1 else BitArray.concatenate_bits(arrays)).get_counts()
+
+
+class ResultCache:
+    """
+    Two-tier result cache: an LRU of ``maxsize`` entries in memory and,
+    with ``directory``, at most ``max_bytes`` of JSON files on disk.
+    """
+
+    def __init__(self, maxsize=MAXSIZE, directory=None, max_bytes=MAX_BYTES):
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory is not None else None
+        self.max_bytes = max_bytes
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._disk_hits = self._misses = 0
+        self._disk_bytes = None
+
+    # public API -------------------------------------------------------------
+
+    def counts(self, runner, circuits, shots=SHOTS, *, refresh=False, **run_options):
+        """
+        Counts of ``circuits`` (one or a list) on a native or toolkit backend
+        or a ``QrSamplerV2``, as ``get_counts()`` dicts. Sampler counts cover
+        all classical registers, concatenated as in ``get_counts()``.
+        ``run_options`` go to every ``run()`` call, so a sampler rejects the
+        ones its ``run()`` does not take rather than caching under them.
+        """
+        single = not isinstance(circuits, (list, tuple))
+        circuits = [circuits] if single else list(circuits)
+        runner_key = _runner_key(runner)
+        keys = [_key("counts", circuit_fingerprint(c), int(shots), runner_key,
+                     sorted((k, repr(v)) for k, v in run_options.items())) for c in circuits]
+        found = {} if refresh else {key: self.get(key) for key in set(keys)}
+        missing = {}
+        for key, circuit in zip(keys, circuits):
+            if found.get(key) is None:
+                missing.setdefault(key, circuit)
+        if missing:
+            for key, counts in zip(missing, self._run_counts(runner, list(missing.values()), shots, run_options)):
+                self.put(key, counts)
+                found[key] = counts
+        results = [dict(found[key]) for key in keys]
+        return results[0] if single else results
+
+    def _run_counts(self, runner, circuits, shots, run_options):
+        if isinstance(runner, BaseSamplerV2):
+            result = runner.run([(c, None, shots) for c in circuits], **run_options).result()
+            return [_sampler_counts(c, r) for c, r in zip(circuits, result)]
+        if len(circuits) == 1:
+            return [runner.run(circuits[0], shots=shots, **run_options).result().get_counts()]
+        batch = submit_batched(runner, circuits, shots=shots, **run_options)
+        batch.raise_for_errors()
+        return batch.counts
+
+    def expectation_values(self, estimator, circuit, observables, parameter_values=None, *, refresh=False,
+                           **run_options):
+        """
+        ``evs`` of one estimator PUB (``QrEstimatorV2``), or the ``values``
+        of ``run([circuit], [observable], [parameter_values])`` on a V1
+        estimator, as a NumPy array.
+        """
+        values = None if parameter_values is None else np.asarray(parameter_values, dtype=float)
+        observable_key = ([_observable_key(o) for o in observables] if isinstance(observables, (list, tuple))
+                          else _observable_key(observables))
+        key = _key("evs", circuit_fingerprint(circuit), observable_key,
+                   None if values is None else (values.shape, _param(values)), _runner_key(estimator),
+                   sorted((k, repr(v)) for k, v in run_options.items()))
+        cached = None if refresh else self.get(key)
+        if cached is not None:
+            return np.asarray(cached, dtype=float)
+        if isinstance(estimator, BaseEstimatorV2):
+            pub = (circuit, observables) if values is None else (circuit, observables, values)
+            evs = estimator.run([pub], **run_options).result()[0].data.evs
+        else:
+            evs = estimator.run([circuit], [observables], None if values is None else [values.tolist()],
+                                **run_options).result().values
+        evs = np.asarray(evs, dtype=float)
+        self.put(key, evs.tolist())
+        return evs
+
+    # storage ----------------------------------------------------------------
+
+    def get(self, key):
+        """The JSON value stored under ``key``, or ``None``."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+        value = self._load(key)
+        with self._lock:
+            if value is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+        self._store(key, value)
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._disk_hits, self._misses, self.maxsize, len(self._entries),
+                             self._disk_bytes)
+
+    def clear(self, disk=False):
+        """Empty the in-memory cache, and with ``disk=True`` the directory too."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._disk_hits = self._misses = 0
+            if disk and self.directory is not None and self.directory.is_dir():
+                for path in self.directory.glob("*.json"):
+                    path.unlink(missing_ok=True)
+                self._disk_bytes = 0
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as handle:
+                value = json.load(handle)
+            os.utime(path)  # mtime is the recency used for eviction
+        except (OSError, ValueError):
+            return None
+        return value
+
+    def _store(self, key, value):
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        data = json.dumps(value, separators=(",", ":")).encode()
+        with open(tmp, "wb") as handle:
+            handle.write(data)
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(p.stat().st_size for p in self.directory.glob("*.json"))
+            try:
+                self._disk_bytes -= path.stat().st_size
+            except OSError:
+                pass
+            os.replace(tmp, path)
+            self._disk_bytes += len(data)
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Oldest files first until the directory is back under 90% of max_bytes.
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= 0.9 * self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._disk_bytes = total
@@ -0,0 +1,474 @@
+"""
+Static checks for Quantum Rings SDK pitfalls that otherwise surface only after submission.
+
+Each file is parsed once and walked once with ``ast``. A light symbol table
+remembers which names were imported from ``QuantumRingsLib``, from Qiskit
+or from the toolkit, and what kind of object each variable holds: native
+register, circuit, parameter, backend or job; Qiskit circuit; toolkit
+backend, primitive or job. The checks:
+
+* QR001 slicing a native register (``c[:2]``);
+* QR002 ``Parameter`` objects as ``assign_parameters`` keys on a native circuit;
+* QR003 native ``assign_parameters`` without ``inplace=True`` (returns ``None``, binds nothing);
+* QR004 mixed ``Parameter`` and float angles in one native gate call (``u(theta, pi/2, ...)``);
+* QR005 ``job_monitor`` on a ``QrBackendV2``/primitive job;
+* QR006 a native circuit passed to Qiskit/toolkit code, or the other way round.
+
+Every finding carries a suggested fix. ``# noqa`` or ``# noqa: QR003`` on a
+line silences it. The examples that demonstrate a pitfall on purpose are
+listed in ``ALLOWED`` instead, so their source stays as published. Files
+are linted in a process pool and the findings are cached in
+``Tools/.cache/lint.json`` by a hash of the content and of this module, so
+re-running over an unchanged tree costs only the hashing.
+
+Usage:
+    python Tools/sdk_lint.py [paths...] [--jobs N] [--no-cache] [--json]
+    from sdk_lint import lint_source
+    for finding in lint_source(code): print(finding.code, finding.line, finding.message, finding.fix)
+"""
+
+import argparse
+import ast
+import collections
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from example_headers import CODE_DIR, example_paths
+from validate_examples import write_json
+
+TOOLS_DIR = Path(__file__).resolve().parent
+REPO_DIR = TOOLS_DIR.parent
+CACHE_PATH = TOOLS_DIR / ".cache" / "lint.json"
+CACHE_VERSION = 1
+# Cached files kept across runs; the least recently used are dropped beyond this.
+CACHE_LIMIT = 4096
+# Below this many uncached files, starting worker processes costs more than it saves.
+PARALLEL_MIN = 16
+
+Finding = collections.namedtuple("Finding", "path line col code message fix")
+
+# Pitfalls the examples show on purpose: (path relative to the repository, code) -> text of the
+# flagged line. Matching the text rather than a line number survives edits elsewhere in the file.
+ALLOWED = {
+    ("Code/QuantumRingsLib-no-slicing-10.py", "QR001"): "c_qr[:2]",
+    ("Code/QuantumRingsLib-parameter-binding-test.py", "QR004"): "qc2.u(theta, math.pi / 2",
+    ("Code/QuantumRingsLib-parameter-binding-test.py", "QR002"): "qc3.assign_parameters(bad_keys",
+    ("Code/QuantumRingsLib-parameter-binding-test.py", "QR003"): "new_qc = qc4.assign_parameters(",
+}
+
+RULES = {
+    "QR001": ("native registers cannot be sliced",
+              "index bits one at a time: measure(q[0], c[0]); measure(q[1], c[1])"),
+    "QR002": ("QuantumRingsLib assign_parameters() takes parameter names as keys, not Parameter objects",
+              'use string keys: {"theta": 1.57, "p[0]": 0.3}'),
+    "QR003": ("QuantumRingsLib assign_parameters() returns None and binds nothing without inplace=True",
+              "call qc.assign_parameters({...}, inplace=True) and keep using qc"),
+    "QR004": ("native gates take all-Parameter or all-float angles, not a mix",
+              "make every angle a Parameter and bind later, or pass floats only"),
+    "QR005": ("job_monitor() only accepts QuantumRingsLib jobs; this is a QrBackendV2/primitive job",
+              "use job.wait_for_final_state() or Tools/job_monitor.py's monitor_jobs()"),
+    "QR006": ("native QuantumRingsLib and Qiskit circuits are not interchangeable",
+              "build the circuit with the SDK that runs it (QuantumRingsLib backend.run() vs QrBackendV2/transpile)"),
+}
+
+_NOQA = re.compile(r"#\s*noqa(?::\s*(?P<codes>[A-Z]+\d+(?:\s*,\s*[A-Z]+\d+)*))?", re.I)
+_MULTI_ANGLE_GATES = {"u": 3, "u3": 3, "u2": 2, "cu3": 3, "cu": 4, "r": 2}
+_NUMERIC_MODULES = {"math", "np", "numpy", "cmath"}
+
+
+def _sdk(module):
+    if module.startswith("QuantumRingsLib"):
+        return "native"
+    if module.startswith("quantumrings.toolkit"):
+        return "toolkit"
+    if module.split(".")[0] == "qiskit":
+        return "qiskit"
+    return None
+
+
+# Constructor (sdk, name) -> kind of the object it returns.
+_CONSTRUCTORS = {
+    ("native", "QuantumRegister"): "native.register",
+    ("native", "ClassicalRegister"): "native.register",
+    ("native", "AncillaRegister"): "native.register",
+    ("native", "QuantumCircuit"): "native.circuit",
+    ("native", "Parameter"): "native.parameter",
+    ("native", "ParameterVector"): "native.vector",
+    ("native", "QuantumRingsProvider"): "native.provider",
+    ("qiskit", "QuantumCircuit"): "qiskit.circuit",
+    ("qiskit", "transpile"): "qiskit.circuit",
+    ("qiskit", "QAOAAnsatz"): "qiskit.circuit",
+    ("toolkit", "QrBackendV2"): "toolkit.backend",
+}
+
+
+class _Checker(ast.NodeVisitor):
+    def __init__(self, path):
+        self.path = path
+        self.names = {}  # imported name -> (sdk, original name)
+        self.modules = {}  # module alias -> sdk
+        self.kinds = {}  # variable -> kind
+        self.dicts = {}  # variable -> ast.Dict it was assigned
+        self.constants = set()  # pi, e, tau imported from math/numpy
+        self.findings = []
+
+    def report(self, node, code):
+        message, fix = RULES[code]
+        self.findings.append(Finding(self.path, node.lineno, node.col_offset + 1, code, message, fix))
+
+    # symbols ----------------------------------------------------------------
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            sdk = _sdk(alias.name)
+            name = alias.asname or alias.name.split(".")[0]
+            if sdk is not None:
+                self.modules[alias.asname or alias.name] = sdk
+                self.modules.setdefault(name, sdk)
+            elif alias.asname is None:
+                self.modules.pop(name, None)
+
+    def visit_ImportFrom(self, node):
+        sdk = _sdk(node.module or "")
+        for alias in node.names:
+            name = alias.asname or alias.name
+            if node.module in _NUMERIC_MODULES and alias.name in ("pi", "e", "tau"):
+                self.constants.add(name)
+            if sdk is None:
+                self.names.pop(name, None)
+            else:
+                self.names[name] = (sdk, alias.name)
+
+    def origin(self, node):
+        """``(sdk, name)`` of a callee such as ``QuantumCircuit`` or ``QuantumRingsLib.QuantumCircuit``."""
+        if isinstance(node, ast.Name):
+            return self.names.get(node.id)
+        if isinstance(node, ast.Attribute):
+            base = node.value
+            dotted = []
+            while isinstance(base, ast.Attribute):
+                dotted.append(base.attr)
+                base = base.value
+            if isinstance(base, ast.Name):
+                module = ".".join([base.id] + dotted[::-1])
+                sdk = self.modules.get(module) or self.modules.get(base.id)
+                if sdk is not None:
+                    return sdk, node.attr
+        return None
+
+    def kind(self, node):
+        """Kind of the object ``node`` evaluates to, if the symbol table knows."""
+        if isinstance(node, ast.Name):
+            return self.kinds.get(node.id)
+        if isinstance(node, ast.Subscript):
+            return "native.parameter" if self.kind(node.value) == "native.vector" else None
+        if isinstance(node, ast.Call):
+            constructed = _CONSTRUCTORS.get(self.origin(node.func))
+            if constructed is not None:
+                return constructed
+            origin = self.origin(node.func)
+            if origin is not None and origin[0] == "toolkit" and origin[1].startswith(("QrSampler", "QrEstimator")):
+                return "toolkit.primitive"
+            if isinstance(node.func, ast.Attribute):
+                owner = self.kind(node.func.value)
+                method = node.func.attr
+                if owner == "native.provider" and method in ("get_backend", "backend"):
+                    return "native.backend"
+                if method == "run" and owner in ("native.backend",):
+                    return "native.job"
+                if method == "run" and owner in ("toolkit.backend", "toolkit.primitive"):
+                    return "toolkit.job"
+                if method == "copy" and owner is not None and owner.endswith(".circuit"):
+                    return owner
+        if self.angle(node) == "number":
+            return "number"
+        return None
+
+    def angle(self, node):
+        """``"param"`` for symbolic native angles, ``"number"`` for plain numbers, else ``None``."""
+        if isinstance(node, ast.Constant):
+            return "number" if isinstance(node.value, (int, float)) and not isinstance(node.value, bool) else None
+        if isinstance(node, ast.Name):
+            kind = self.kinds.get(node.id)
+            if kind == "native.parameter":
+                return "param"
+            if kind == "number" or node.id in self.constants:
+                return "number"
+            return None
+        if isinstance(node, ast.Attribute):
+            if isinstance(node.value, ast.Name) and node.value.id in _NUMERIC_MODULES and node.attr in ("pi", "e", "tau"):
+                return "number"
+            return None
+        if isinstance(node, ast.Subscript):
+            return "param" if self.kind(node.value) == "native.vector" else None
+        if isinstance(node, ast.UnaryOp):
+            return self.angle(node.operand)
+        if isinstance(node, ast.BinOp):
+            left, right = self.angle(node.left), self.angle(node.right)
+            if "param" in (left, right):
+                return "param"
+            return "number" if left == right == "number" else None
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and \
+                isinstance(node.func.value, ast.Name) and node.func.value.id in _NUMERIC_MODULES:
+            return "number" if all(self.angle(a) == "number" for a in node.args) else None
+        return None
+
+    def bind(self, target, value):
+        if isinstance(target, ast.Name):
+            kind = self.kind(value)
+            if kind is None:
+                self.kinds.pop(target.id, None)
+            else:
+                self.kinds[target.id] = kind
+            if isinstance(value, ast.Dict):
+                self.dicts[target.id] = value
+            else:
+                self.dicts.pop(target.id, None)
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            for element in target.elts:
+                self.unbind(element)
+
+    def unbind(self, target):
+        for node in ast.walk(target):
+            if isinstance(node, ast.Name):
+                self.kinds.pop(node.id, None)
+                self.dicts.pop(node.id, None)
+
+    def visit_Assign(self, node):
+        self.visit(node.value)
+        for target in node.targets:
+            self.bind(target, node.value)
+            if not isinstance(target, ast.Name):
+                self.visit(target)
+
+    def visit_AnnAssign(self, node):
+        if node.value is not None:
+            self.visit(node.value)
+            self.bind(node.target, node.value)
+
+    def visit_AugAssign(self, node):
+        self.visit(node.value)
+        self.unbind(node.target)
+
+    def visit_For(self, node):
+        self.visit(node.iter)
+        self.unbind(node.target)
+        for statement in node.body + node.orelse:
+            self.visit(statement)
+
+    def visit_FunctionDef(self, node):
+        for expression in node.decorator_list:
+            self.visit(expression)
+        self.scoped(node.args, node.body)
+        self.unbind(ast.Name(id=node.name))
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node):
+        self.scoped(node.args, [node.body])
+
+    def visit_ClassDef(self, node):
+        for expression in node.decorator_list + node.bases + [k.value for k in node.keywords]:
+            self.visit(expression)
+        self.scoped(None, node.body)
+        self.unbind(ast.Name(id=node.name))
+
+    def scoped(self, arguments, body):
+        """
+        Visit ``body`` in a scope of its own: it sees the enclosing names,
+        its parameters shadow them, and its own bindings are dropped after.
+        """
+        if arguments is not None:
+            for default in arguments.defaults + [d for d in arguments.kw_defaults if d is not None]:
+                self.visit(default)
+        saved = (dict(self.names), dict(self.modules), dict(self.kinds), dict(self.dicts), set(self.constants))
+        if arguments is not None:
+            for arg in arguments.posonlyargs + arguments.args + arguments.kwonlyargs + [arguments.vararg,
+                                                                                       arguments.kwarg]:
+                if arg is not None:
+                    self.unbind(ast.Name(id=arg.arg))
+        for statement in body:
+            self.visit(statement)
+        self.names, self.modules, self.kinds, self.dicts, self.constants = saved
+
+    # checks -----------------------------------------------------------------
+
+    def visit_Subscript(self, node):
+        if isinstance(node.slice, ast.Slice) and self.kind(node.value) == "native.register":
+            self.report(node, "QR001")
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            owner = self.kind(func.value)
+            if owner == "native.circuit":
+                self.check_native_call(node, func.attr)
+            elif owner in ("native.backend",) and func.attr == "run":
+                if any(self.kind(arg) == "qiskit.circuit" for arg in self.circuits(node)):
+                    self.report(node, "QR006")
+            elif owner in ("toolkit.backend", "toolkit.primitive") and func.attr == "run":
+                if any(self.kind(arg) == "native.circuit" for arg in self.circuits(node)):
+                    self.report(node, "QR006")
+            elif owner == "qiskit.circuit" and func.attr in ("compose", "append"):
+                if node.args and self.kind(node.args[0]) == "native.circuit":
+                    self.report(node, "QR006")
+        origin = self.origin(func)
+        if origin is not None:
+            if origin[1] == "job_monitor" and node.args and self.kind(node.args[0]) == "toolkit.job":
+                self.report(node, "QR005")
+            elif origin == ("qiskit", "transpile") and node.args and \
+                    any(self.kind(arg) == "native.circuit" for arg in self.circuits(node)):
+                self.report(node, "QR006")
+        self.generic_visit(node)
+
+    def circuits(self, call):
+        """Names passed to ``call`` directly, in a list/tuple, or inside PUB tuples."""
+        found = []
+        for arg in call.args:
+            stack = [arg]
+            while stack:
+                item = stack.pop()
+                if isinstance(item, (ast.List, ast.Tuple)):
+                    stack.extend(item.elts)
+                else:
+                    found.append(item)
+        return found
+
+    def check_native_call(self, node, method):
+        if method == "assign_parameters":
+            inplace = next((k.value for k in node.keywords if k.arg == "inplace"), None)
+            if not (isinstance(inplace, ast.Constant) and inplace.value is True) and len(node.args) < 2:
+                self.report(node, "QR003")
+            mapping = node.args[0] if node.args else None
+            if isinstance(mapping, ast.Name):
+                mapping = self.dicts.get(mapping.id, mapping)
+            if isinstance(mapping, ast.Dict) and any(
+                    key is not None and self.angle(key) == "param" for key in mapping.keys):
+                self.report(node, "QR002")
+        elif method in _MULTI_ANGLE_GATES:
+            angles = [self.angle(arg) for arg in node.args[:_MULTI_ANGLE_GATES[method]]]
+            if "param" in angles and "number" in angles:
+                self.report(node, "QR004")
+        elif method in ("compose", "append") and node.args and self.kind(node.args[0]) == "qiskit.circuit":
+            self.report(node, "QR006")
+
+
+def _suppressed(finding, lines):
+    if finding.line > len(lines):
+        return False
+    match = _NOQA.search(lines[finding.line - 1])
+    if match is None:
+        return False
+    codes = match.group("codes")
+    return codes is None or finding.code in {c.strip().upper() for c in codes.split(",")}
+
+
+def _allowed(finding, lines):
+    try:
+        relative = Path(finding.path).resolve().relative_to(REPO_DIR).as_posix()
+    except ValueError:
+        return False
+    text = ALLOWED.get((relative, finding.code))
+    return text is not None and finding.line <= len(lines) and text in lines[finding.line - 1]
+
+
+def lint_source(source, path="<string>"):
+    """Findings for one module's source, in line order. A syntax error is reported as ``E999``."""
+    try:
+        tree = ast.parse(source, filename=str(path))
+    except SyntaxError as exc:
+        return [Finding(str(path), exc.lineno or 1, exc.offset or 1, "E999", f"syntax error: {exc.msg}",
+                        "fix the syntax before linting")]
+    checker = _Checker(str(path))
+    checker.visit(tree)
+    lines = source.splitlines()
+    findings = [f for f in checker.findings if not _suppressed(f, lines)]
+    return sorted(findings, key=lambda f: (f.line, f.col, f.code))
+
+
+def _lint_file(path):
+    source = Path(path).read_text(encoding="utf-8", errors="replace")
+    return [list(f) for f in lint_source(source, path)]
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def lint_paths(paths, jobs=None, cache_path=CACHE_PATH):
+    """
+    ``{path: [Finding]}`` for ``paths``, from the cache where the content is
+    unchanged. Findings in ``ALLOWED`` are left out.
+    """
+    paths = [Path(p) for p in paths]
+    cache = {}
+    if cache_path is not None:
+        try:
+            stored = json.loads(Path(cache_path).read_text(encoding="utf-8"))
+            cache = stored["files"] if stored.get("version") == CACHE_VERSION else {}
+        except (OSError, ValueError, KeyError):
+            cache = {}
+    sources = {path: path.read_bytes() for path in paths}
+    # A change to the checks invalidates every entry, not only those of edited files.
+    linter = _digest(Path(__file__).read_bytes())
+    digests = {path: _digest(linter.encode() + source) for path, source in sources.items()}
+    results, missing = {}, []
+    for path in paths:
+        entry = cache.pop(digests[path], None)
+        if entry is None:
+            missing.append(path)
+        else:
+            cache[digests[path]] = entry  # most recently used last
+            results[path] = [Finding(str(path), *f[1:]) for f in entry]
+    workers = min(jobs or os.cpu_count() or 1, len(missing))
+    if workers > 1 and len(missing) >= PARALLEL_MIN:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fresh = list(pool.map(_lint_file, missing, chunksize=8))
+    else:
+        fresh = [_lint_file(path) for path in missing]
+    for path, findings in zip(missing, fresh):
+        results[path] = [Finding(*f) for f in findings]
+        cache[digests[path]] = findings
+    if cache_path is not None and missing:
+        # Other trees share the cache; keep their entries and only bound the size.
+        recent = list(cache.items())[-CACHE_LIMIT:]
+        write_json(cache_path, {"version": CACHE_VERSION, "files": dict(recent)})
+    for path in paths:
+        if results[path]:
+            lines = sources[path].decode("utf-8", errors="replace").splitlines()
+            results[path] = [f for f in results[path] if not _allowed(f, lines)]
+    return {path: results[path] for path in paths}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", type=Path, help="files or directories (default: Code/)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print findings as JSON")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for path in args.paths or [CODE_DIR]:
+        paths.extend(sorted(path.rglob("*.py")) if path.is_dir() else [path])
+    if not args.paths:
+        paths = example_paths(CODE_DIR)
+    results = lint_paths(paths, args.jobs, None if args.no_cache else CACHE_PATH)
+    findings = [f for path in paths for f in results[path]]
+    if args.json:
+        print(json.dumps([f._asdict() for f in findings], indent=1))
+    else:
+        for f in findings:
+            print(f"{f.path}:{f.line}:{f.col}: {f.code} {f.message}\n    fix: {f.fix}")
+        print(f"{len(findings)} finding(s) in {len(paths)} file(s)")
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Stream measurement counts in chunks instead of waiting for all shots.
+
+``backend.run(qc, shots).result()`` and ``QrSamplerV2``'s
+``result[i].data.meas`` hand back every shot at once. ``stream_counts``
+splits a large shot count into chunk-sized jobs and keeps ``max_in_flight``
+of them running. As each chunk finishes it yields the chunk's counts and a
+running total, both as ``CompactCounts``. Memory therefore scales with the
+number of distinct outcomes, not with the number of shots. A ``stop``
+predicate, for example ``standard_error_below(0.01, "ZZ")``, ends the
+stream early and cancels the chunks still queued. Closing the generator
+does the same.
+
+``runner`` is a native or toolkit backend, or a ``QrSamplerV2``. With a
+``seed``, every chunk gets its own seed derived from it, so the stream is
+reproducible without repeating samples. A sampler can only take its seed
+from its options, so give the stream an unseeded one. Native backends run
+jobs synchronously unless ``mode="async"`` is passed; only async jobs
+overlap. ``astream_counts`` is the asyncio version.
+
+Usage:
+    from shot_stream import standard_error_below, stream_counts
+    for chunk in stream_counts(backend, qc, 10**7, chunk=10**5, stop=standard_error_below(1e-3, "ZZ")):
+        print(chunk.total.shots, chunk.total.expectation("ZZ"))
+"""
+
+import collections
+import math
+
+import numpy as np
+from qiskit.primitives import BaseSamplerV2, BitArray
+
+import async_jobs
+from compact_counts import CompactCounts
+
+CHUNK = 100_000
+MAX_IN_FLIGHT = 2
+
+ShotChunk = collections.namedtuple("ShotChunk", "index counts total")
+
+
+def standard_error_below(target, z):
+    """A ``stop`` predicate: true once the standard error of ``<z>`` is below ``target``."""
+    def stop(total):
+        value = total.expectation(z)
+        return math.sqrt(max(1.0 - value * value, 0.0) / total.shots) < target
+    return stop
+
+
+def _plan(shots, chunk, seed):
+    sizes = [min(chunk, shots - start) for start in range(0, shots, chunk)]
+    if seed is None:
+        return [(size, None) for size in sizes]
+    seeds = np.random.SeedSequence(seed).generate_state(len(sizes)).tolist()
+    return list(zip(sizes, seeds))
+
+
+def _submit(runner, circuit, shots, seed, run_options):
+    if isinstance(runner, BaseSamplerV2):
+        return runner.run([(circuit, None, shots)])
+    if seed is not None:
+        # Toolkit backends call it seed_simulator, the native backend seed.
+        name = "seed_simulator" if hasattr(getattr(runner, "options", None), "seed_simulator") else "seed"
+        run_options = dict(run_options, **{name: seed})
+    return runner.run(circuit, shots=shots, **run_options)
+
+
+def _counts(runner, circuit, result):
+    if isinstance(runner, BaseSamplerV2):
+        data = result[0].data
+        arrays = [getattr(data, creg.name) for creg in circuit.cregs]
+        return CompactCounts.from_bitarray(arrays[0] if len(arrays) == 1 else BitArray.concatenate_bits(arrays))
+    return CompactCounts.from_result(result)
+
+
+def _chunk(runner, circuit, index, result, total):
+    counts = _counts(runner, circuit, result)
+    return ShotChunk(index, counts, counts if total is None else total.merge(counts))
+
+
+def stream_counts(runner, circuit, shots, *, chunk=CHUNK, max_in_flight=MAX_IN_FLIGHT, seed=None, stop=None,
+                  **run_options):
+    """Yield a :class:`ShotChunk` per finished chunk until ``shots`` are done or ``stop(total)`` is true."""
+    plan = _plan(shots, chunk, seed)
+    pending = collections.deque()
+    total = None
+    try:
+        for index in range(len(plan)):
+            while len(pending) < max_in_flight and index + len(pending) < len(plan):
+                size, chunk_seed = plan[index + len(pending)]
+                pending.append(_submit(runner, circuit, size, chunk_seed, run_options))
+            result = pending.popleft().result()
+            item = _chunk(runner, circuit, index, result, total)
+            total = item.total
+            yield item
+            if stop is not None and stop(total):
+                return
+    finally:
+        for job in pending:
+            job.cancel()
+
+
+async def astream_counts(runner, circuit, shots, *, chunk=CHUNK, max_in_flight=MAX_IN_FLIGHT, seed=None, stop=None,
+                         **run_options):
+    """``stream_counts`` as an async generator; jobs are awaited with ``async_jobs``."""
+    plan = _plan(shots, chunk, seed)
+    pending = collections.deque()
+    total = None
+    try:
+        for index in range(len(plan)):
+            while len(pending) < max_in_flight and index + len(pending) < len(plan):
+                size, chunk_seed = plan[index + len(pending)]
+                pending.append(_submit(runner, circuit, size, chunk_seed, run_options))
+            result = await async_jobs.result(pending.popleft())
+            item = _chunk(runner, circuit, index, result, total)
+            total = item.total
+            yield item
+            if stop is not None and stop(total):
+                return
+    finally:
+        for job in pending:
+            job.cancel()
@@ -0,0 +1,13 @@
+import pytest
+
+from compact_counts import CompactCounts
+
+
+def test_keys_that_are_not_outcomes_are_missing():
+    counts = CompactCounts.from_dict({"01": 3, "11": 1})
+    assert counts["11"] == 1 and counts[1] == 3
+    for key in ("2", "x", -1, 2 ** 70, 1.5, None):
+        assert key not in counts
+        assert counts.get(key) is None
+    with pytest.raises(KeyError):
+        counts["2"]
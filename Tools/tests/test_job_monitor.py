@@ -0,0 +1,44 @@
+import threading
+
+from job_monitor import JobMonitor
+
+
+class _Job:
+    """A polled job (no add_done_callback) that finishes when ``release`` is set."""
+
+    def __init__(self, release):
+        self.release = release
+
+    def status(self):
+        return "DONE" if self.release.is_set() else "RUNNING"
+
+    def result(self):
+        return "result"
+
+
+def test_cancelled_future_does_not_stop_the_monitor():
+    release = threading.Event()
+    monitor = JobMonitor(quiet=True, fetch_results=False, initial=0.01, maximum=0.02)
+    first, second = monitor.watch(_Job(release)), monitor.watch(_Job(release))
+    assert first.cancel()
+    release.set()
+    assert monitor.wait(3)
+    assert second.result(0).status() == "DONE"
+    assert monitor.counts()["PENDING"] == 0
+    monitor.close()
+
+
+def test_failing_callback_and_job_do_not_stop_the_monitor():
+    release = threading.Event()
+
+    class Broken(_Job):
+        def result(self):
+            raise RuntimeError("lost")
+
+    monitor = JobMonitor(quiet=True, initial=0.01, maximum=0.02)
+    futures = [monitor.watch(Broken(release), callback=lambda job: 1 / 0), monitor.watch(_Job(release))]
+    release.set()
+    assert monitor.wait(3)
+    assert isinstance(futures[0].exception(0), RuntimeError)
+    assert futures[1].result(0) == "result"
+    monitor.close()
@@ -0,0 +1,82 @@
+import random
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import tfidf_index
+from example_headers import CODE_DIR, DOCUMENTS_DIR
+
+QUERIES = ("bind angles before running", "transpile to the backend", "measure all qubits")
+
+
+def _corpus(root):
+    documents, code = root / "docs", root / "code"
+    documents.mkdir()
+    code.mkdir()
+    for name in ("QuantumRingsLib-Reference.md", "Qiskit-Integration-Reference.md"):
+        shutil.copy(DOCUMENTS_DIR / name, documents / name)
+    for path in sorted(CODE_DIR.glob("*.py"))[:4]:
+        shutil.copy(path, code / path.name)
+    return documents, code
+
+
+def _scores(index):
+    """Exact scores per query, keyed by chunk so that chunk order does not matter."""
+    keys = [(index.sources[index.chunk_sources[i]], index.chunk(i)["start"]) for i in range(len(index))]
+    order = np.argsort([f"{doc}:{start:08d}" for doc, start in keys])
+    return [index.scores(query, None)[order] for query in QUERIES]
+
+
+def test_update_matches_a_fresh_build(tmp_path):
+    documents, code = _corpus(tmp_path)
+    tfidf_index.build_index(documents, code, tmp_path / "updated")
+    target = documents / "QuantumRingsLib-Reference.md"
+    target.write_text(target.read_text(encoding="utf-8") + "\n## Binding\nbind angles with a dict\n",
+                      encoding="utf-8")
+    removed = sorted(code.glob("*.py"))[0]
+    removed.unlink()
+    updated = tfidf_index.TfidfIndex.open(tmp_path / "updated", documents, code)
+    fresh = tfidf_index.TfidfIndex.open(tmp_path / "fresh", documents, code)
+    assert len(updated) == len(fresh)
+    assert f"Code/{removed.name}" not in updated.sources
+    for ours, theirs in zip(_scores(updated), _scores(fresh)):
+        np.testing.assert_allclose(ours, theirs, atol=1e-6)
+
+
+def _writer(index_dir, documents, code, seed):
+    rng = random.Random(seed)
+    sources = tfidf_index.source_paths(documents, code)
+    for _ in range(4):
+        if rng.random() < 0.5:
+            tfidf_index.build_index(documents, code, index_dir)
+        else:
+            name = rng.choice(sorted(sources))
+            tfidf_index.update_index(index_dir, {name: sources[name]})
+
+
+def _reader(index_dir, seconds):
+    opened, end = 0, time.monotonic() + seconds
+    while time.monotonic() < end:
+        index = tfidf_index.TfidfIndex(index_dir)
+        assert index.search(QUERIES[0], k=3)
+        assert len(index.chunk_offsets) == len(index) + 1 == len(index.row_scales) + 1
+        index.close()
+        opened += 1
+    return opened
+
+
+def test_concurrent_writers_never_expose_a_partial_index(tmp_path):
+    documents, code = _corpus(tmp_path)
+    index_dir = tmp_path / "index"
+    tfidf_index.build_index(documents, code, index_dir)
+    with ProcessPoolExecutor(8) as pool:
+        writers = [pool.submit(_writer, index_dir, documents, code, seed) for seed in range(4)]
+        readers = [pool.submit(_reader, index_dir, 3) for _ in range(4)]
+        for future in writers:
+            future.result()
+        assert all(future.result() > 0 for future in readers)
+    generations = [p.name for p in index_dir.iterdir() if p.name.startswith("gen-")]
+    assert len(generations) == 1 and not generations[0].endswith(".tmp")
+    assert tfidf_index.TfidfIndex(index_dir).search(QUERIES[0], k=3)
@@ -0,0 +1,421 @@
+"""
+Character n-gram TF-IDF similarity search over Documents/*.md chunks and Code/*.py, memory-mapped.
+
+BM25 (bm25_index.py) only matches whole words, so "binding angles" never
+reaches a section that says "bind" and "angle". This index scores cosine
+similarity between sparse TF-IDF vectors of character 3-5-grams, taken
+inside word boundaries. Underscores split identifiers, so ``assign_parameters``
+shares grams with "assign" and "parameter". N-grams are hashed (CRC32) into ``N_FEATURES``
+columns, so no vocabulary is stored and adding text never renumbers
+anything. N-grams found in more than ``MAX_DF`` of the chunks carry no
+signal and are dropped.
+
+Each write produces a new generation directory in ``Tools/.cache/tfidf``
+(see index_store.py), so workers can open the index while another process
+updates it. Files of a generation (every array is a plain ``.npy`` opened with ``mmap_mode="r"``,
+so opening the index in a worker costs milliseconds):
+
+    meta.json                 settings and per-source (size, mtime, sha256)
+    chunks.bin, chunk_offsets JSON chunk records, decoded only for the hits returned
+    chunk_sources             source number of every chunk (for ``docs=`` filters and updates)
+    rows_indptr/indices/tf    chunk-major CSR of raw n-gram counts (the source of truth)
+    df                        document frequency per hashed feature
+    row_scales                per chunk, its log-tf norm over its TF-IDF norm
+    cols_indptr/rows/weights  feature-major CSR of log-tf weights, L2-normalized per chunk, heaviest first
+
+A chunk's TF-IDF weight for a feature is its posting weight times the
+feature's idf times its row scale. The idf is applied to the query and the
+row scale to the summed scores, so the postings never depend on the rest of
+the corpus. A query is hashed the same way, and only the postings of its
+own features are read. Each feature's postings are sorted by weight, so by
+default a query reads just the ``DEPTH`` heaviest of each. Those chunks
+account for nearly all of the cosine, and the cost per query stays bounded
+at tens of thousands of chunks. ``depth=None`` scores exactly.
+
+When a source file changes, only that file is re-chunked and re-counted.
+Its new postings are merged into the stored ones, which keep their order,
+and df and the row scales are recomputed from the stored counts; nothing
+is sorted again but the changed file's postings. With 18k chunks a full
+build takes about 10 s and a one-file update about 1 s, mostly array
+copies and sums over the stored counts.
+
+Usage:
+    python Tools/tfidf_index.py "how do I bind angles" -k 5
+    from tfidf_index import TfidfIndex
+    index = TfidfIndex.open(); index.search("bind angles", k=5)
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+import zlib
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+import index_store
+from doc_chunks import Chunk, chunk_file, document_paths
+from example_headers import CODE_DIR, DOCUMENTS_DIR, REPO_ROOT, example_paths
+
+INDEX_DIR = REPO_ROOT / "Tools" / ".cache" / "tfidf"
+INDEX_VERSION = 2
+N_FEATURES = 1 << 18
+NGRAMS = (3, 5)
+MAX_DF = 0.5
+DEPTH = 1024
+ARRAYS = ("chunk_offsets", "chunk_sources", "rows_indptr", "rows_indices", "rows_tf", "df", "row_scales",
+          "cols_indptr", "cols_rows", "cols_weights")
+
+_WORD = re.compile(r"[a-z0-9]+")
+_GRAMS = {}
+
+
+def _word_features(word):
+    features = _GRAMS.get(word)
+    if features is None:
+        padded = f" {word} ".encode("utf-8")
+        low, high = NGRAMS
+        features = tuple(zlib.crc32(padded[i:i + n]) % N_FEATURES
+                         for n in range(low, high + 1) for i in range(len(padded) - n + 1))
+        if len(_GRAMS) < 1 << 16:
+            _GRAMS[word] = features
+    return features
+
+
+def features(text):
+    """Hashed character n-gram counts of ``text`` as ``Counter({feature: count})``."""
+    counts = Counter()
+    for word in _WORD.findall(text.lower()):
+        counts.update(_word_features(word))
+    return counts
+
+
+# ----------------------------------------------------------------- sources
+
+def source_paths(documents_dir=DOCUMENTS_DIR, code_dir=CODE_DIR):
+    """``{source name: path}``; documents keep their file name, examples are ``Code/<name>``."""
+    sources = {path.name: path for path in document_paths(documents_dir)}
+    sources.update({f"Code/{path.name}": path for path in example_paths(code_dir)})
+    return sources
+
+
+def source_chunks(name, path):
+    if not name.startswith("Code/"):
+        return chunk_file(path)
+    text = Path(path).read_text(encoding="utf-8")
+    return [Chunk(name, path.name, (path.name,), 0, 1, text.count("\n") + 1, text)]
+
+
+def _stamp(path):
+    stat = Path(path).stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _digest(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+# ----------------------------------------------------------------- writing
+
+def _count(chunks):
+    """Encoded chunk records plus the chunk-major count arrays for ``chunks``."""
+    records, lengths, indices, tf = [], [], [], []
+    for chunk in chunks:
+        counts = features(chunk.heading + "\n" + chunk.text)
+        records.append(json.dumps(chunk.to_dict(), separators=(",", ":")).encode("utf-8"))
+        lengths.append(len(counts))
+        indices.extend(counts.keys())
+        tf.extend(counts.values())
+    return records, np.array(lengths, dtype=np.int64), np.array(indices, dtype=np.int32), \
+        np.array(tf, dtype=np.float32)
+
+
+def _log_tf(tf):
+    return (1.0 + np.log(np.maximum(tf, 1.0))).astype(np.float32)
+
+
+def _postings(indptr, indices, tf, first_row=0):
+    """
+    ``(features, rows, weights)`` of chunk-major counts, sorted by feature and
+    heaviest first within a feature; rows are numbered from ``first_row``.
+    """
+    n_rows = len(indptr) - 1
+    rows = np.repeat(np.arange(n_rows, dtype=np.int32), np.diff(indptr))
+    weights = _log_tf(tf)
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n_rows)).astype(np.float32)
+    weights /= np.maximum(norms, 1e-12)[rows]
+    order = np.lexsort((-weights, indices))
+    return indices[order], rows[order] + np.int32(first_row), weights[order]
+
+
+def _merge(old, new):
+    """``old`` and ``new`` postings as one list in :func:`_postings` order; ``old`` keeps its order."""
+    # Weights lie in (0, 1], so feature + (1 - weight) / 2 orders by feature, then heaviest first.
+    keys = [features + (1.0 - weights.astype(np.float64)) / 2 for features, _, weights in (old, new)]
+    at = np.searchsorted(keys[0], keys[1], side="right")
+    return tuple(np.insert(a, at, b) for a, b in zip(old, new))
+
+
+def _scales(indptr, indices, tf):
+    """df, and per chunk the factor that turns its posting weights into normalized TF-IDF weights."""
+    n_rows = len(indptr) - 1
+    df = np.bincount(indices, minlength=N_FEATURES).astype(np.int32)
+    idf = (np.log((1.0 + n_rows) / (1.0 + df)) + 1.0).astype(np.float32)
+    idf[df > max(MAX_DF * n_rows, 1)] = 0.0
+    rows = np.repeat(np.arange(n_rows, dtype=np.int32), np.diff(indptr))
+    weights = _log_tf(tf)
+    plain = np.bincount(rows, weights=weights * weights, minlength=n_rows)
+    weighted = np.bincount(rows, weights=(weights * idf[indices]) ** 2, minlength=n_rows)
+    scales = np.sqrt(plain / np.maximum(weighted, 1e-24))
+    scales[weighted == 0] = 0.0
+    return df, scales.astype(np.float32)
+
+
+def _write(index_dir, meta, encoded, docs, rows_indptr, rows_indices, rows_tf, postings):
+    """
+    Write a new generation and make it current; the caller holds
+    ``index_store.writer_lock``. ``encoded`` are the JSON chunk records,
+    ``docs`` their source names and ``postings`` as from :func:`_postings`.
+    """
+    chunk_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=chunk_offsets[1:])
+    numbers = {name: i for i, name in enumerate(meta["sources"])}
+    chunk_sources = np.array([numbers[doc] for doc in docs], dtype=np.int32)
+    df, row_scales = _scales(rows_indptr, rows_indices, rows_tf)
+    columns, cols_rows, cols_weights = postings
+    cols_indptr = np.zeros(N_FEATURES + 1, dtype=np.int64)
+    np.cumsum(np.bincount(columns, minlength=N_FEATURES), out=cols_indptr[1:])
+    arrays = dict(chunk_offsets=chunk_offsets, chunk_sources=chunk_sources, rows_indptr=rows_indptr,
+                  rows_indices=rows_indices, rows_tf=rows_tf, df=df, row_scales=row_scales, cols_indptr=cols_indptr,
+                  cols_rows=cols_rows, cols_weights=cols_weights)
+
+    def write(directory):
+        (directory / "chunks.bin").write_bytes(b"".join(encoded))
+        for array in ARRAYS:
+            np.save(directory / f"{array}.npy", arrays[array])
+        (directory / "meta.json").write_text(json.dumps(meta, separators=(",", ":")), encoding="utf-8")
+
+    # The files of the single-directory layout of older versions go too.
+    index_store.publish(index_dir, write, ["meta.json", "chunks.bin"] + [f"{array}.npy" for array in ARRAYS])
+    return meta
+
+
+def build_index(documents_dir=DOCUMENTS_DIR, code_dir=CODE_DIR, index_dir=INDEX_DIR):
+    """Chunk and count every source and write a fresh index."""
+    with index_store.writer_lock(index_dir):
+        return _build(documents_dir, code_dir, index_dir)
+
+
+def _build(documents_dir, code_dir, index_dir):
+    chunks, sources = [], {}
+    for name, path in source_paths(documents_dir, code_dir).items():
+        chunks.extend(source_chunks(name, path))
+        sources[name] = _stamp(path) + [_digest(path)]
+    records, lengths, indices, tf = _count(chunks)
+    indptr = np.zeros(len(records) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    meta = {"version": INDEX_VERSION, "n_features": N_FEATURES, "ngrams": list(NGRAMS), "max_df": MAX_DF,
+            "sources": sources}
+    docs = [chunk.doc for chunk in chunks]
+    return _write(index_dir, meta, records, docs, indptr, indices, tf, _postings(indptr, indices, tf))
+
+
+def update_index(index_dir=INDEX_DIR, changed=None, removed=()):
+    """
+    Replace the chunks of the ``changed`` sources (``{name: path}``) and drop
+    the ``removed`` ones; chunks of every other source keep their stored
+    counts and postings and are not read again.
+    """
+    with index_store.writer_lock(index_dir):
+        return _update(index_dir, changed, removed)
+
+
+def _update(index_dir, changed, removed):
+    index = TfidfIndex(index_dir)
+    changed = dict(changed or {})
+    replaced = set(changed) | set(removed)
+    numbers = [i for i, name in enumerate(index.meta["sources"]) if name in replaced]
+    keep = ~np.isin(index.chunk_sources, numbers)
+    kept = np.flatnonzero(keep)
+    lengths = np.diff(index.rows_indptr)
+    nnz_keep = np.repeat(keep, lengths)
+    offsets = index.chunk_offsets
+    records = [index._records[offsets[i]:offsets[i + 1]] for i in kept.tolist()]
+    docs = [index.sources[number] for number in index.chunk_sources[kept].tolist()]
+    # Stored postings of kept chunks stay in order; only their row numbers close up.
+    renumber = (np.cumsum(keep) - 1).astype(np.int32)
+    stored = keep[index.cols_rows]
+    columns = np.repeat(np.arange(N_FEATURES, dtype=np.int32), np.diff(index.cols_indptr))
+    old = columns[stored], renumber[index.cols_rows[stored]], index.cols_weights[stored]
+    sources = {name: stamp for name, stamp in index.meta["sources"].items() if name not in replaced}
+    new_chunks = []
+    for name, path in changed.items():
+        new_chunks.extend(source_chunks(name, path))
+        sources[name] = _stamp(path) + [_digest(path)]
+    new_records, new_lengths, new_indices, new_tf = _count(new_chunks)
+    new_indptr = np.zeros(len(new_lengths) + 1, dtype=np.int64)
+    np.cumsum(new_lengths, out=new_indptr[1:])
+    postings = _merge(old, _postings(new_indptr, new_indices, new_tf, first_row=len(kept)))
+    lengths = np.concatenate([lengths[keep], new_lengths])
+    indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    indices = np.concatenate([index.rows_indices[nnz_keep], new_indices])
+    tf = np.concatenate([index.rows_tf[nnz_keep], new_tf])
+    meta = dict(index.meta, sources=sources)
+    result = _write(index_dir, meta, records + new_records, docs + [chunk.doc for chunk in new_chunks], indptr,
+                    indices, tf, postings)
+    index.close()
+    return result
+
+
+def _changes(meta, documents_dir, code_dir):
+    """``(changed {name: path}, removed [name])`` between the index and the files on disk."""
+    current = source_paths(documents_dir, code_dir)
+    stored = meta["sources"]
+    changed = {}
+    for name, path in current.items():
+        entry = stored.get(name)
+        if entry is None or (entry[:2] != _stamp(path) and entry[2] != _digest(path)):
+            changed[name] = path
+    return changed, [name for name in stored if name not in current]
+
+
+# ----------------------------------------------------------------- reading
+
+class TfidfIndex:
+    """Read-only, memory-mapped view of an on-disk index; cheap to open in every worker."""
+
+    def __init__(self, index_dir=INDEX_DIR):
+        index_store.read(index_dir, self._load)
+
+    def _load(self, directory):
+        meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("version") != INDEX_VERSION or meta.get("n_features") != N_FEATURES or \
+                meta.get("ngrams") != list(NGRAMS):
+            raise ValueError(f"{directory} was built with different index settings")
+        self.directory = directory
+        self.meta = meta
+        self.sources = list(meta["sources"])
+        for name in ARRAYS:
+            # Plain ndarray views of the mapping: slicing an np.memmap costs several times more per call.
+            setattr(self, name, np.asarray(np.load(directory / f"{name}.npy", mmap_mode="r")))
+        with open(directory / "chunks.bin", "rb") as handle:
+            self._records = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) \
+                if os.fstat(handle.fileno()).st_size else b""
+
+    @classmethod
+    def open(cls, index_dir=INDEX_DIR, documents_dir=DOCUMENTS_DIR, code_dir=CODE_DIR, update_if_stale=True):
+        """Open the index, building it if missing and updating just the changed sources if stale."""
+        try:
+            meta = json.loads((index_store.current(index_dir) / "meta.json").read_text(encoding="utf-8"))
+            if meta.get("version") != INDEX_VERSION or meta.get("n_features") != N_FEATURES:
+                raise ValueError("index settings changed")
+        except (OSError, ValueError):
+            build_index(documents_dir, code_dir, index_dir)
+            return cls(index_dir)
+        if update_if_stale:
+            changed, removed = _changes(meta, documents_dir, code_dir)
+            if changed or removed:
+                update_index(index_dir, changed, removed)
+        return cls(index_dir)
+
+    def __len__(self):
+        return len(self.chunk_sources)
+
+    def chunk(self, chunk_id):
+        """The record of one chunk (``doc``, ``heading``, ``path``, ``start``, ``end``, ...)."""
+        start, end = self.chunk_offsets[chunk_id], self.chunk_offsets[chunk_id + 1]
+        return json.loads(self._records[start:end])
+
+    def query_vector(self, query):
+        """``(features, weights)`` of the normalized query; features too common to score are left out."""
+        counts = features(query)
+        if not counts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        weights = ((1.0 + np.log(tf)) * self.idf(ids)).astype(np.float32)
+        norm = float(np.sqrt(weights @ weights))
+        keep = weights > 0
+        return ids[keep], weights[keep] / (norm or 1.0)
+
+    def idf(self, ids):
+        """Inverse document frequency of the features ``ids``; 0 for unseen and too common ones."""
+        n_rows = len(self)
+        df = self.df[ids]
+        idf = np.log((1.0 + n_rows) / (1.0 + df)) + 1.0
+        idf[(df == 0) | (df > max(MAX_DF * n_rows, 1))] = 0.0
+        return idf
+
+    def scores(self, query, depth=DEPTH):
+        """
+        Cosine similarity of ``query`` to every chunk, as a dense ``float32``
+        array, from the ``depth`` heaviest postings of each query feature
+        (``None``: all of them).
+        """
+        ids, weights = self.query_vector(query)
+        weights = weights * self.idf(ids)
+        starts = self.cols_indptr[ids]
+        ends = self.cols_indptr[ids + 1]
+        if depth is not None:
+            ends = np.minimum(ends, starts + depth)
+        scores = np.zeros(len(self), dtype=np.float32)
+        for start, end, weight in zip(starts.tolist(), ends.tolist(), weights.tolist()):
+            # A chunk appears at most once per feature, so the fancy += cannot drop duplicates.
+            scores[self.cols_rows[start:end]] += self.cols_weights[start:end] * weight
+        scores *= self.row_scales
+        return scores
+
+    def search(self, query, k=5, docs=None, depth=DEPTH):
+        """
+        Top-``k`` chunks for ``query`` as ``(score, chunk id, chunk record)``
+        tuples, best first, like ``BM25Index.search``. ``docs`` restricts
+        results to the given source names (``"Code/<name>"`` for examples);
+        those are scored exactly, since their chunks may sit deep in the postings.
+        """
+        scores = self.scores(query, None if docs is not None else depth)
+        if docs is not None:
+            numbers = [i for i, name in enumerate(self.sources) if name in set(docs)]
+            scores[~np.isin(self.chunk_sources, numbers)] = 0.0
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(float(scores[i]), int(i), self.chunk(i)) for i in top if scores[i] > 0]
+
+    def close(self):
+        if isinstance(self._records, mmap.mmap):
+            self._records.close()
+        for name in ARRAYS:
+            setattr(self, name, None)  # the mappings are released with the last view
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("query", nargs="?")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--documents", type=Path, default=DOCUMENTS_DIR)
+    parser.add_argument("--code", type=Path, default=CODE_DIR)
+    parser.add_argument("--index", type=Path, default=INDEX_DIR)
+    parser.add_argument("--build", action="store_true", help="only (re)build the index from scratch")
+    args = parser.parse_args(argv)
+
+    if args.build or not args.query:
+        meta = build_index(args.documents, args.code, args.index)
+        print(f"indexed {len(TfidfIndex(args.index))} chunks from {len(meta['sources'])} sources into {args.index}")
+        return 0
+
+    index = TfidfIndex.open(args.index, args.documents, args.code)
+    for score, chunk_id, chunk in index.search(args.query, args.k):
+        print(f"{score:6.3f}  {chunk['doc']}  {' > '.join(chunk['path'])}  (lines {chunk['start']}-{chunk['end']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Transpile a parameterized Qiskit circuit once and bind new values into the result.
+
+quantumrings-toolkit-qiskit-qaoa.py binds (beta, gamma) and then transpiles,
+so an optimizer loop pays for a full ``transpile()`` at every point although
+only the angles change. ``TranspileCache`` transpiles the *unbound* circuit
+once per structure and backend, and binds each point into that cached
+circuit. Binding only substitutes angles, so the result has the layout and
+unitary that bind-then-transpile produces and gives the same counts; only
+the gate list can differ, where transpile would have folded rotations whose
+angles became constants.
+
+Circuits are keyed by a structural fingerprint: registers, the operation
+sequence with its wiring, parameter names and literal angles, the backend
+(name, size, target operations) and the transpile options. Rebuilding the
+same ansatz with fresh ``Parameter`` objects therefore hits the cache. The
+in-memory cache is LRU-bounded. With ``directory`` set, transpiled circuits
+are also stored there as QPY so later runs start warm. If the backend cannot
+transpile the unbound circuit, that structure falls back to bind-then-transpile.
+
+Usage:
+    from transpile_cache import CACHE_DIR, TranspileCache
+    cache = TranspileCache(directory=CACHE_DIR, optimization_level=1)
+    for point in points:
+        job = backend.run(cache.bind(qc, backend, point), shots=1024)
+"""
+
+import collections
+import hashlib
+import os
+import threading
+import warnings
+from pathlib import Path
+
+import numpy as np
+from qiskit import qpy, transpile
+from qiskit.circuit import ParameterExpression
+from qiskit.circuit.library import get_standard_gate_name_mapping
+
+TOOLS_DIR = Path(__file__).resolve().parent
+CACHE_DIR = TOOLS_DIR / ".cache" / "transpile"
+MAXSIZE = 128
+
+CacheInfo = collections.namedtuple("CacheInfo", "hits disk_hits misses maxsize currsize")
+
+_STANDARD_GATES = set(get_standard_gate_name_mapping())
+
+
+def _param(value):
+    if isinstance(value, ParameterExpression):
+        # ParameterExpression.__str__ goes through sympy's printer, which is
+        # ~50x slower than printing the underlying symengine expression.
+        return "expr", str(getattr(value, "_symbol_expr", value))
+    if isinstance(value, np.ndarray):
+        return "array", hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+    return "value", repr(value)
+
+
+def _condition(circuit, operation):
+    with warnings.catch_warnings():
+        # Instruction.condition is deprecated in Qiskit 1.3+, but c_if circuits still carry it.
+        warnings.simplefilter("ignore", DeprecationWarning)
+        condition = getattr(operation, "condition", None)
+    if condition is None:
+        return None
+    target, value = condition
+    bits = list(target) if hasattr(target, "size") else [target]
+    return tuple(circuit.find_bit(b).index for b in bits), int(value)
+
+
+def _feed_circuit(circuit, feed):
+    feed("circuit", circuit.num_qubits, circuit.num_clbits,
+         [(r.name, r.size) for r in circuit.qregs], [(r.name, r.size) for r in circuit.cregs],
+         _param(circuit.global_phase))
+    for item in circuit.data:
+        operation = item.operation
+        feed(operation.name, operation.num_qubits, operation.num_clbits,
+             [circuit.find_bit(q).index for q in item.qubits],
+             [circuit.find_bit(c).index for c in item.clbits],
+             [_param(p) for p in operation.params], _condition(circuit, operation))
+        # A custom gate is only known by its definition.
+        if operation.name not in _STANDARD_GATES and getattr(operation, "definition", None) is not None:
+            _feed_circuit(operation.definition, feed)
+            feed("end")
+
+
+def fingerprint(circuit, backend, options=None):
+    """Hex key for ``circuit`` transpiled for ``backend`` with ``options``."""
+    digest = hashlib.sha256()
+
+    def feed(*parts):
+        digest.update(repr(parts).encode())
+
+    target = getattr(backend, "target", None)
+    feed("backend", getattr(backend, "name", type(backend).__name__), getattr(backend, "num_qubits", None),
+         sorted(target.operation_names) if target is not None else None)
+    feed("options", sorted((key, repr(value)) for key, value in (options or {}).items()))
+    _feed_circuit(circuit, feed)
+    return digest.hexdigest()
+
+
+def _values_by_name(circuit, values):
+    if isinstance(values, dict):
+        return {getattr(key, "name", key): float(value) for key, value in values.items()}
+    values = list(values)
+    parameters = list(circuit.parameters)
+    if len(values) != len(parameters):
+        raise ValueError(f"circuit has {len(parameters)} parameters, got {len(values)} values")
+    return {p.name: float(v) for p, v in zip(parameters, values)}
+
+
+class TranspileCache:
+    """
+    LRU cache of transpiled unbound circuits. ``transpile_options`` (such as
+    ``optimization_level`` or ``initial_layout``) are passed to every
+    ``transpile()`` call and are part of the key.
+    """
+
+    def __init__(self, maxsize=MAXSIZE, directory=None, **transpile_options):
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory is not None else None
+        self.transpile_options = transpile_options
+        self._entries = collections.OrderedDict()
+        self._unbindable = set()
+        self._lock = threading.Lock()
+        self._hits = self._disk_hits = self._misses = 0
+
+    def transpiled(self, circuit, backend):
+        """The transpiled, still unbound circuit for ``circuit`` on ``backend``."""
+        return self._transpiled(circuit, backend, fingerprint(circuit, backend, self.transpile_options))
+
+    def _transpiled(self, circuit, backend, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+        result = self._load(key)
+        if result is not None:
+            self._disk_hits += 1
+        else:
+            self._misses += 1
+            result = transpile(circuit, backend, **self.transpile_options)
+            self._store(key, result)
+        with self._lock:
+            self._entries[key] = result
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def bind(self, circuit, backend, values):
+        """
+        ``circuit`` with ``values`` bound, transpiled for ``backend``.
+        ``values`` is a ``{Parameter or name: value}`` dict or a sequence in
+        ``circuit.parameters`` order, as for ``assign_parameters``.
+        """
+        values = _values_by_name(circuit, values)
+        missing = sorted(p.name for p in circuit.parameters if p.name not in values)
+        if missing:
+            raise ValueError(f"no values given for parameter(s) {missing}")
+        key = fingerprint(circuit, backend, self.transpile_options)
+        if key not in self._unbindable:
+            try:
+                transpiled = self._transpiled(circuit, backend, key)
+            except Exception:
+                # Some backends refuse unbound gates (the QAOA example's rzz
+                # warning); keep this structure on bind-then-transpile.
+                self._unbindable.add(key)
+            else:
+                return transpiled.assign_parameters({p: values[p.name] for p in transpiled.parameters})
+        bound = circuit.assign_parameters({p: values[p.name] for p in circuit.parameters})
+        return transpile(bound, backend, **self.transpile_options)
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._disk_hits, self._misses, self.maxsize, len(self._entries))
+
+    def clear(self):
+        """Empty the in-memory cache (files in ``directory`` are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._unbindable.clear()
+            self._hits = self._disk_hits = self._misses = 0
+
+    def _path(self, key):
+        return self.directory / f"{key}.qpy"
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), "rb") as handle:
+                return qpy.load(handle)[0]
+        except Exception:
+            # Missing, unreadable or written by an incompatible Qiskit: transpile again.
+            return None
+
+    def _store(self, key, circuit):
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as handle:
+            qpy.dump(circuit, handle)
+        os.replace(tmp, path)
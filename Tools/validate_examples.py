@@ -0,0 +1,302 @@
+"""
+Run every Code/*.py example and record which ones pass in this environment.
+
+Each script runs in its own interpreter, one worker per core, with a
+timeout and captured stdout/stderr. Results are cached under Tools/.cache/
+keyed by the script's content hash and the environment (SDK versions,
+Python, OS), so unchanged scripts are not run again. The outcome is written
+as a JSON compatibility matrix; with ``--write-markers`` the (+)/(!) markers
+in the example headers are refreshed from it.
+
+By default the scripts run against the offline SDK (Tools/offline_sdk), which
+checks the examples' own logic in seconds without an account. ``--sdk
+installed`` uses whatever QuantumRingsLib/toolkit is installed; only those
+runs may update the header markers.
+
+Usage:
+    python Tools/validate_examples.py [--sdk offline|installed] [--jobs N] [--timeout 60] [--write-markers]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from example_headers import CODE_DIR, REPO_ROOT, example_paths, set_marker
+
+TOOLS_DIR = Path(__file__).resolve().parent
+CACHE_PATH = TOOLS_DIR / ".cache" / "validation.json"
+MATRIX_PATH = TOOLS_DIR / ".cache" / "compatibility.json"
+OFFLINE_SDK_DIR = TOOLS_DIR / "offline_sdk"
+CACHE_VERSION = 2
+TIMEOUT = 60
+OUTPUT_TAIL = 4000
+
+# Header package name -> (import name, distribution name).
+PACKAGES = {
+    "QuantumRingsLib": ("QuantumRingsLib", "QuantumRingsLib"),
+    "quantumrings-toolkit-qiskit": ("quantumrings.toolkit.qiskit", "quantumrings-toolkit-qiskit"),
+    "Qiskit": ("qiskit", "qiskit"),
+}
+# Header packages whose markers a run may update: the SDK under test, not Qiskit, Python or the OS,
+# which an example's result says nothing about.
+SDK_PACKAGES = ("QuantumRingsLib", "quantumrings-toolkit-qiskit")
+STATUS_MARKERS = {"passed": "tested", "failed": "fails"}
+
+_PROBE = """
+import importlib, importlib.metadata, json
+packages = {}
+for key, (module, dist) in %r.items():
+    try:
+        mod = importlib.import_module(module)
+    except Exception:
+        continue
+    version = next((v for v in (getattr(mod, "version", None), getattr(mod, "__version__", None))
+                    if isinstance(v, str)), None)
+    if version is None:
+        try:
+            version = importlib.metadata.version(dist)
+        except importlib.metadata.PackageNotFoundError:
+            continue
+    packages[key] = version
+print(json.dumps(packages))
+"""
+_MISSING_MODULE = re.compile(r"ModuleNotFoundError: No module named '([\w.]+)'")
+_MISSING_FILE = re.compile(r"FileNotFoundError: \[Errno 2\] No such file or directory: '([^']+)'")
+
+
+def os_label():
+    """``Ubuntu 22.04`` / ``Windows 11`` style name used in the headers' ``os:`` lists."""
+    if sys.platform.startswith("linux"):
+        try:
+            info = dict(line.split("=", 1) for line in Path("/etc/os-release").read_text().splitlines() if "=" in line)
+            return f"{info['NAME'].strip(chr(34))} {info['VERSION_ID'].strip(chr(34))}"
+        except (OSError, KeyError):
+            return "Linux"
+    if sys.platform == "win32":
+        return f"Windows {platform.release()}"
+    if sys.platform == "darwin":
+        return f"macOS {platform.mac_ver()[0]}"
+    return platform.system()
+
+
+def command(script, sdk):
+    if sdk == "offline":
+        return [sys.executable, "-m", "offline_sdk", str(script)]
+    return [sys.executable, str(script)]
+
+
+def child_env(sdk):
+    env = dict(os.environ, MPLBACKEND="Agg", PYTHONIOENCODING="utf-8", PYTHONDONTWRITEBYTECODE="1")
+    if sdk == "offline":
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(TOOLS_DIR), env.get("PYTHONPATH")]))
+    return env
+
+
+def probe_environment(sdk):
+    """Versions of the SDK packages as the example scripts will see them."""
+    probe = _PROBE % (PACKAGES,)
+    if sdk == "offline":
+        probe = "import offline_sdk; offline_sdk.install()\n" + probe
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True,
+                         env=child_env(sdk), check=True).stdout
+    environment = {
+        "sdk": sdk,
+        "python": f"{sys.version_info.major}.{sys.version_info.minor}",
+        "os": os_label(),
+        "packages": json.loads(out),
+    }
+    if sdk == "offline":
+        digest = hashlib.sha256()
+        for path in sorted(OFFLINE_SDK_DIR.glob("*.py")):
+            digest.update(path.read_bytes())
+        environment["offline_sdk"] = digest.hexdigest()[:16]
+    return environment
+
+
+def cache_key(source_hash, environment):
+    blob = json.dumps(environment, sort_keys=True).encode() + source_hash.encode()
+    return hashlib.sha256(blob).hexdigest()
+
+
+def imported_packages(source):
+    """Header package names the script imports."""
+    used = []
+    for key, (module, _) in PACKAGES.items():
+        root = re.escape(module.split(".")[0] if key == "Qiskit" else module)
+        if re.search(rf"^\s*(?:from|import)\s+{root}\b", source, re.M):
+            used.append(key)
+    return used
+
+
+def _text(output):
+    # TimeoutExpired carries raw bytes even when text=True was requested.
+    if isinstance(output, bytes):
+        return output.decode("utf-8", "replace")
+    return output or ""
+
+
+def run_example(path, sdk, timeout):
+    started = time.perf_counter()
+    try:
+        proc = subprocess.run(command(path.name, sdk), cwd=path.parent, env=child_env(sdk),
+                              capture_output=True, text=True, encoding="utf-8", errors="replace",
+                              timeout=timeout)
+    except subprocess.TimeoutExpired as exc:
+        return {
+            "status": "timeout",
+            "returncode": None,
+            "duration": round(time.perf_counter() - started, 3),
+            "stdout": _text(exc.stdout)[-OUTPUT_TAIL:],
+            "stderr": f"timed out after {timeout}s",
+        }
+    status = "passed" if proc.returncode == 0 else "failed"
+    reason = None
+    if status == "failed":
+        lines = proc.stderr.strip().splitlines()
+        module = _MISSING_MODULE.search(proc.stderr)
+        fixture = _MISSING_FILE.fullmatch(lines[-1]) if lines else None
+        if module and module.group(1).split(".")[0] not in ("QuantumRingsLib", "quantumrings"):
+            # An optional helper (matplotlib, ...) is not installed: says nothing about the SDK.
+            status, reason = "skipped", f"module {module.group(1)} is not installed"
+        elif fixture and not os.path.isabs(fixture.group(1)):
+            # A data file the example expects next to it (test.qasm, ...) that the repository does not ship.
+            status, reason = "skipped", f"fixture {fixture.group(1)} is missing"
+    return {
+        "status": status,
+        "reason": reason,
+        "returncode": proc.returncode,
+        "duration": round(time.perf_counter() - started, 3),
+        "stdout": proc.stdout[-OUTPUT_TAIL:],
+        "stderr": proc.stderr[-OUTPUT_TAIL:],
+    }
+
+
+def load_cache(path):
+    try:
+        cache = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache.get("results", {}) if cache.get("version") == CACHE_VERSION else {}
+
+
+def write_json(path, data):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def validate(paths, sdk="offline", jobs=None, timeout=TIMEOUT, cache_path=CACHE_PATH, force=False):
+    """
+    Run ``paths`` and return ``(environment, results)`` where ``results`` maps
+    script name -> result dict (``status`` is passed/failed/skipped/timeout,
+    ``cached`` tells whether it was reused).
+    """
+    environment = probe_environment(sdk)
+    cache = {} if force else load_cache(cache_path)
+    results, pending = {}, []
+    for path in paths:
+        source = path.read_bytes()
+        key = cache_key(hashlib.sha256(source).hexdigest(), environment)
+        hit = cache.get(path.name)
+        if hit is not None and hit.get("key") == key:
+            results[path.name] = dict(hit, cached=True)
+        else:
+            pending.append((path, key))
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        # Each worker thread supervises one child interpreter at a time, so
+        # this is a process pool with hard per-script timeouts.
+        futures = {pool.submit(run_example, path, sdk, timeout): (path, key) for path, key in pending}
+        for future, (path, key) in futures.items():
+            results[path.name] = dict(future.result(), key=key, cached=False)
+
+    keep = {name: result for name, result in results.items() if result["status"] != "timeout"}
+    cache.update({name: {k: v for k, v in r.items() if k != "cached"} for name, r in keep.items()})
+    write_json(cache_path, {"version": CACHE_VERSION, "results": cache})
+    return environment, results
+
+
+def compatibility_matrix(environment, results, paths):
+    examples = {}
+    for path in paths:
+        result = results[path.name]
+        examples[path.name] = {
+            "status": result["status"],
+            "duration": result["duration"],
+            "cached": result["cached"],
+            "packages": imported_packages(path.read_text(encoding="utf-8")),
+        }
+    return {"environment": environment, "examples": examples}
+
+
+def write_markers(environment, results, paths):
+    """
+    Refresh the markers of the SDK packages each passed/failed script
+    imports; returns the files changed. Skipped scripts and timeouts are left
+    alone.
+    """
+    changed = []
+    for path in paths:
+        status = STATUS_MARKERS.get(results[path.name]["status"])
+        if status is None:
+            continue
+        text = original = path.read_text(encoding="utf-8")
+        for package in imported_packages(text):
+            if package in SDK_PACKAGES and package in environment["packages"]:
+                text = set_marker(text, package, environment["packages"][package], status)
+        if text != original:
+            path.write_text(text, encoding="utf-8")
+            changed.append(path)
+    return changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scripts", nargs="*", type=Path, help="examples to run (default: all of Code/)")
+    parser.add_argument("--sdk", choices=("offline", "installed"), default="offline")
+    parser.add_argument("--jobs", type=int, default=None, help="parallel scripts (default: one per core)")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds per script")
+    parser.add_argument("--force", action="store_true", help="ignore cached results")
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH)
+    parser.add_argument("--matrix", type=Path, default=MATRIX_PATH, help="where to write the JSON matrix")
+    parser.add_argument("--write-markers", action="store_true", help="update the (+)/(!) markers in the headers")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print stderr of failing scripts")
+    args = parser.parse_args(argv)
+
+    if args.write_markers and args.sdk == "offline":
+        parser.error("--write-markers records results for the real SDK; use it with --sdk installed")
+    paths = [p.resolve() for p in args.scripts] or example_paths(CODE_DIR)
+    started = time.perf_counter()
+    environment, results = validate(paths, args.sdk, args.jobs, args.timeout, args.cache, args.force)
+
+    for path in paths:
+        result = results[path.name]
+        note = " (cached)" if result["cached"] else ""
+        if result.get("reason"):
+            note += f" ({result['reason']})"
+        print(f"{result['status']:8} {result['duration']:7.2f}s  {path.name}{note}")
+        if args.verbose and result["status"] in ("failed", "timeout"):
+            for line in result["stderr"].strip().splitlines()[-5:]:
+                print(f"           {line}")
+    write_json(args.matrix, compatibility_matrix(environment, results, paths))
+    packages = ", ".join(f"{k} {v}" for k, v in environment["packages"].items())
+    print(f"{len(paths)} examples in {time.perf_counter() - started:.1f}s on {environment['os']}, "
+          f"Python {environment['python']} ({args.sdk}: {packages}); matrix written to {args.matrix}")
+    if args.write_markers:
+        for path in write_markers(environment, results, paths):
+            print(f"updated markers in {path.relative_to(REPO_ROOT)}")
+    return 1 if any(r["status"] in ("failed", "timeout") for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""
+Batched QAOA/VQE optimization on QrEstimatorV1 or QrEstimatorV2.
+
+quantumrings-toolkit-qiskit-qaoa.py evaluates one random (beta, gamma)
+point. ``VariationalProblem`` wraps an ansatz, an observable and an
+estimator, and turns every optimizer step into a single estimator
+submission.
+
+Gradients use the parameter-shift rule. The ansatz is unrolled to rotation
+gates and each rotation gets its own angle ``a_k(theta)``. That makes the
+rule exact even when one parameter drives several gates (QAOA's gamma, or
+``2 * gamma``):
+
+    dE/dtheta_j = sum_k da_k/dtheta_j * (E(a_k + pi/2) - E(a_k - pi/2)) / 2
+
+The unshifted point and all 2K shifted points are parameter bindings of one
+circuit, so ``energy_and_gradient`` is one ``run()`` call. For a V2 estimator
+that is one PUB. SPSA sends its three points per step as one call as well.
+COBYLA (``scipy.optimize``) is sequential by nature and makes one call per
+evaluation.
+
+Usage:
+    from variational import VariationalProblem
+    problem = VariationalProblem(QrEstimatorV2(backend=backend), ansatz, hamiltonian)
+    result = problem.minimize(x0, method="spsa", maxiter=100)
+    result.x, result.fun, result.history[-1]
+"""
+
+import collections
+import math
+import time
+
+import numpy as np
+from qiskit import transpile
+from qiskit.circuit import ParameterExpression, ParameterVector
+from qiskit.primitives import BaseEstimatorV2
+
+# Rotations whose generator has two eigenvalues one apart, so the two-term
+# shift rule is exact. The ansatz is unrolled to these plus fixed gates.
+SHIFTABLE = ("rx", "ry", "rz", "p", "rxx", "ryy", "rzz", "rzx", "cp")
+BASIS_GATES = SHIFTABLE + ("id", "x", "y", "z", "h", "s", "sdg", "t", "tdg", "sx", "sxdg",
+                           "cx", "cy", "cz", "swap", "ccx")
+METHODS = ("gradient", "spsa", "cobyla")
+
+Iteration = collections.namedtuple("Iteration", "iteration parameters energy gradient_norm evaluations elapsed")
+OptimizationResult = collections.namedtuple("OptimizationResult", "x fun history submissions evaluations")
+
+
+def _unique_angles(circuit):
+    """``circuit`` with every parameterized gate on its own ``ξ[k]``, and the original angle expressions."""
+    angles = []
+    for item in circuit.data:
+        operation = item.operation
+        if operation.is_parameterized():
+            if operation.name not in SHIFTABLE or len(operation.params) != 1:
+                raise ValueError(f"cannot apply the parameter-shift rule to {operation.name}{operation.params}")
+            angles.append(operation.params[0])
+    xi = ParameterVector("ξ", len(angles))
+    out = circuit.copy_empty_like()
+    out.global_phase = 0  # may depend on the parameters; irrelevant to expectation values
+    k = 0
+    for item in circuit.data:
+        operation = item.operation
+        if operation.is_parameterized():
+            operation = operation.copy()
+            operation.params = [xi[k]]
+            k += 1
+        out.append(operation, item.qubits, item.clbits)
+    return out, angles
+
+
+def _float(value):
+    return float(value.real if isinstance(value, complex) else value)
+
+
+class VariationalProblem:
+    """
+    Energy ``<ansatz(theta)|observable|ansatz(theta)>`` on an estimator.
+    ``theta`` follows ``ansatz.parameters`` order. ``submissions`` and
+    ``evaluations`` count estimator calls and parameter points sent.
+    """
+
+    def __init__(self, estimator, ansatz, observable):
+        self.estimator = estimator
+        self.observable = observable
+        self.parameters = list(ansatz.parameters)
+        unrolled = transpile(ansatz.remove_final_measurements(inplace=False),
+                             basis_gates=list(BASIS_GATES), optimization_level=0)
+        self.circuit, self._angles = _unique_angles(unrolled)
+        self._v2 = isinstance(estimator, BaseEstimatorV2)
+        self._affine = self._linearize()
+        self.submissions = 0
+        self.evaluations = 0
+
+    def _linearize(self):
+        # Angles affine in theta (the usual case) become a ``(K, P)`` matrix
+        # and an offset; anything else is bound symbolically per step.
+        index = {p: j for j, p in enumerate(self.parameters)}
+        jacobian = np.zeros((len(self._angles), len(self.parameters)))
+        offset = np.zeros(len(self._angles))
+        for k, angle in enumerate(self._angles):
+            if not isinstance(angle, ParameterExpression):
+                offset[k] = _float(angle)
+                continue
+            for parameter in angle.parameters:
+                derivative = angle.gradient(parameter)
+                if isinstance(derivative, ParameterExpression):
+                    return None
+                jacobian[k, index[parameter]] = _float(derivative)
+            offset[k] = _float(angle.bind({p: 0.0 for p in angle.parameters}))
+        return jacobian, offset
+
+    def angles(self, theta):
+        """``(angles, jacobian)``: every gate angle at ``theta`` and ``d angle_k / d theta_j``."""
+        theta = np.asarray(theta, dtype=float)
+        if self._affine is not None:
+            jacobian, offset = self._affine
+            return jacobian @ theta + offset, jacobian
+        values = dict(zip(self.parameters, theta.tolist()))
+        angles = np.zeros(len(self._angles))
+        jacobian = np.zeros((len(self._angles), len(self.parameters)))
+        for k, angle in enumerate(self._angles):
+            if not isinstance(angle, ParameterExpression):
+                angles[k] = _float(angle)
+                continue
+            angles[k] = _float(angle.bind({p: values[p] for p in angle.parameters}))
+            for parameter in angle.parameters:
+                derivative = angle.gradient(parameter)
+                if isinstance(derivative, ParameterExpression):
+                    derivative = derivative.bind({p: values[p] for p in derivative.parameters})
+                jacobian[k, self.parameters.index(parameter)] = _float(derivative)
+        return angles, jacobian
+
+    def _run(self, points):
+        """Energies of the unrolled circuit at each row of gate angles, in one estimator call."""
+        points = np.atleast_2d(points)
+        self.submissions += 1
+        self.evaluations += len(points)
+        if self._v2:
+            result = self.estimator.run([(self.circuit, self.observable, points)]).result()
+            return np.asarray(result[0].data.evs, dtype=float).reshape(len(points))
+        count = len(points)
+        result = self.estimator.run([self.circuit] * count, [self.observable] * count, points.tolist()).result()
+        return np.asarray(result.values, dtype=float)
+
+    def energies(self, thetas):
+        """Energies of several parameter points in one submission."""
+        return self._run([self.angles(theta)[0] for theta in np.atleast_2d(thetas)])
+
+    def energy(self, theta):
+        return float(self.energies([theta])[0])
+
+    def energy_and_gradient(self, theta):
+        """Energy and exact parameter-shift gradient at ``theta`` in one submission."""
+        angles, jacobian = self.angles(theta)
+        shifts = np.eye(len(angles)) * (math.pi / 2)
+        evs = self._run(np.vstack([angles, angles + shifts, angles - shifts]))
+        count = len(angles)
+        per_angle = (evs[1:1 + count] - evs[1 + count:]) / 2
+        return float(evs[0]), jacobian.T @ per_angle
+
+    # optimizers -------------------------------------------------------------
+
+    def minimize(self, x0, method="gradient", maxiter=100, callback=None, **options):
+        """
+        Minimize the energy from ``x0``. ``method`` is ``gradient`` (descent
+        on parameter-shift gradients; ``learning_rate``, ``tol``), ``spsa``
+        (``a``, ``c``, ``alpha``, ``gamma``, ``seed``) or ``cobyla``
+        (``rhobeg``, ``tol``). ``callback(iteration)`` gets each
+        :class:`Iteration` as it is recorded; the result's ``x``/``fun``
+        are the best point seen.
+        """
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+        history = []
+        started = time.perf_counter()
+        submissions, evaluations = self.submissions, self.evaluations
+
+        def record(theta, energy, gradient_norm=None):
+            entry = Iteration(len(history), np.array(theta, dtype=float), float(energy), gradient_norm,
+                              self.evaluations - evaluations, time.perf_counter() - started)
+            history.append(entry)
+            if callback is not None:
+                callback(entry)
+
+        theta = np.array(x0, dtype=float)
+        if method == "gradient":
+            self._gradient_descent(theta, maxiter, record, **options)
+        elif method == "spsa":
+            self._spsa(theta, maxiter, record, **options)
+        else:
+            self._cobyla(theta, maxiter, record, **options)
+        best = min(history, key=lambda entry: entry.energy)
+        return OptimizationResult(best.parameters, best.energy, history,
+                                  self.submissions - submissions, self.evaluations - evaluations)
+
+    def _gradient_descent(self, theta, maxiter, record, learning_rate=0.1, tol=1e-6):
+        for _ in range(maxiter):
+            energy, gradient = self.energy_and_gradient(theta)
+            norm = float(np.linalg.norm(gradient))
+            record(theta, energy, norm)
+            if norm < tol:
+                break
+            theta = theta - learning_rate * gradient
+
+    def _spsa(self, theta, maxiter, record, a=0.2, c=0.1, alpha=0.602, gamma=0.101, seed=None):
+        rng = np.random.default_rng(seed)
+        stability = 0.1 * maxiter
+        for k in range(maxiter):
+            a_k = a / (k + 1 + stability) ** alpha
+            c_k = c / (k + 1) ** gamma
+            delta = rng.choice((-1.0, 1.0), size=len(theta))
+            energy, plus, minus = self.energies([theta, theta + c_k * delta, theta - c_k * delta])
+            gradient = (plus - minus) / (2 * c_k) * delta
+            record(theta, energy, float(np.linalg.norm(gradient)))
+            theta = theta - a_k * gradient
+
+    def _cobyla(self, theta, maxiter, record, rhobeg=0.5, tol=None):
+        from scipy.optimize import minimize
+
+        def objective(x):
+            energy = self.energy(x)
+            record(x, energy)
+            return energy
+
+        minimize(objective, theta, method="COBYLA", tol=tol, options={"maxiter": maxiter, "rhobeg": rhobeg})
@@ -0,0 +1,389 @@
+"""
+Run the Python code blocks of an assistant answer in isolated worker processes against the offline SDK.
+
+``verify_answer`` extracts the fenced ``python``/``py`` blocks of a markdown
+answer (unlabelled blocks too, if they parse), strips ``>>>`` prompts and
+notebook ``!pip``/``%magic`` lines, and checks every block:
+
+* sdk_lint runs first. A syntax error fails the block without starting a
+  process, and QR pitfalls are attached to the verdict as findings;
+* each block runs in its own process with the offline SDK installed, a
+  scratch working directory, no stdin, and CPU time (``RLIMIT_CPU``),
+  address space (``RLIMIT_AS``) and wall-clock limits. An audit hook
+  refuses file writes, renames and deletions outside the scratch directory.
+  That stops a careless snippet, not a hostile one (ctypes or a subprocess
+  gets around it): this is not a security sandbox;
+* the counts the snippet obtains (``result.get_counts()`` and Sampler V2
+  ``BitArray.get_counts()``) are captured along with its stdout and stderr.
+
+A snippet that fails only because an optional display module
+(``OPTIONAL_MODULES``: matplotlib, IPython) is not installed is
+``skipped``; any other missing module fails it.
+
+On POSIX the processes are forked from a ``multiprocessing`` fork server
+that has already imported NumPy, Qiskit and the offline SDK. A snippet
+therefore starts in milliseconds instead of paying a second of imports,
+and still gets a fresh, isolated process. Many answers are verified at once
+on a pool of ``jobs`` concurrent workers. Verdicts are cached in
+``Tools/.cache/snippets.json`` by snippet hash, offline SDK version and
+limits and lint setting; timeouts are not cached.
+
+Usage:
+    from verify_snippets import Verifier
+    with Verifier(jobs=4, timeout=10) as verifier:
+        verdicts = verifier.verify_answer(answer_markdown)
+        all(v.ok for v in verdicts), verdicts[0].counts
+    python Tools/verify_snippets.py answer.md [...] [--join] [--timeout 10] [--memory-mb 1024] [--json]
+"""
+
+import argparse
+import ast
+import collections
+import hashlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import re
+import signal
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from sdk_lint import lint_source
+from validate_examples import OFFLINE_SDK_DIR, OUTPUT_TAIL, write_json
+
+try:
+    import resource
+except ImportError:  # Windows: only the wall-clock limit applies
+    resource = None
+
+TOOLS_DIR = Path(__file__).resolve().parent
+CACHE_PATH = TOOLS_DIR / ".cache" / "snippets.json"
+CACHE_VERSION = 2
+TIMEOUT = 10.0
+MEMORY_MB = 1024
+LANGUAGES = {"python", "py", "python3", "ipython", "pycon", ""}
+PRELOAD = ["numpy", "qiskit", "offline_sdk", "offline_sdk.native", "offline_sdk.toolkit"]
+# Missing modules that only draw or display; a snippet failing on one of these is skipped, not failed.
+OPTIONAL_MODULES = frozenset({"matplotlib", "IPython", "pylatexenc"})
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+_FENCE = re.compile(r"^\s*(?P<fence>```|~~~)\s*(?P<lang>[\w+-]*)")
+_MISSING_MODULE = re.compile(r"ModuleNotFoundError: No module named '([\w.]+)'")
+
+
+class Verdict(collections.namedtuple("Verdict", "status counts stdout stderr duration findings cached")):
+    """
+    Outcome of one snippet. ``status`` is ``passed``, ``failed``, ``syntax-error``,
+    ``timeout``, ``cpu-limit``, ``memory-limit`` or ``skipped`` (a display
+    module in ``OPTIONAL_MODULES`` such as matplotlib is missing). ``counts`` lists every counts dict the
+    snippet read, in order. ``findings`` are sdk_lint findings as dicts.
+    """
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.status in ("passed", "skipped") and not self.findings
+
+
+def extract_code(answer):
+    """The Python code blocks of a markdown ``answer``, in order, ready to run."""
+    blocks, current, lang = [], None, None
+    for line in answer.splitlines():
+        match = _FENCE.match(line)
+        if match and current is None:
+            current, lang = [], match.group("lang").lower()
+        elif match and line.strip() == match.group("fence"):
+            if lang in LANGUAGES:
+                code = _runnable(current)
+                if code.strip() and (lang or _parses(code)):
+                    blocks.append(code)
+            current = None
+        elif current is not None:
+            current.append(line)
+    return blocks
+
+
+def _runnable(lines):
+    """Drop interpreter prompts' output and notebook-only lines."""
+    if any(line.lstrip().startswith(">>>") for line in lines):
+        lines = [line.lstrip()[4:] for line in lines if line.lstrip().startswith((">>>", "..."))]
+    return "\n".join(line for line in lines if not line.lstrip().startswith(("!", "%")))
+
+
+def _parses(code):
+    try:
+        ast.parse(code)
+    except SyntaxError:
+        return False
+    return True
+
+
+def _offline_sdk_digest():
+    digest = hashlib.sha256()
+    for path in sorted(OFFLINE_SDK_DIR.glob("*.py")):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+# ------------------------------------------------------------------ worker
+
+def _limit(cpu_seconds, memory_mb):
+    if resource is None:
+        return
+    cpu = max(1, math.ceil(cpu_seconds))
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    if memory_mb is not None:
+        try:
+            # Relative to what the preloaded modules already mapped, so NumPy's reservations do not count.
+            with open("/proc/self/statm") as handle:
+                mapped = int(handle.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            mapped = 0
+        limit = mapped + memory_mb * 2 ** 20
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _record_counts(owner, counts):
+    original = owner.get_counts
+
+    def get_counts(self, *args, **kwargs):
+        value = original(self, *args, **kwargs)
+        for item in value if isinstance(value, list) else [value]:
+            counts.append({str(k): int(v) for k, v in item.items()})
+        return value
+
+    owner.get_counts = get_counts
+
+
+# Audit events that modify the filesystem, and which of their arguments are paths.
+_WRITE_EVENTS = {"os.remove": (0,), "os.rmdir": (0,), "os.mkdir": (0,), "os.rename": (0, 1), "os.symlink": (1,),
+                 "os.link": (1,), "os.truncate": (0,), "os.chmod": (0,), "os.chown": (0,), "os.utime": (0,),
+                 "shutil.rmtree": (0,)}
+_WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_TRUNC | os.O_APPEND
+
+
+def _confine_writes(directory):
+    """Refuse writes outside ``directory`` (except to ``os.devnull``) for the rest of the process."""
+    root = os.path.realpath(directory)
+
+    def outside(path):
+        if isinstance(path, int):
+            return False  # an already open descriptor
+        path = os.path.realpath(os.fsdecode(path))
+        return path != os.devnull and path != root and not path.startswith(root + os.sep)
+
+    def hook(event, args):
+        if event == "open":
+            paths = (args[0],) if args[2] & _WRITE_FLAGS else ()
+        else:
+            paths = [args[i] for i in _WRITE_EVENTS.get(event, ())]
+        for path in paths:
+            if path is not None and outside(path):
+                raise PermissionError(f"snippets may only write inside their working directory, not {path!r}")
+
+    tempfile.tempdir = root
+    sys.dont_write_bytecode = True
+    sys.addaudithook(hook)
+
+
+def _child(source, directory, cpu_seconds, memory_mb, connection):
+    """Runs in the worker process: limits, offline SDK, then the snippet."""
+    os.chdir(directory)
+    os.environ["MPLBACKEND"] = "Agg"
+    os.environ["TMPDIR"] = directory
+    sys.stdin = open(os.devnull)
+    sys.stdout = stdout = io.StringIO()
+    sys.stderr = stderr = io.StringIO()
+    counts = []
+    status = "passed"
+    try:
+        import offline_sdk
+        from offline_sdk import jobs
+        offline_sdk.install()
+        _record_counts(jobs.Result, counts)
+        try:
+            from qiskit.primitives.containers import BitArray
+            _record_counts(BitArray, counts)
+        except ImportError:
+            pass
+        _limit(cpu_seconds, memory_mb)
+        _confine_writes(directory)
+        exec(compile(source, "<snippet>", "exec"), {"__name__": "__main__"})
+    except SystemExit as exc:
+        status = "passed" if exc.code in (None, 0) else "failed"
+    except MemoryError:
+        status = "memory-limit"
+    except BaseException:
+        traceback.print_exc()
+        status = "failed"
+    connection.send((status, counts, stdout.getvalue()[-OUTPUT_TAIL:], stderr.getvalue()[-OUTPUT_TAIL:]))
+    connection.close()
+
+
+# ---------------------------------------------------------------- verifier
+
+class Verifier:
+    """
+    Runs snippets with at most ``jobs`` isolated processes at a time.
+    ``cpu_seconds`` defaults to ``timeout``; ``memory_mb`` bounds the memory
+    a snippet may add (``None`` for no limit).
+    """
+
+    def __init__(self, jobs=None, timeout=TIMEOUT, cpu_seconds=None, memory_mb=MEMORY_MB, cache_path=CACHE_PATH,
+                 lint=True):
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds or timeout
+        self.memory_mb = memory_mb
+        self.cache_path = cache_path
+        self.lint = lint
+        self._context = multiprocessing.get_context(START_METHOD)
+        if START_METHOD == "forkserver":
+            self._context.set_forkserver_preload(PRELOAD)
+        self._pool = ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1, thread_name_prefix="verify")
+        self._environment = [CACHE_VERSION, _offline_sdk_digest(), self.cpu_seconds, memory_mb, lint]
+        self._cache = self._load_cache()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load_cache(self):
+        if self.cache_path is None:
+            return {}
+        try:
+            stored = json.loads(Path(self.cache_path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return stored.get("verdicts", {}) if stored.get("version") == CACHE_VERSION else {}
+
+    def key(self, source):
+        return hashlib.sha256(json.dumps([source, self._environment]).encode()).hexdigest()
+
+    def warm(self):
+        """Start the fork server now, so the first snippet does not pay for the preload."""
+        self._isolated("pass")
+
+    def verify_snippet(self, source):
+        """A :class:`Verdict` for one block of code."""
+        key = self.key(source)
+        with self._lock:
+            stored = self._cache.get(key)
+        if stored is not None:
+            return Verdict(**stored, cached=True)
+        findings = [f._asdict() for f in lint_source(source, "<snippet>")] if self.lint else []
+        if any(f["code"] == "E999" for f in findings):
+            verdict = Verdict("syntax-error", [], "", findings[0]["message"], 0.0, findings, False)
+        else:
+            verdict = self._isolated(source)._replace(findings=findings)
+        if verdict.status != "timeout":
+            with self._lock:
+                self._cache[key] = {k: v for k, v in verdict._asdict().items() if k != "cached"}
+                self._dirty = True
+        return verdict
+
+    def verify_answer(self, answer, join=False):
+        """Verdicts for the answer's code blocks; ``join=True`` runs them as one program."""
+        return self.verify_answers([answer], join)[0]
+
+    def verify_answers(self, answers, join=False):
+        """Verdict lists for many answers, with every snippet of every answer in flight at once."""
+        snippets = [extract_code(answer) for answer in answers]
+        if join:
+            snippets = [["\n\n".join(blocks)] if blocks else [] for blocks in snippets]
+        futures = [[self._pool.submit(self.verify_snippet, block) for block in blocks] for blocks in snippets]
+        verdicts = [[future.result() for future in answer] for answer in futures]
+        self.save()
+        return verdicts
+
+    def _isolated(self, source):
+        started = time.perf_counter()
+        receive, send = self._context.Pipe(duplex=False)
+        with tempfile.TemporaryDirectory(prefix="snippet-") as directory:
+            process = self._context.Process(target=_child, daemon=True,
+                                            args=(source, directory, self.cpu_seconds, self.memory_mb, send))
+            process.start()
+            send.close()
+            outcome = None
+            try:
+                if receive.poll(self.timeout):
+                    outcome = receive.recv()
+            except EOFError:
+                pass  # the process died before reporting
+            finally:
+                receive.close()
+                process.join(0.5 if outcome is not None else 0)
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+        duration = round(time.perf_counter() - started, 3)
+        if outcome is None:
+            return Verdict(self._death(process.exitcode), [], "", "", duration, [], False)
+        status, counts, stdout, stderr = outcome
+        missing = _MISSING_MODULE.search(stderr)
+        if status == "failed" and missing and missing.group(1).split(".")[0] in OPTIONAL_MODULES:
+            status = "skipped"
+        return Verdict(status, counts, stdout, stderr, duration, [], False)
+
+    def _death(self, exitcode):
+        if exitcode is None or exitcode == -signal.SIGKILL:
+            return "timeout"
+        if exitcode == -getattr(signal, "SIGXCPU", 0):
+            return "cpu-limit"
+        return "memory-limit" if exitcode == -signal.SIGSEGV else "failed"
+
+    def save(self):
+        with self._lock:
+            if self.cache_path is None or not self._dirty:
+                return
+            write_json(self.cache_path, {"version": CACHE_VERSION, "verdicts": self._cache})
+            self._dirty = False
+
+    def close(self):
+        self._pool.shutdown()
+        self.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("answers", nargs="+", help="markdown answers (- for stdin)")
+    parser.add_argument("--join", action="store_true", help="run each answer's blocks as one program")
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="wall-clock seconds per snippet")
+    parser.add_argument("--memory-mb", type=int, default=MEMORY_MB)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    texts = [sys.stdin.read() if name == "-" else Path(name).read_text(encoding="utf-8") for name in args.answers]
+    with Verifier(args.jobs, args.timeout, memory_mb=args.memory_mb,
+                  cache_path=None if args.no_cache else CACHE_PATH) as verifier:
+        results = verifier.verify_answers(texts, args.join)
+    if args.json:
+        print(json.dumps({name: [v._asdict() for v in verdicts] for name, verdicts in zip(args.answers, results)},
+                         indent=1))
+    else:
+        for name, verdicts in zip(args.answers, results):
+            for index, v in enumerate(verdicts):
+                note = " (cached)" if v.cached else ""
+                print(f"{name} block {index + 1}: {v.status}{note} in {v.duration:.2f}s, {len(v.counts)} counts")
+                for f in v.findings:
+                    print(f"    {f['code']} line {f['line']}: {f['message']}")
+                if v.status not in ("passed", "skipped", "syntax-error") and v.stderr:
+                    print("    " + v.stderr.strip().splitlines()[-1])
+    return 0 if all(v.ok for verdicts in results for v in verdicts) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())